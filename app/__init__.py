@@ -3,5 +3,16 @@ from .exceptions import *
 __all__ = [
     "UserAlreadyExistsError",
     "UserDoesNotExist",
-    "PasswordDoesNotMatch"
+    "PasswordDoesNotMatch",
+    "HashPoolSaturated",
+    "TodoDoesNotExist",
+    "InvalidCursorError",
+    "InvalidRefreshToken",
+    "RefreshTokenReused",
+    "LoginRateLimited",
+    "RealtimeUnavailable",
+    "ChangeCursorExpired",
+    "InvalidImportRow",
+    "ImportTooLarge",
+    "ImportReadTimeout"
 ]
\ No newline at end of file
@@ -0,0 +1,78 @@
+'''
+서버 실행 (운영용)
+    python -m app [--host 0.0.0.0] [--port 8000] [--workers N] [--reload]
+    또는 설치 후 : todo-server [...]
+
+    - 워커 수 : --workers > WEB_CONCURRENCY (기본 1, 0 이면 사용 가능한 CPU 코어 수)
+      (요청 처리는 async 이고 bcrypt 는 워커마다 있는 해싱 풀에서 실행되므로 늘린다면 코어당 워커 1개)
+      워커 프로세스마다 따로 있는 상태(메모리 rate limit / 목록 캐시, 토큰 폐기 목록 등)가 있으므로
+      여러 워커로 실행하면 그 목록을 경고로 출력 (app/core/config.py 의 서버 실행 설정 참고)
+    - 워커 프로세스마다 DB 커넥션 풀을 따로 가짐
+      -> 워커 수 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) 가 Postgres max_connections 보다 작아야 함
+    - SIGTERM/SIGINT : 새 연결을 받지 않고 처리중인 요청이 끝날 때까지(최대 GRACEFUL_SHUTDOWN_SECONDS) 기다린 뒤
+      lifespan 종료 단계(스케줄러 정지, 커넥션 정리)를 실행
+    - 접근 로그는 앱의 RequestLoggingMiddleware 가 남기므로 uvicorn 접근 로그는 끔
+'''
+import argparse
+import os
+import sys
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def worker_count(requested : int | None = None) -> int :
+    if requested :
+        return requested
+    if settings.server_workers :
+        return settings.server_workers
+    return os.process_cpu_count() or 1
+
+
+# 워커가 여러개일 때 워커마다 따로 동작해서 약해지는 기능
+def process_local_warnings(workers : int) -> list[str] :
+    if workers <= 1 :
+        return []
+
+    warnings = []
+    if settings.login_rate_limit_backend == "memory" :
+        warnings.append(f"LOGIN_RATE_LIMIT_BACKEND=memory : 로그인 시도 제한이 워커마다 따로 집계됩니다 (최대 {workers}배 허용). redis 를 사용하세요.")
+    if settings.todo_list_cache_backend == "memory" :
+        warnings.append(f"TODO_LIST_CACHE_BACKEND=memory : 다른 워커의 쓰기가 최대 {settings.todo_list_cache_ttl}초 동안 목록에 반영되지 않습니다. redis 를 사용하세요.")
+    warnings.append("토큰 폐기(비활성화, 리프레시 토큰 재사용 감지)는 처리한 워커에만 바로 반영되고 나머지 워커는 access token 만료까지 허용합니다.")
+    if settings.replica_db_urls :
+        warnings.append("replica sticky 목록이 워커마다 따로 있어 쓰기 직후의 읽기가 다른 워커에서 replica 로 갈 수 있습니다.")
+    return warnings
+
+
+def main(argv : list[str] | None = None) -> None :
+    parser = argparse.ArgumentParser(prog="todo-server", description="todo-server 실행")
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument("--workers", type=int, default=None, help="기본값 : WEB_CONCURRENCY (기본 1, 0 이면 CPU 코어 수)")
+    parser.add_argument("--reload", action="store_true", help="개발용 (코드 변경 시 재시작, 워커 1개)")
+    args = parser.parse_args(argv)
+
+    workers = 1 if args.reload else worker_count(args.workers)
+    max_connections = workers * (settings.db_pool_size + settings.db_max_overflow)
+    print(f"워커 {workers}개로 실행 (DB 서버당 커넥션 최대 {max_connections}개)")
+    for warning in process_local_warnings(workers) :
+        print(f"경고 : {warning}", file=sys.stderr)
+
+    uvicorn.run(
+        "app.main:app",
+        host = args.host,
+        port = args.port,
+        workers = workers,
+        reload = args.reload,
+        access_log = False,
+        proxy_headers = True,
+        forwarded_allow_ips = settings.server_forwarded_allow_ips,
+        timeout_keep_alive = settings.server_keepalive,
+        timeout_graceful_shutdown = settings.server_graceful_timeout
+    )
+
+
+if __name__ == "__main__" :
+    main()
@@ -1,14 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from fastapi import APIRouter, status, Depends, HTTPException, Response
+from fastapi import APIRouter, status, Depends, HTTPException, Request, Response, Cookie, BackgroundTasks
 from app.schemas import user as user_schema
 
 from app.services.auth_service import Auth_service
+from app.services.token_service import Token_service
 from app.database import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, mark_recent_write
+from app.core.config import settings
+from app.core.responses import fast_json_response
+from app.core.rate_limit import login_rate_limiter
+from app.core.email_filter import registered_emails
 
-from app import UserAlreadyExistsError, UserDoesNotExist, PasswordDoesNotMatch
+from app import UserAlreadyExistsError, UserDoesNotExist, PasswordDoesNotMatch, HashPoolSaturated, InvalidRefreshToken, RefreshTokenReused, LoginRateLimited
 import jwt
+import logging
+
+logger = logging.getLogger(__name__)
 
 # APIRouter 객체 생성
 # tags : API 문서에서 엔드포인트를 그룹화하는데 사용
@@ -19,17 +27,40 @@ router = APIRouter(
 )
 
 auth_service = Auth_service()
+token_service = Token_service()
+
+# 발급된 토큰을 쿠키에 저장 (login, refresh 공통)
+def _set_token_cookies(response : Response, jwt_token : dict) -> None :
+    # refresh token
+    response.set_cookie(
+        key="refresh_token",  # 쿠키의 이름
+        value=jwt_token.get("refresh").get("refresh_token"), # 실제 토큰 값
+        httponly=True, # javascript에서 접근 불가(XSS 방지)
+        samesite="lax", # CSRF방지를 위한 설정 ('strict' or 'lax')
+        #secure=True, # HTTPS환경에서만 쿠키 전송 (배포 시)
+        max_age=jwt_token.get("refresh").get("expire_time") # 쿠키만료 시간
+    )
+    
+    # access token
+    response.set_cookie(
+        key="access_token",  # 쿠키의 이름
+        value=jwt_token.get("access").get("access_token"),
+        samesite="lax",
+        #secure=True,
+        max_age=jwt_token.get("access").get("expire_time")
+    )
 
 @router.post("/sign-up", response_model=user_schema.User, status_code=status.HTTP_201_CREATED)
 async def signup(
     user : user_schema.UserCreate, 
     db : AsyncSession = Depends(get_db)) :
     
-    print("----------------- Sign-Up Endpoint Start --------------------------")
     try :
         new_user = await auth_service.user_create(db = db, user = user)
         
         await db.commit()         # 변경사항을 DB에 커밋
+        mark_recent_write(new_user.email) # 가입 직후 조회는 replica 지연과 무관하게 primary에서
+        registered_emails.add(new_user.email)
         # db.refresh(new_user) # DB에 저장된 사용자 정보를 객체에 반영
         
         return new_user
@@ -41,66 +72,71 @@ async def signup(
             status_code=status.HTTP_409_CONFLICT,
             detail="이미 사용중인 이메일입니다."
         )
-    # 나중에 로깅처리
     except SQLAlchemyError : 
+        logger.exception("sign-up failed: database error")
         await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="서버 내부 오류가 발생하였습니다."
         )
-    except UserAlreadyExistsError as e :
-        # 에러 객체에 담긴 추가 정보를 로깅하거나 활용할 수 있음
-        print(e)
+    except UserAlreadyExistsError :
+        # 이메일 등 개인정보는 남기지 않음
+        logger.info("sign-up rejected: email already in use")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="이미 사용중인 이메일입니다."
         )
+    # bcrypt 워커 풀 포화 -> 기다리지 않고 바로 503
+    except HashPoolSaturated :
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
 
 @router.post("/login", response_model=user_schema.Total_Token, status_code=status.HTTP_200_OK)
 async def login(
+    request : Request,
     response : Response, 
     user : user_schema.UserLogin, 
+    background_tasks : BackgroundTasks,
     db : AsyncSession = Depends(get_db)) : 
     
-    print("----------------- Login Endpoint Start --------------------------")
+    # DB 조회/bcrypt 검증 전에 시도 횟수부터 확인
+    # 프록시 뒤에서는 uvicorn --proxy-headers (--forwarded-allow-ips) 로 실제 클라이언트 IP를 받아야 함
+    try :
+        await login_rate_limiter.check(request.client.host if request.client else None, user.email)
+    except LoginRateLimited as e :
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     
     try : 
         # 인증 성공 시 Token 정보 저장
-        jwt_token = await auth_service.user_login(db = db, user = user)
+        jwt_token = await auth_service.user_login(db = db, user = user, background_tasks = background_tasks)
+        await db.commit() # 발급한 refresh token 해시 저장
         
-        # refresh token
-        response.set_cookie(
-            key="refresh_token",  # 쿠키의 이름
-            value=jwt_token.get("refresh").get("refresh_token"), # 실제 토큰 값
-            httponly=True, # javascript에서 접근 불가(XSS 방지)
-            samesite="lax", # CSRF방지를 위한 설정 ('strict' or 'lax')
-            #secure=True, # HTTPS환경에서만 쿠키 전송 (배포 시)
-            max_age=jwt_token.get("refresh").get("expire_time") # 쿠키만료 시간
-        )
-        
-        # access token
-        response.set_cookie(
-            key="access_token",  # 쿠키의 이름
-            value=jwt_token.get("access").get("access_token"),
-            samesite="lax",
-            #secure=True,
-            max_age=jwt_token.get("access").get("expire_time")
-        )
+        _set_token_cookies(response, jwt_token)
         
         return jwt_token
     
-    except UserDoesNotExist:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="존재하지 않는 이메일입니다."
-        )
     except PasswordDoesNotMatch:
+        # 존재하지 않는 이메일도 같은 응답 (가입 여부 노출 방지)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 패스워드가 일치하지 않습니다."
         )
+    except HashPoolSaturated :
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
     except jwt.InvalidTokenError as e:
-        print(f"JWT 관련 작업 중 에러가 발생하였습니다. : {e}")
+        logger.warning("login failed: jwt error", extra={"error" : type(e).__name__})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -109,13 +145,91 @@ async def login(
      # --- 가장 중요한 수정 부분 ---
     except Exception as e:
         # 예상치 못한 에러가 발생하면, 로그를 남기고 500 에러를 발생시킵니다.
-        print(f"예상치 못한 에러가 발생하였습니다: {e}")
+        logger.exception("login failed: unexpected error")
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="서버 내부 오류가 발생했습니다. 관리자에게 문의하세요."
         )
 
+'''
+    리프레시 토큰 회전
+    - refresh_token 쿠키를 검증하고, 사용한 토큰은 무효화한 뒤 새 토큰 쌍을 발급
+    - 이미 사용된 토큰이 다시 들어오면 해당 사용자의 모든 리프레시 토큰을 무효화
+'''
+@router.post("/refresh", response_model=user_schema.Total_Token, status_code=status.HTTP_200_OK)
+async def refresh(
+    response : Response,
+    refresh_token : str | None = Cookie(None),
+    db : AsyncSession = Depends(get_db)) :
+    
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    if refresh_token is None :
+        raise credentials_exception
+    
+    try :
+        jwt_token = await token_service.rotate(db = db, token = refresh_token)
+        await db.commit()
+        
+        _set_token_cookies(response, jwt_token)
+        
+        return jwt_token
+    
+    except RefreshTokenReused :
+        await db.commit() # 모든 토큰 무효화 내용은 반영
+        raise credentials_exception
+    except (InvalidRefreshToken, jwt.InvalidTokenError) :
+        await db.rollback()
+        raise credentials_exception
+    except SQLAlchemyError :
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="서버 내부 오류가 발생하였습니다."
+        )
+
+'''
+    계정 비활성화 (본인)
+    - 커밋한 뒤에 이 워커의 검증된 토큰 캐시를 비우고 access token 을 폐기 (롤백되면 토큰은 그대로 유효)
+    - 다른 워커는 get_current_user 의 토큰 캐시 TTL(TOKEN_CACHE_TTL_SECONDS) 이 지나면 DB 에서 비활성화를 확인
+'''
+@router.post("/deactivate", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate(
+    response : Response,
+    db : AsyncSession = Depends(get_db),
+    current_user : user_schema.User = Depends(get_current_user)) :
+    
+    try :
+        await auth_service.deactivate_user(db = db, user_id = current_user.id)
+        await db.commit()
+    except UserDoesNotExist :
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except SQLAlchemyError :
+        logger.exception("deactivate failed: database error")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="서버 내부 오류가 발생하였습니다."
+        )
+    
+    auth_service.forget_user_tokens(current_user.id)
+    mark_recent_write(current_user.email)
+    response.delete_cookie("access_token")
+    response.delete_cookie("refresh_token")
+
 @router.get("/me", response_model=user_schema.User)
 async def read_users_me(current_user : user_schema.User = Depends(get_current_user)) :
     
+    if settings.fast_json_responses :
+        return fast_json_response(user_schema.User, current_user)
     return current_user
\ No newline at end of file
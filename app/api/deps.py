@@ -4,40 +4,130 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import user as user_schema
-from app.core.security import decode_access_token
-from app.database import get_db
+from app.core.security import decode_access_token, verified_token_cache
+from app.core.revocation import revocation_list
+from app.database import get_db, replica_router
 from app.services.auth_service import Auth_service
 from app import UserDoesNotExist
 
 import jwt
+import hashlib
+import time
+from typing import AsyncGenerator
 
-# JWT 토큰을 검증하고 현재 사용자 정보를 가져오는 의존성 함수
-async def get_current_user(
-    db : AsyncSession = Depends(get_db),
-    access_token: str | None = Cookie(None)
-    ) -> user_schema.User :
-    print(f"access_token : {access_token}")
-    credentials_exception = HTTPException(
+# 읽기 전용 세션 의존성 함수 (SELECT 만 하는 경로에서 사용)
+# - replica가 설정되어 있으면 replica로, 같은 사용자가 방금 쓰기를 했다면 primary로
+# - 라우팅 용도로만 토큰의 email을 서명 검증 없이 읽음 (위조해도 primary로 갈 뿐)
+async def get_read_db(access_token : str | None = Cookie(None)) -> AsyncGenerator[AsyncSession, None] :
+    routing_key = None
+    if access_token is not None and replica_router.replicas :
+        try :
+            routing_key = jwt.decode(access_token, options={"verify_signature" : False}).get("email")
+        except jwt.InvalidTokenError :
+            pass
+    
+    session_factory = await replica_router.session_factory(routing_key)
+    async with session_factory() as session :
+        # replica 에서 읽은 결과인지 (지연될 수 있으므로 캐시에 저장하지 않는 용도, is_replica_session)
+        session.info["replica"] = session_factory is not replica_router.primary
+        yield session
+
+def is_replica_session(session : AsyncSession) -> bool :
+    return session.info.get("replica", False)
+
+# 쓰기 커밋 후 호출 -> 잠시 동안 해당 사용자의 읽기를 primary로 보냄
+def mark_recent_write(email : str) -> None :
+    replica_router.mark_write(email)
+
+def _credentials_exception() -> HTTPException :
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _is_revoked(payload : dict) -> bool :
+    sub = payload.get("sub")
+    return revocation_list.is_revoked(int(sub) if sub is not None else None, payload.get("jti"), payload.get("iat"))
+
+'''
+    토큰만 검증하고 DB는 조회하지 않는 인증 의존성 (사용자 행 전체가 필요 없는 경로용)
+    - 토큰의 sub/email/is_active(발급 시점 값)를 그대로 사용
+    - 비활성화/리프레시 토큰 재사용 감지는 폐기 목록(app/core/revocation.py)으로 반영
+    - sub 가 없는 이전 형식의 토큰은 거절 -> 클라이언트가 /auth/refresh 로 새 토큰을 받음
+    - 대기할 I/O 가 없지만 async 로 선언해서 스레드풀을 거치지 않고 이벤트 루프에서 바로 실행
+'''
+async def get_token_claims(access_token : str | None = Cookie(None)) -> user_schema.TokenClaims :
+    if access_token is None :
+        raise _credentials_exception()
+    
+    try :
+        payload = decode_access_token(access_token)
+    except jwt.ExpiredSignatureError :
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="토큰이 만료되었습니다.",
+            headers={"WWW-Authenticate" : "Bearer"},
+        )
+    except jwt.InvalidTokenError :
+        raise _credentials_exception()
+    
+    if "sub" not in payload or not payload.get("is_active") or _is_revoked(payload) :
+        raise _credentials_exception()
+    
+    return user_schema.TokenClaims(
+        id = int(payload["sub"]),
+        email = payload["email"],
+        username = payload["username"],
+        is_active = payload["is_active"],
+        jti = payload["jti"],
+        iat = payload["iat"],
+        exp = payload["exp"]
+    )
+
+# JWT 토큰을 검증하고 현재 사용자 정보를 가져오는 의존성 함수
+async def get_current_user(
+    db : AsyncSession = Depends(get_read_db),
+    access_token: str | None = Cookie(None)
+    ) -> user_schema.User :
+    credentials_exception = _credentials_exception()
         
     if access_token is None : # is : 참조, == : 값
         raise credentials_exception
     
+    # 최근에 검증한 토큰이면 디코딩/DB 조회 없이 바로 반환
+    token_digest = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    cached = verified_token_cache.get(token_digest)
+    if cached is not None :
+        cached_payload, cached_user = cached
+        if _is_revoked(cached_payload) :
+            raise credentials_exception
+        return cached_user
+    
     # 액세스 토큰 디코딩
     try :
         payload = decode_access_token(access_token)
         
         user_email : str | None =  payload.get("email")
-        if user_email is None :
+        if user_email is None or _is_revoked(payload) :
             raise credentials_exception
         
         auth_service = Auth_service()
         user = await auth_service.get_user_by_email(db, user_email)
         
-        return user
+        # 비활성화된 계정은 거절 (get_token_claims 와 같은 기준)
+        current_user = user_schema.User.model_validate(user)
+        if not current_user.is_active :
+            raise credentials_exception
+        
+        # 세션과 분리된 스키마 객체로 캐싱 (토큰 만료시간을 넘기지 않도록 ttl 계산)
+        verified_token_cache.set(
+            token_digest,
+            (payload, current_user),
+            ttl=payload["exp"] - time.time()
+        )
+        
+        return current_user
     
     # jwt 만료 에러
     except jwt.ExpiredSignatureError : 
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+from app.core.keyring import keyring, JWKS_CONTENT_TYPE
+
+router = APIRouter(
+    tags=["Auth"]
+)
+
+# 토큰 검증용 공개키 목록 (JWT_KEYS_DIR 를 설정했을 때만 키가 있음, HS256 비밀키는 공개하지 않음)
+# 다른 서버는 이 응답을 캐시해두고 kid 로 키를 찾아서 직접 검증
+@router.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks() -> Response :
+    return Response(
+        content=keyring.jwks,
+        media_type=JWKS_CONTENT_TYPE,
+        headers={"Cache-Control" : "public, max-age=300"}
+    )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import registry, CONTENT_TYPE
+
+router = APIRouter(
+    tags=["Metrics"]
+)
+
+# Prometheus 수집 엔드포인트 (워커 프로세스별 값)
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response :
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
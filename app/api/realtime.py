@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+
+import anyio
+import jwt
+from fastapi import APIRouter, status, Depends, HTTPException, Cookie, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import user as user_schema
+from app.api.deps import get_current_user, get_read_db
+from app.core.config import settings
+from app.core.realtime import change_hub, Subscription
+from app.core.revocation import revocation_list
+
+from app import RealtimeUnavailable
+
+# /todos/{todo_id} 보다 먼저 등록해야 함 (app/main.py)
+router = APIRouter(
+    prefix="/todos",
+    tags=["Todo"]
+)
+
+def _unavailable() -> HTTPException :
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="실시간 변경 알림을 사용할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": "5"},
+    )
+
+# get_current_user 에서 이미 서명을 검증한 토큰 -> 만료/폐기 확인용으로 claim 만 읽음
+def _token_claims(access_token : str | None) -> dict :
+    if access_token is None :
+        return {}
+    return jwt.decode(access_token, options={"verify_signature" : False})
+
+# 연결 도중 토큰이 만료되거나 폐기(비활성화 등)되면 스트림 종료 -> 클라이언트가 토큰을 갱신하고 다시 연결
+def _session_ended(user_id : int, claims : dict) -> bool :
+    expires_at = claims.get("exp")
+    if expires_at is not None and time.time() >= expires_at :
+        return True
+    return revocation_list.is_revoked(user_id, claims.get("jti"), claims.get("iat"))
+
+'''
+    구독 이벤트를 (종류, 데이터) 로 반환
+    - ("todo", 변경 이벤트) / ("ping", None) : 이벤트가 없을 때 REALTIME_HEARTBEAT_SECONDS 마다
+    - ("close", 이유) 를 마지막으로 끝남 : slow_consumer / listener_lost / shutdown / token_expired
+'''
+async def _events(subscription : Subscription, claims : dict) -> AsyncIterator[tuple[str, dict | str | None]] :
+    while True :
+        if _session_ended(subscription.user_id, claims) :
+            yield "close", "token_expired"
+            return
+
+        try :
+            event = await subscription.get(settings.realtime_heartbeat_seconds)
+        except TimeoutError :
+            yield "ping", None
+            continue
+
+        if event is None :
+            yield "close", subscription.reason
+            return
+        yield "todo", event
+
+async def _sse(subscription : Subscription, claims : dict) -> AsyncIterator[str] :
+    try :
+        # 끊기면 3초 뒤 다시 연결 (EventSource 기본 동작)
+        yield "retry: 3000\n\n"
+        async for kind, data in _events(subscription, claims) :
+            if kind == "ping" :
+                yield ": ping\n\n"
+            else :
+                yield f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+    finally :
+        await _unsubscribe(subscription)
+
+# 연결이 끊겨서 취소되는 중에도 UNLISTEN 까지 끝나도록 shield
+async def _unsubscribe(subscription : Subscription) -> None :
+    with anyio.CancelScope(shield=True) :
+        await change_hub.unsubscribe(subscription)
+
+# Server-Sent Events (EventSource), 인증은 access_token 쿠키
+@router.get("/events", response_class=StreamingResponse)
+async def todo_events(
+    access_token : str | None = Cookie(None),
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.User = Depends(get_current_user)) :
+
+    # get_current_user 와 같은 세션 -> 인증에 쓴 커넥션을 스트림 동안 붙잡지 않도록 바로 반납
+    await db.close()
+    claims = _token_claims(access_token)
+
+    try :
+        subscription = await change_hub.subscribe(current_user.id)
+    except RealtimeUnavailable :
+        raise _unavailable()
+
+    # 응답 본문을 시작하기 전에 연결이 끊기면 _sse 의 finally 가 실행되지 않으므로 응답이 끝날 때도 해제
+    return StreamingResponse(
+        _sse(subscription, claims),
+        media_type="text/event-stream",
+        headers={"Cache-Control" : "no-cache", "X-Accel-Buffering" : "no"},
+        background=BackgroundTask(_unsubscribe, subscription)
+    )
+
+# 클라이언트가 보내는 메시지는 무시하고 연결 종료만 감지
+async def _wait_disconnect(websocket : WebSocket) -> None :
+    while True :
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect" :
+            return
+
+# WebSocket, 인증은 access_token 쿠키 (서버 -> 클라이언트 단방향)
+@router.websocket("/ws")
+async def todo_events_ws(
+    websocket : WebSocket,
+    access_token : str | None = Cookie(None),
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.User = Depends(get_current_user)) :
+
+    await db.close()
+
+    try :
+        subscription = await change_hub.subscribe(current_user.id)
+    except RealtimeUnavailable :
+        # 1013 : Try Again Later
+        await websocket.close(code=1013)
+        return
+
+    await websocket.accept()
+    # 연결이 끊겼으면 다음 이벤트나 ping 을 보낼 때 정리
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try :
+        async for kind, data in _events(subscription, _token_claims(access_token)) :
+            if disconnected.done() :
+                return
+            await websocket.send_json({"type" : kind, "data" : data})
+            if kind == "close" :
+                await websocket.close(code=1008 if data == "token_expired" else 1013)
+                return
+    except WebSocketDisconnect :
+        pass
+    finally :
+        disconnected.cancel()
+        await _unsubscribe(subscription)
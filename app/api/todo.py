@@ -0,0 +1,331 @@
+from typing import Literal
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter, status, Depends, HTTPException, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from app.schemas import todo as todo_schema
+from app.schemas import user as user_schema
+
+from app.services.todo_service import Todo_service
+from app.services.todo_stats_service import Todo_stats_service
+from app.services.todo_transfer_service import Todo_transfer_service, ExportFormat
+from app.database import get_db, replica_router
+from app.api.deps import get_token_claims, get_read_db, mark_recent_write, is_replica_session
+from app.core.list_cache import todo_list_cache
+from app.core.config import settings
+from app.core.responses import dump_json, fast_json_response
+
+from app import TodoDoesNotExist, InvalidCursorError, ChangeCursorExpired, InvalidImportRow, ImportTooLarge, ImportReadTimeout
+
+router = APIRouter(
+    prefix="/todos",
+    tags=["Todo"]
+)
+
+todo_service = Todo_service()
+todo_stats_service = Todo_stats_service()
+todo_transfer_service = Todo_transfer_service()
+
+_EXPORT_MEDIA_TYPES = {"ndjson" : "application/x-ndjson", "csv" : "text/csv; charset=utf-8"}
+
+def _todo_not_found() -> HTTPException :
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="존재하지 않는 할 일입니다."
+    )
+
+def _internal_error() -> HTTPException :
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="서버 내부 오류가 발생하였습니다."
+    )
+
+# 클라이언트는 저장해두되 매번 ETag로 재검증
+def _list_response(body : bytes | None, etag : str | None, status_code : int = status.HTTP_200_OK) -> Response :
+    headers = {"Cache-Control" : "private, no-cache"}
+    if etag is not None :
+        headers["ETag"] = etag
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+@router.post("", response_model=todo_schema.Todo, status_code=status.HTTP_201_CREATED)
+async def create_todo(
+    todo : todo_schema.TodoCreate,
+    db : AsyncSession = Depends(get_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        new_todo = await todo_service.create_todo(db = db, user_id = current_user.id, todo = todo)
+        await db.commit()
+        mark_recent_write(current_user.email)
+        await todo_list_cache.invalidate(current_user.id)
+
+        return new_todo
+
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+@router.post("/bulk", response_model=todo_schema.TodoBulkResponse)
+async def bulk_todos(
+    request : todo_schema.TodoBulkRequest,
+    db : AsyncSession = Depends(get_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        results = await todo_service.bulk_apply(db = db, user_id = current_user.id, request = request)
+        await db.commit()
+        mark_recent_write(current_user.email)
+        await todo_list_cache.invalidate(current_user.id)
+
+        return {"results" : results}
+
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+# 파일(NDJSON / CSV, 첫 줄 헤더)로 할 일 추가, 본문을 받는 대로 검증해서 DB로 COPY (전부 추가되거나 하나도 추가되지 않음)
+# 첫 행을 검증한 뒤에 커넥션을 꺼내고, 본문이 TODO_IMPORT_READ_TIMEOUT_SECONDS 동안 멈추면 408
+@router.post("/import", response_model=todo_schema.TodoImportResult, status_code=status.HTTP_201_CREATED)
+async def import_todos(
+    request : Request,
+    format : ExportFormat = Query("ndjson", description="본문 형식"),
+    db : AsyncSession = Depends(get_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        imported = await todo_transfer_service.import_todos(
+            db = db, user_id = current_user.id, chunks = request.stream(), format = format
+        )
+        await db.commit()
+        mark_recent_write(current_user.email)
+        await todo_list_cache.invalidate(current_user.id)
+
+        return {"imported" : imported}
+
+    except InvalidImportRow as e :
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{e.line}번째 줄이 올바르지 않습니다. {e.detail}"
+        )
+    except ImportTooLarge :
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"한번에 가져올 수 있는 할 일은 {settings.todo_import_max_rows}개, 한 줄은 {settings.todo_import_max_line_bytes} bytes 까지입니다."
+        )
+    except ImportReadTimeout :
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_408_REQUEST_TIMEOUT,
+            detail=f"본문이 {settings.todo_import_read_timeout}초 동안 들어오지 않아 가져오기를 중단했습니다."
+        )
+    except (SQLAlchemyError, asyncpg.PostgresError) :
+        await db.rollback()
+        raise _internal_error()
+
+# 모든 할 일을 파일로 (id 순), 서버 측 커서로 읽는 대로 보내므로 할 일 수와 무관하게 메모리 일정
+@router.get("/export", response_class=StreamingResponse)
+async def export_todos(
+    format : ExportFormat = Query("ndjson", description="파일 형식"),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    session_factory = await replica_router.session_factory(current_user.email)
+    return StreamingResponse(
+        todo_transfer_service.export_todos(session_factory, current_user.id, format),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition" : f'attachment; filename="todos.{format}"'}
+    )
+
+# 직렬화된 응답을 사용자별 버전으로 캐시 (app/core/list_cache.py)
+# 버전을 워커들이 공유하면(redis) If-None-Match 가 현재 ETag 와 같을 때 DB 조회 없이 304
+@router.get("", response_model=todo_schema.TodoPage)
+async def list_todos(
+    sort : Literal["created_at", "due_date"] = Query("created_at", description="정렬 기준"),
+    limit : int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor : str | None = Query(None, description="이전 응답의 next_cursor"),
+    is_completed : bool | None = Query(None, description="완료 여부 필터"),
+    priority : Literal["low", "medium", "high"] | None = Query(None, description="중요도 필터"),
+    if_none_match : str | None = Header(None, description="이전 응답의 ETag"),
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    params = {
+        "sort" : sort,
+        "limit" : limit,
+        "cursor" : cursor,
+        "is_completed" : is_completed,
+        "priority" : priority
+    }
+
+    # 버전은 DB 조회 전에 읽음 -> 조회 도중 쓰기가 있었으면 이전 버전 키로 저장되어 사용되지 않음
+    version = await todo_list_cache.version(current_user.id)
+    etag = None
+    if version is not None :
+        digest = todo_list_cache.params_digest(params)
+        if todo_list_cache.shared :
+            etag = todo_list_cache.etag(current_user.id, version, digest)
+            if todo_list_cache.not_modified(if_none_match, etag) :
+                return _list_response(None, etag, status.HTTP_304_NOT_MODIFIED)
+
+        body = await todo_list_cache.get(current_user.id, version, digest)
+        if body is not None :
+            return _list_response(body, etag)
+
+    try :
+        todos, next_cursor = await todo_service.list_todos(db = db, user_id = current_user.id, **params)
+
+    except InvalidCursorError :
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다."
+        )
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+    # 캐시에 bytes 로 저장해야 하므로 목록은 항상 빠른 경로로 직렬화
+    body = dump_json(todo_schema.TodoPage, {"items" : todos, "next_cursor" : next_cursor})
+
+    # replica 는 이 버전의 쓰기를 아직 반영하지 않았을 수 있음 -> 저장하지 않고 ETag 도 보내지 않음
+    if is_replica_session(db) :
+        return _list_response(body, None)
+    if version is not None :
+        await todo_list_cache.set(current_user.id, version, digest, body)
+
+    return _list_response(body, etag)
+
+# 제목/설명 검색 (관련도순), /{todo_id} 보다 먼저 등록해야 "search"가 todo_id로 해석되지 않음
+@router.get("/search", response_model=todo_schema.TodoPage)
+async def search_todos(
+    q : str = Query(..., min_length=1, max_length=200, description="검색어 (제목/설명, 제목은 오타/앞부분 일치 허용)"),
+    limit : int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor : str | None = Query(None, description="이전 응답의 next_cursor"),
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        todos, next_cursor = await todo_service.search_todos(
+            db = db, user_id = current_user.id, q = q, limit = limit, cursor = cursor
+        )
+        page = {"items" : todos, "next_cursor" : next_cursor}
+        if settings.fast_json_responses :
+            return fast_json_response(todo_schema.TodoPage, page)
+        return page
+
+    except InvalidCursorError :
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다."
+        )
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+# 미완료 / 완료 / 기한 지남 개수 (중요도별), /{todo_id} 보다 먼저 등록
+@router.get("/stats", response_model=todo_schema.TodoStats)
+async def read_todo_stats(
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        stats = await todo_stats_service.get_stats(db = db, user_id = current_user.id)
+        if settings.fast_json_responses :
+            return fast_json_response(todo_schema.TodoStats, stats)
+        return stats
+
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+# 변경분 동기화 : since 이후에 바뀐 할 일과 삭제된 할 일 id (since 없이 시작 -> 전체), /{todo_id} 보다 먼저 등록
+@router.get("/changes", response_model=todo_schema.TodoChanges)
+async def list_todo_changes(
+    since : str | None = Query(None, description="이전 응답의 next_cursor (없으면 처음부터)"),
+    limit : int = Query(100, ge=1, le=500, description="변경/삭제 각각 최대 개수"),
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        changed, deleted, next_cursor, has_more = await todo_service.list_changes(
+            db = db, user_id = current_user.id, cursor = since, limit = limit
+        )
+        body = {"changed" : changed, "deleted" : deleted, "next_cursor" : next_cursor, "has_more" : has_more}
+        if settings.fast_json_responses :
+            return fast_json_response(todo_schema.TodoChanges, body)
+        return body
+
+    except InvalidCursorError :
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다."
+        )
+    except ChangeCursorExpired :
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="동기화 커서가 만료되었습니다. 처음부터 다시 동기화해주세요."
+        )
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+@router.get("/{todo_id}", response_model=todo_schema.Todo)
+async def read_todo(
+    todo_id : int,
+    db : AsyncSession = Depends(get_read_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        todo = await todo_service.get_todo(db = db, user_id = current_user.id, todo_id = todo_id)
+        if settings.fast_json_responses :
+            return fast_json_response(todo_schema.Todo, todo)
+        return todo
+
+    except TodoDoesNotExist :
+        raise _todo_not_found()
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+@router.patch("/{todo_id}", response_model=todo_schema.Todo)
+async def update_todo(
+    todo_id : int,
+    todo : todo_schema.TodoUpdate,
+    db : AsyncSession = Depends(get_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        updated_todo = await todo_service.update_todo(db = db, user_id = current_user.id, todo_id = todo_id, todo = todo)
+        await db.commit()
+        mark_recent_write(current_user.email)
+        await todo_list_cache.invalidate(current_user.id)
+
+        return updated_todo
+
+    except TodoDoesNotExist :
+        raise _todo_not_found()
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
+
+@router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_todo(
+    todo_id : int,
+    db : AsyncSession = Depends(get_db),
+    current_user : user_schema.TokenClaims = Depends(get_token_claims)) :
+
+    try :
+        await todo_service.delete_todo(db = db, user_id = current_user.id, todo_id = todo_id)
+        await db.commit()
+        mark_recent_write(current_user.email)
+        await todo_list_cache.invalidate(current_user.id)
+
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    except TodoDoesNotExist :
+        raise _todo_not_found()
+    except SQLAlchemyError :
+        await db.rollback()
+        raise _internal_error()
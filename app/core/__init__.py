@@ -1 +0,0 @@
-print("core __init__")
\ No newline at end of file
@@ -0,0 +1,44 @@
+'''
+Bloom filter
+    - "확실히 없음" 또는 "있을 수도 있음" 만 알려주는 고정 크기 집합 (삭제 불가)
+    - capacity 개를 넣었을 때 오탐(있다고 잘못 답할) 확률이 error_rate 가 되도록 비트 수/해시 수 결정
+    - 해시는 blake2b 128비트를 둘로 나눠 double hashing (h1 + i * h2)
+    - count 는 새로 비트를 바꾼 추가만 셈 (중복 추가는 제외, 오탐만큼 약간 적게 셀 수 있음)
+'''
+import hashlib
+import math
+
+
+class BloomFilter :
+    def __init__(self, capacity : int, error_rate : float = 0.01) :
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item : str) -> list[int] :
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    # 새로 추가되었으면 True (이미 있던 항목을 다시 넣어도 count 는 늘지 않음)
+    def add(self, item : str) -> bool :
+        added = False
+        for position in self._positions(item) :
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask :
+                self._bits[position >> 3] |= mask
+                added = True
+        self.count += added
+        return added
+
+    def __contains__(self, item : str) -> bool :
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def size_bytes(self) -> int :
+        return len(self._bits)
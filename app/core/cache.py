@@ -0,0 +1,57 @@
+'''
+프로세스 내부(in-process) 캐시
+    - 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    - 항목마다 만료시간(TTL)을 가짐
+    - 이벤트 루프(단일 스레드)에서만 사용하므로 별도의 락은 두지 않음
+'''
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUTTLCache :
+    def __init__(self, maxsize : int, ttl : float) :
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data : OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int :
+        return len(self._data)
+
+    def get(self, key : Hashable, default : Any = None) -> Any :
+        item = self._data.get(key)
+        if item is None :
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic() :
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    # ttl을 지정하지 않으면 기본 ttl 사용, 기본 ttl보다 길게 저장할 수는 없음
+    def set(self, key : Hashable, value : Any, ttl : float | None = None) -> None :
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 :
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize :
+            self._data.popitem(last=False)
+
+    def pop(self, key : Hashable, default : Any = None) -> Any :
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    # 조건에 맞는 항목을 모두 제거하고 제거한 개수를 반환
+    def invalidate_where(self, predicate : Callable[[Hashable, Any], bool]) -> int :
+        keys = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in keys :
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None :
+        self._data.clear()
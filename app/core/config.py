@@ -4,7 +4,7 @@
 from pydantic import Field, AliasChoices, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from urllib.parse import quote_plus
-from typing import List
+from typing import List, Literal
 from pathlib import Path
 
 env_path = Path(__file__).parent.parent.parent / '.env'
@@ -15,13 +15,129 @@ class Settings(BaseSettings) :
     db_host: str = Field(alias="DEV_DB_HOST")
     db_name: str = Field(alias="DEV_DB_NAME")
     
+    # DB 커넥션 풀 / 세션 설정 (배포 환경마다 조정)
+    db_pool_size : int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow : int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout : float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_pre_ping : bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    db_pool_recycle : int = Field(default=1800, alias="DB_POOL_RECYCLE_SECONDS")
+    db_statement_timeout_ms : int = Field(default=30000, alias="DB_STATEMENT_TIMEOUT_MS") # 0 이면 제한 없음
+    db_prepared_statement_cache_size : int = Field(default=100, alias="DB_PREPARED_STATEMENT_CACHE_SIZE") # 0 이면 캐시 사용 안함
+    # 앱 시작 시 pool_size 개의 커넥션을 미리 열고 자주 쓰는 쿼리를 한번씩 실행 (첫 요청들이 연결/prepare 비용을 내지 않도록)
+    db_warm_pool : bool = Field(default=True, alias="DB_WARM_POOL")
+    
+    # 읽기 전용 복제본(replica) 호스트 목록 (비어있으면 모든 쿼리를 primary로)
+    # 사용자/비밀번호/DB 이름은 primary와 동일하다고 가정
+    db_replica_hosts : List[str] = Field(default=[], alias="DB_REPLICA_HOSTS")
+    db_replica_max_lag_seconds : float = Field(default=5.0, alias="DB_REPLICA_MAX_LAG_SECONDS") # 이보다 지연된 replica는 사용 안함
+    db_replica_lag_check_seconds : float = Field(default=5.0, alias="DB_REPLICA_LAG_CHECK_SECONDS") # 지연 측정 주기
+    db_replica_sticky_seconds : float = Field(default=5.0, alias="DB_REPLICA_STICKY_SECONDS") # 쓰기 직후 primary에서 읽는 시간
+    
     secret_key : str = Field(alias="JWT_SECRET_KEY")
     algorithm : str = Field(alias="ALGORITHM")
     access_expire_time : int = Field(alias="ACCESS_TOKEN_EXPIRE_SECONDS")
     refresh_expire_time : int = Field(alias="REFRESH_TOKEN_EXPIRE_SECONDS")
     
+    # 비대칭 키 서명 (app/core/keyring.py), 비어있으면 JWT_SECRET_KEY + ALGORITHM 사용
+    jwt_keys_dir : str = Field(default="", alias="JWT_KEYS_DIR")
+    jwt_active_kid : str = Field(default="", alias="JWT_ACTIVE_KID") # 비어있으면 활성화된 키 중 kid 가 가장 큰 키
+    jwt_key_activation_delay : float = Field(default=600, alias="JWT_KEY_ACTIVATION_DELAY_SECONDS") # 새 키를 JWKS 에 공개한 뒤 서명에 쓰기까지 대기
+    jwt_keys_reload_interval : float = Field(default=60, alias="JWT_KEYS_RELOAD_SECONDS")
+    jwt_accept_legacy_hs256 : bool = Field(default=True, alias="JWT_ACCEPT_LEGACY_HS256") # kid 없는 이전 토큰을 JWT_SECRET_KEY 로 검증
+    
     cors_origins : List[str] = Field(alias="DEV_CORS_ORIGINS")
     
+    # 서버 실행 (python -m app / todo-server)
+    # 워커마다 DB 커넥션 풀(DB_POOL_SIZE + DB_MAX_OVERFLOW)과 bcrypt 풀(HASH_POOL_WORKERS)을 따로 가짐
+    # 다음 상태는 워커 프로세스마다 따로 있으므로 워커가 여러개면 약해짐 (실행 시 경고)
+    #   - LOGIN_RATE_LIMIT_BACKEND=memory : 허용 횟수가 워커 수만큼 늘어남 -> redis 사용
+    #   - TODO_LIST_CACHE_BACKEND=memory  : 다른 워커의 쓰기가 ttl 동안 반영되지 않음 -> redis 사용
+    #   - 토큰 폐기 목록 : 폐기(비활성화, 리프레시 토큰 재사용 감지)가 처리한 워커에만 바로 반영, 나머지는 access token 만료까지
+    #   - replica sticky 목록 : 다른 워커로 간 읽기는 방금 쓴 내용이 없는 replica 로 갈 수 있음
+    server_host : str = Field(default="0.0.0.0", alias="HOST")
+    server_port : int = Field(default=8000, alias="PORT")
+    server_workers : int = Field(default=1, ge=0, alias="WEB_CONCURRENCY") # 0 이면 사용 가능한 CPU 코어 수
+    server_graceful_timeout : float = Field(default=30.0, alias="GRACEFUL_SHUTDOWN_SECONDS") # 종료 시 처리중인 요청을 기다리는 최대 시간 (열린 SSE 스트림은 이 시간이 지나야 끊김)
+    server_keepalive : int = Field(default=5, alias="KEEPALIVE_SECONDS")
+    server_forwarded_allow_ips : str = Field(default="127.0.0.1", alias="FORWARDED_ALLOW_IPS") # X-Forwarded-For 를 믿을 프록시 IP
+    
+    # bcrypt 해싱 워커 풀 (thread | process), 대기열 한도를 넘으면 503 응답
+    hash_pool_kind : Literal["thread", "process"] = Field(default="thread", alias="HASH_POOL_KIND")
+    hash_pool_workers : int = Field(default=4, alias="HASH_POOL_WORKERS")
+    hash_pool_max_queue : int = Field(default=64, alias="HASH_POOL_MAX_QUEUE")
+    # bcrypt 비용(work factor), 1 올릴 때마다 해싱 시간 2배 -> python -m bench.bcrypt_cost 로 측정 후 결정
+    # 저장된 해시의 비용이 다르면 다음 로그인 성공 시 새 비용으로 다시 해싱
+    bcrypt_rounds : int = Field(default=12, ge=4, le=31, alias="BCRYPT_ROUNDS")
+    
+    # 검증된 access token 캐시 (토큰 exp보다 오래 저장하지 않음)
+    token_cache_size : int = Field(default=4096, alias="TOKEN_CACHE_SIZE")
+    token_cache_ttl : int = Field(default=60, alias="TOKEN_CACHE_TTL_SECONDS")
+    # 폐기한 access token / 사용자 목록 최대 개수 (access token 만료시간 동안 유지)
+    revocation_list_size : int = Field(default=100_000, alias="REVOCATION_LIST_SIZE")
+    
+    # 할 일 목록 응답 캐시 (사용자별 버전으로 무효화)
+    # memory 백엔드는 워커 프로세스마다 따로 동작 -> 워커가 여러개면 redis 사용 (아니면 ttl 만큼 오래된 응답이 나갈 수 있음)
+    # ETag / 304 는 버전을 공유하는 redis 백엔드에서만 사용
+    todo_list_cache_backend : Literal["memory", "redis", "none"] = Field(default="memory", alias="TODO_LIST_CACHE_BACKEND")
+    todo_list_cache_redis_url : str = Field(default="redis://localhost:6379/0", alias="TODO_LIST_CACHE_REDIS_URL") # local:// 이면 프로세스 내부 대체 구현 사용
+    todo_list_cache_size : int = Field(default=10000, alias="TODO_LIST_CACHE_SIZE")
+    todo_list_cache_ttl : int = Field(default=30, alias="TODO_LIST_CACHE_TTL_SECONDS")
+    
+    # 응답을 TypeAdapter 로 바로 JSON bytes 직렬화 (app/core/responses.py)
+    fast_json_responses : bool = Field(default=False, alias="FAST_JSON_RESPONSES")
+    
+    # 할 일 변경 실시간 전달 (LISTEN/NOTIFY -> WebSocket/SSE, app/core/realtime.py)
+    # 끄면 쓰기 시 NOTIFY 도 보내지 않음
+    realtime_enabled : bool = Field(default=True, alias="REALTIME_ENABLED")
+    realtime_queue_size : int = Field(default=100, ge=1, alias="REALTIME_QUEUE_SIZE") # 연결별 대기 이벤트 수, 넘으면 느린 연결로 보고 끊음
+    realtime_heartbeat_seconds : float = Field(default=15.0, alias="REALTIME_HEARTBEAT_SECONDS") # 이벤트가 없을 때 ping 주기 (프록시 idle timeout 보다 짧게)
+    realtime_max_subscribers : int = Field(default=1000, alias="REALTIME_MAX_SUBSCRIBERS") # 워커당 최대 동시 연결 수
+    
+    # 할 일 변경분 동기화 (/todos/changes)
+    # overlap : 커서보다 이만큼 이전부터 다시 조회 (늦게 커밋된 트랜잭션의 변경 누락 방지, 가장 긴 쓰기 트랜잭션 + replica 지연보다 길게)
+    todo_changes_overlap : float = Field(default=60.0, alias="TODO_CHANGES_OVERLAP_SECONDS")
+    todo_tombstone_retention : int = Field(default=30 * 24 * 3600, alias="TODO_TOMBSTONE_RETENTION_SECONDS") # 이보다 오래된 커서는 410 (전체 다시 동기화)
+    todo_tombstone_purge_interval : float = Field(default=3600, alias="TODO_TOMBSTONE_PURGE_INTERVAL_SECONDS")
+    
+    # 할 일 통계 (/todos/stats) 정합성 점검 주기 / 한 트랜잭션에서 다시 집계할 사용자 수
+    todo_stats_reconcile_interval : float = Field(default=6 * 3600, alias="TODO_STATS_RECONCILE_INTERVAL_SECONDS")
+    todo_stats_reconcile_batch_users : int = Field(default=100, ge=1, alias="TODO_STATS_RECONCILE_BATCH_USERS")
+    
+    # 할 일 내보내기 / 가져오기 (/todos/export, /todos/import)
+    todo_export_chunk_rows : int = Field(default=1000, ge=1, alias="TODO_EXPORT_CHUNK_ROWS") # 서버 측 커서에서 한번에 가져와 응답으로 보낼 행 수
+    todo_import_max_rows : int = Field(default=1_000_000, ge=1, alias="TODO_IMPORT_MAX_ROWS")
+    todo_import_max_line_bytes : int = Field(default=64 * 1024, ge=1, alias="TODO_IMPORT_MAX_LINE_BYTES") # 줄바꿈 없이 계속 들어오는 본문이 메모리를 채우지 않도록
+    # 가져오기는 COPY 하는 동안 primary 커넥션을 잡고 있으므로 본문 청크 사이에 이보다 오래 멈추면 중단 (408)
+    todo_import_read_timeout : float = Field(default=10.0, gt=0, alias="TODO_IMPORT_READ_TIMEOUT_SECONDS")
+    
+    # 로그인 시도 rate limit (IP 별 / 이메일 별로 window 초 동안 허용 횟수)
+    # memory 백엔드는 워커마다 따로 집계 -> 워커가 여러개면 redis 사용
+    login_rate_limit_backend : Literal["memory", "redis", "none"] = Field(default="memory", alias="LOGIN_RATE_LIMIT_BACKEND")
+    login_rate_limit_redis_url : str = Field(default="redis://localhost:6379/0", alias="LOGIN_RATE_LIMIT_REDIS_URL") # local:// 이면 프로세스 내부 대체 구현 사용
+    login_rate_limit_ip_attempts : int = Field(default=20, alias="LOGIN_RATE_LIMIT_IP_ATTEMPTS")
+    login_rate_limit_email_attempts : int = Field(default=5, alias="LOGIN_RATE_LIMIT_EMAIL_ATTEMPTS")
+    login_rate_limit_window : float = Field(default=60.0, alias="LOGIN_RATE_LIMIT_WINDOW_SECONDS")
+    
+    # 가입된 이메일 Bloom filter (가입되지 않은 이메일 로그인은 DB 조회 없이 거절, 워커별 상태)
+    email_filter_enabled : bool = Field(default=True, alias="EMAIL_FILTER_ENABLED")
+    email_filter_capacity : int = Field(default=100_000, alias="EMAIL_FILTER_CAPACITY") # 최소 크기 (사용자 수의 2배와 비교해서 큰 값)
+    email_filter_error_rate : float = Field(default=0.01, alias="EMAIL_FILTER_ERROR_RATE")
+    email_filter_refresh_interval : float = Field(default=60, alias="EMAIL_FILTER_REFRESH_SECONDS") # 다른 워커의 가입을 따라잡는 주기
+    email_filter_gap_ttl : float = Field(default=600, alias="EMAIL_FILTER_GAP_SECONDS") # 비어 있던 id 를 다시 확인하는 기간 (INSERT 트랜잭션이 이보다 오래 걸리지 않는다고 가정)
+    
+    # 유지보수 스케줄러 (만료 토큰 정리 등)
+    # 한번에 batch_size 행씩 삭제하고 배치 사이에 잠시 쉬어서 긴 락을 잡지 않음
+    maintenance_enabled : bool = Field(default=True, alias="MAINTENANCE_ENABLED") # false 여도 JWT 키 다시 읽기는 실행
+    maintenance_batch_size : int = Field(default=1000, alias="MAINTENANCE_BATCH_SIZE")
+    maintenance_batch_sleep : float = Field(default=0.1, alias="MAINTENANCE_BATCH_SLEEP_SECONDS")
+    maintenance_max_batches : int = Field(default=1000, alias="MAINTENANCE_MAX_BATCHES") # 한번 실행에서 최대 배치 수
+    refresh_token_purge_interval : float = Field(default=3600, alias="REFRESH_TOKEN_PURGE_INTERVAL_SECONDS")
+    
+    # 로깅 (JSON, 큐 기반 비동기 출력)
+    log_level : str = Field(default="INFO", alias="LOG_LEVEL")
+    log_sample_routes : List[str] = Field(default=["/auth/me", "/todos", "/todos/{todo_id}", "/metrics"], alias="LOG_SAMPLE_ROUTES")
+    log_sample_rate : float = Field(default=0.1, alias="LOG_SAMPLE_RATE") # sample_routes 정상 응답 중 기록할 비율
+    
     model_config = SettingsConfigDict(
         case_sensitive=False,
         env_file = env_path,
@@ -35,6 +151,14 @@ class Settings(BaseSettings) :
         return f"postgresql+asyncpg://{self.db_user}:{encoded_password}@{self.db_host}/{self.db_name}"
         # return f"postgresql+psycopg2://{self.db_user}:{encoded_password}@{self.db_host}/{self.db_name}" psycopg2 : 동기
     
+    @property
+    def replica_db_urls(self) -> List[str] :
+        encoded_password = quote_plus(self.db_password)
+        return [
+            f"postgresql+asyncpg://{self.db_user}:{encoded_password}@{host}/{self.db_name}"
+            for host in self.db_replica_hosts
+        ]
+    
 
 settings = Settings()
     
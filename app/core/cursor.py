@@ -0,0 +1,33 @@
+'''
+keyset(cursor) 페이지네이션용 커서 인코딩/디코딩
+    - 마지막으로 내려준 행의 정렬 키 값들을 JSON -> base64url 문자열로 만들어 클라이언트에 전달
+    - 클라이언트는 다음 페이지 요청 시 그대로 돌려보냄 (OFFSET을 쓰지 않으므로 페이지 깊이와 무관하게 O(page))
+'''
+import base64
+import json
+from datetime import date, datetime
+
+from app import InvalidCursorError
+
+
+def _default(value) :
+    if isinstance(value, (datetime, date)) :
+        return value.isoformat()
+    raise TypeError(f"cursor에 넣을 수 없는 타입입니다 : {type(value)}")
+
+
+def encode_cursor(values : dict) -> str :
+    raw = json.dumps(values, default=_default, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor : str) -> dict :
+    try :
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e :
+        raise InvalidCursorError() from e
+
+    if not isinstance(values, dict) :
+        raise InvalidCursorError()
+    return values
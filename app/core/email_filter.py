@@ -0,0 +1,180 @@
+'''
+가입된 이메일 Bloom filter (로그인 시 가입되지 않은 이메일은 DB 조회 없이 거절)
+    - 앱 시작 시 users 테이블 전체로 생성, 가입 시 바로 추가
+    - 다른 워커에서 가입한 사용자는 id > watermark 인 행만 읽어서 따라잡음 (스케줄러 주기 실행)
+    - id는 INSERT 시점에 할당되므로 커밋 순서와 다를 수 있음 (작은 id가 나중에 커밋)
+      -> 따라잡을 때 비어 있던 id(아직 커밋되지 않았거나 롤백된 INSERT)를 기억해두고 다음에 다시 확인
+         EMAIL_FILTER_GAP_SECONDS 동안 나타나지 않으면 롤백된 것으로 보고 버림 (created_at 과 무관)
+    - "없음" 이면 요청을 기다리게 하지 않고 백그라운드로 따라잡기를 시작 (동시에 하나만)
+      -> 다른 워커에서 방금 가입한 사용자는 첫 로그인이 거절될 수 있지만 따라잡은 뒤(보통 수십 ms) 다시 시도하면 성공
+         그 사이의 "없음" 이 실제로는 가입된 이메일이었으면 stale 로 기록
+    - 오탐(가입되지 않았는데 있다고 답함)은 DB 조회로 걸러짐, 이메일 삭제는 반영하지 않음(오탐이 될 뿐)
+'''
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select, func
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.metrics import registry
+from app.database import replica_router
+from app.models import user as user_model
+
+logger = logging.getLogger(__name__)
+
+Users = user_model.Users
+
+EMAIL_FILTER_LOOKUPS = registry.counter(
+    "email_filter_lookups_total", "로그인 시 가입 이메일 Bloom filter 조회 결과", ["result"]
+)
+
+# 한번에 기억하는 빈 id 수 (삭제된 사용자가 많으면 재생성 직후 빈 id 가 많음 -> 오래된 것부터 버림)
+_MAX_GAPS = 10_000
+# stale 집계를 위해 기억하는 "없음" 이메일 수 (가입되지 않은 이메일로 계속 시도해도 메모리가 늘지 않도록)
+_MAX_MISSED = 10_000
+
+
+class RegisteredEmailFilter :
+    def __init__(self, min_capacity : int, error_rate : float, batch_size : int, gap_ttl : float) :
+        self.min_capacity = min_capacity
+        self.error_rate = error_rate
+        self.batch_size = batch_size
+        self.gap_ttl = gap_ttl
+        self.bloom : BloomFilter | None = None
+        self.watermark = 0
+        self.gaps : dict[int, float] = {} # watermark 이하에서 아직 읽지 못한 id -> 처음 비어 있던 시각 (monotonic)
+        self.missed : set[str] = set() # 마지막 따라잡기 이후 "없음" 으로 답한 이메일 (stale 집계용)
+        self._refresh_task : asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool :
+        return self.bloom is not None
+
+    def add(self, email : str) -> None :
+        if self.bloom is not None :
+            self.bloom.add(email)
+
+    '''
+        전체 다시 생성 (앱 시작 시, 예상 개수를 넘었을 때)
+        - 현재 사용자 수의 2배 크기로 만들어서 한동안 오탐률 유지
+        - 로드한 행 수 반환
+    '''
+    async def rebuild(self) -> int :
+        session_factory = replica_router.primary
+        async with session_factory() as db :
+            total = (await db.execute(select(func.count()).select_from(Users))).scalar() or 0
+
+        bloom = BloomFilter(max(self.min_capacity, total * 2), self.error_rate)
+        watermark, gaps = await self._load_after(bloom, 0, {})
+
+        self.bloom = bloom
+        self.watermark = watermark
+        self.gaps = gaps
+        logger.info("email filter rebuilt", extra={"emails" : bloom.count, "bytes" : bloom.size_bytes})
+        return bloom.count
+
+    '''
+        watermark 이후에 가입한 이메일과 비어 있던 id 중 그 사이 커밋된 이메일 추가 (스케줄러 작업)
+        - 예상 개수를 넘으면 전체 다시 생성
+        - 진행 중인 따라잡기가 있으면 새로 시작하지 않고 그 결과를 기다림
+    '''
+    async def refresh(self) -> int :
+        return await asyncio.shield(self._start_refresh())
+
+    '''
+        가입되어 있을 수도 있으면 True, 이 워커가 아는 한 없으면 False
+        - False 면 따라잡기를 백그라운드로 시작 (기다리지 않음)
+    '''
+    def might_contain(self, email : str) -> bool :
+        if self.bloom is None :
+            EMAIL_FILTER_LOOKUPS.inc(result="not_ready")
+            return True
+        if email in self.bloom :
+            EMAIL_FILTER_LOOKUPS.inc(result="maybe")
+            return True
+
+        EMAIL_FILTER_LOOKUPS.inc(result="negative")
+        if len(self.missed) < _MAX_MISSED :
+            self.missed.add(email)
+        self._start_refresh()
+        return False
+
+    def _start_refresh(self) -> asyncio.Task :
+        if self._refresh_task is None :
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(self._refresh_done)
+        return self._refresh_task
+
+    def _refresh_done(self, task : asyncio.Task) -> None :
+        self._refresh_task = None
+        if not task.cancelled() and task.exception() is not None :
+            logger.warning("email filter refresh failed", exc_info=task.exception())
+
+    async def _refresh(self) -> int :
+        if self.bloom is None or self.bloom.count > self.bloom.capacity :
+            count = await self.rebuild()
+        else :
+            bloom = self.bloom
+            before = bloom.count
+            watermark, gaps = await self._load_after(bloom, self.watermark, dict(self.gaps))
+            # 그 사이에 다시 생성되었으면 새 filter 의 watermark 를 건드리지 않음
+            if self.bloom is bloom :
+                self.watermark = watermark
+                self.gaps = gaps
+            count = bloom.count - before
+
+        missed, self.missed = self.missed, set()
+        stale = sum(email in self.bloom for email in missed)
+        if stale :
+            EMAIL_FILTER_LOOKUPS.inc(stale, result="stale")
+        return count
+
+    '''
+        id > after 인 이메일과 gaps 의 id 중 그 사이 커밋된 이메일을 batch_size 씩 읽어서 추가 (primary 에서 읽음 -> replica 지연 무관)
+        - (다음 watermark, 남은 빈 id) 반환
+        - 읽은 id 사이가 비어 있으면 gaps 에 추가, gap_ttl 이 지난 빈 id 는 버림
+    '''
+    async def _load_after(self, bloom : BloomFilter, after : int, gaps : dict[int, float]) -> tuple[int, dict[int, float]] :
+        session_factory = replica_router.primary
+        now = time.monotonic()
+        last_id = after
+        async with session_factory() as db :
+            pending = list(gaps)
+            for start in range(0, len(pending), self.batch_size) :
+                chunk = pending[start:start + self.batch_size]
+                found = (await db.execute(select(Users.id, Users.email).where(Users.id.in_(chunk)))).all()
+                for user_id, email in found :
+                    bloom.add(email)
+                    gaps.pop(user_id, None)
+
+            while True :
+                query = (
+                    select(Users.id, Users.email)
+                    .where(Users.id > last_id)
+                    .order_by(Users.id)
+                    .limit(self.batch_size)
+                )
+                batch = (await db.execute(query)).all()
+                for user_id, email in batch :
+                    bloom.add(email)
+                    # 시퀀스가 크게 건너뛴 경우(재시작 등)는 마지막 batch_size 개만 기억
+                    for missing in range(max(last_id + 1, user_id - self.batch_size), user_id) :
+                        gaps.setdefault(missing, now)
+                    last_id = user_id
+                if len(batch) < self.batch_size :
+                    break
+
+        gaps = {user_id : seen for user_id, seen in gaps.items() if now - seen < self.gap_ttl}
+        if len(gaps) > _MAX_GAPS :
+            gaps = dict(sorted(gaps.items())[-_MAX_GAPS:])
+        return last_id, gaps
+
+
+registered_emails = RegisteredEmailFilter(
+    min_capacity = settings.email_filter_capacity,
+    error_rate = settings.email_filter_error_rate,
+    batch_size = settings.maintenance_batch_size,
+    gap_ttl = settings.email_filter_gap_ttl
+)
@@ -0,0 +1,105 @@
+'''
+bcrypt 해싱/검증처럼 CPU를 오래 점유하는 작업을 이벤트 루프 밖(스레드 또는 프로세스 풀)에서 실행하는 워커 풀
+    - 실행중 + 대기중인 작업 수가 (workers + max_queue)를 넘으면 기다리지 않고 즉시 HashPoolSaturated 발생 (back-pressure)
+    - 작업마다 큐 대기시간과 실제 해싱 시간을 나눠서 집계
+'''
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Any, Literal
+
+from app import HashPoolSaturated
+
+
+# 워커(스레드/프로세스)안에서 실행되는 함수 -> 결과와 순수 실행시간을 같이 돌려준다
+# ProcessPoolExecutor에서도 pickle 가능해야 하므로 모듈 최상단에 정의
+def _timed_call(fn : Callable[..., Any], *args : Any) -> tuple[Any, float] :
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+@dataclass
+class HashPoolMetrics :
+    completed : int = 0
+    rejected : int = 0
+    in_flight : int = 0
+    queue_wait_seconds_total : float = 0.0
+    queue_wait_seconds_max : float = 0.0
+    hash_seconds_total : float = 0.0
+    hash_seconds_max : float = 0.0
+
+    def observe(self, queue_wait : float, hash_time : float) -> None :
+        self.completed += 1
+        self.queue_wait_seconds_total += queue_wait
+        self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, queue_wait)
+        self.hash_seconds_total += hash_time
+        self.hash_seconds_max = max(self.hash_seconds_max, hash_time)
+
+    def snapshot(self) -> dict :
+        return asdict(self)
+
+
+class HashPool :
+    '''
+        kind        : "thread" | "process"  (bcrypt는 GIL을 해제하므로 보통 thread로 충분)
+        max_workers : 동시에 해싱을 수행할 워커 수
+        max_queue   : 워커가 모두 바쁠 때 대기할 수 있는 최대 작업 수
+    '''
+    def __init__(self, kind : Literal["thread", "process"], max_workers : int, max_queue : int) :
+        self._kind = kind
+        self._max_workers = max_workers
+        self._max_pending = max_workers + max_queue
+        self._executor : Executor | None = None
+        self.metrics = HashPoolMetrics()
+        # 작업이 끝날 때마다 (queue_wait, hash_time) 으로 호출 (히스토그램 수집용)
+        self.observers : list[Callable[[float, float], None]] = []
+
+    # executor는 처음 사용할 때 생성 (import 시점에 프로세스를 띄우지 않기 위해)
+    def _get_executor(self) -> Executor :
+        if self._executor is None :
+            if self._kind == "process" :
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else :
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="hash-pool")
+        return self._executor
+
+    async def run(self, fn : Callable[..., Any], *args : Any) -> Any :
+        # 이벤트 루프는 단일 스레드이므로 in_flight 카운터에 별도의 락이 필요 없다
+        if self.metrics.in_flight >= self._max_pending :
+            self.metrics.rejected += 1
+            raise HashPoolSaturated()
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        job = self._get_executor().submit(_timed_call, fn, *args)
+        self.metrics.in_flight += 1
+        # 기다리던 요청이 취소되어도 워커에서 실행중인 작업은 끝까지 돌므로 작업이 실제로 끝날 때 감소
+        job.add_done_callback(lambda _ : self._release(loop))
+
+        result, hash_time = await asyncio.wrap_future(job)
+
+        # 전체 소요시간 - 실제 해싱시간 = 큐에서 기다린 시간
+        elapsed = time.perf_counter() - submitted
+        queue_wait = max(elapsed - hash_time, 0.0)
+        self.metrics.observe(queue_wait=queue_wait, hash_time=hash_time)
+        for observer in self.observers :
+            observer(queue_wait, hash_time)
+        return result
+
+    # executor 스레드에서 호출될 수 있으므로 카운터는 이벤트 루프에서 감소
+    def _release(self, loop : asyncio.AbstractEventLoop) -> None :
+        try :
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError :
+            # 이벤트 루프가 이미 닫힘 (종료 중)
+            pass
+
+    def _decrement(self) -> None :
+        self.metrics.in_flight -= 1
+
+    def shutdown(self, wait : bool = True) -> None :
+        if self._executor is not None :
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,163 @@
+'''
+요청/DB/bcrypt 계측
+    - MetricsMiddleware   : 라우트별 지연시간, 요청당 쿼리 수/DB 시간 (N+1 쿼리 탐지용), 커넥션 풀 대기 시간
+    - instrument_engine   : SQLAlchemy cursor 이벤트로 쿼리 시간 측정 + 커넥션 풀 상태 gauge
+    - TimedQueuePool      : 풀에서 커넥션을 꺼낼 때까지 기다린 시간 (풀 고갈 탐지용)
+    - bcrypt 워커 풀의 큐 대기시간/해싱시간
+    결과는 app.core.metrics.registry 에 모이고 /metrics 에서 Prometheus 텍스트 포맷으로 노출
+'''
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import registry
+from app.core.hash_pool import HashPool
+from app.core.scheduler import MaintenanceScheduler
+
+
+# 요청 하나 동안의 DB 사용량 (미들웨어가 요청마다 새로 만들고 SQLAlchemy 이벤트가 누적)
+# SQLAlchemy asyncio는 greenlet에 contextvars를 전달하므로 이벤트 핸들러에서도 같은 값을 볼 수 있음
+@dataclass
+class RequestStats :
+    db_queries : int = 0
+    db_seconds : float = 0.0
+    pool_wait_seconds : float = 0.0
+
+current_request_stats : ContextVar[RequestStats | None] = ContextVar("current_request_stats", default=None)
+
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ["method", "route", "status"]
+)
+HTTP_REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries", "요청당 실행한 SQL 쿼리 수", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+)
+HTTP_REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds", "요청당 SQL 실행 시간 합계", ["route"]
+)
+HTTP_REQUEST_DB_POOL_WAIT_SECONDS = registry.histogram(
+    "http_request_db_pool_wait_seconds", "요청당 커넥션 풀에서 커넥션을 기다린 시간 합계 (풀 고갈 시 어느 라우트가 기다리는지)", ["route"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "SQL 쿼리 하나의 실행 시간", ["engine"]
+)
+DB_POOL_CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_wait_seconds", "커넥션 풀에서 커넥션을 얻기까지 걸린 시간", ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+)
+BCRYPT_QUEUE_WAIT_SECONDS = registry.histogram(
+    "bcrypt_queue_wait_seconds", "bcrypt 작업이 워커 풀에서 대기한 시간"
+)
+BCRYPT_HASH_SECONDS = registry.histogram(
+    "bcrypt_hash_seconds", "bcrypt 해싱/검증에 걸린 시간"
+)
+
+
+class MetricsMiddleware :
+    '''
+        순수 ASGI 미들웨어 (BaseHTTPMiddleware 보다 오버헤드가 적음)
+        - route 라벨은 실제 경로가 아닌 라우트 템플릿(/todos/{todo_id}) 사용 -> 라벨 폭증 방지
+    '''
+    def __init__(self, app) :
+        self.app = app
+
+    async def __call__(self, scope, receive, send) :
+        if scope["type"] != "http" :
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message) :
+            nonlocal status_code
+            if message["type"] == "http.response.start" :
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try :
+            await self.app(scope, receive, send_wrapper)
+        finally :
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route_path, status=str(status_code))
+            HTTP_REQUEST_DB_QUERIES.observe(stats.db_queries, route=route_path)
+            HTTP_REQUEST_DB_SECONDS.observe(stats.db_seconds, route=route_path)
+            HTTP_REQUEST_DB_POOL_WAIT_SECONDS.observe(stats.pool_wait_seconds, route=route_path)
+            current_request_stats.reset(token)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool) :
+    # 풀에서 커넥션을 꺼내는 시간 (풀이 비어 있으면 반납될 때까지 대기 + 새 커넥션 생성 시간 포함)
+    def _do_get(self) :
+        start = time.perf_counter()
+        try :
+            return super()._do_get()
+        finally :
+            elapsed = time.perf_counter() - start
+            DB_POOL_CHECKOUT_SECONDS.observe(elapsed, engine=getattr(self, "metrics_name", "unknown"))
+            stats = current_request_stats.get()
+            if stats is not None :
+                stats.pool_wait_seconds += elapsed
+
+
+_engines : dict[str, AsyncEngine] = {}
+
+def _pool_stats() :
+    for name, engine in _engines.items() :
+        pool = engine.sync_engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool) :
+            yield {"engine" : name, "state" : "checked_out"}, pool.checkedout()
+            yield {"engine" : name, "state" : "idle"}, pool.checkedin()
+            yield {"engine" : name, "state" : "overflow"}, max(pool.overflow(), 0)
+
+registry.gauge("db_pool_connections", "커넥션 풀 상태별 커넥션 수", _pool_stats, ["engine", "state"])
+
+
+def instrument_engine(engine : AsyncEngine, name : str) -> None :
+    sync_engine = engine.sync_engine
+    sync_engine.pool.metrics_name = name
+    _engines[name] = engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) :
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) :
+        elapsed = time.perf_counter() - context._query_start_time
+        DB_QUERY_SECONDS.observe(elapsed, engine=name)
+        stats = current_request_stats.get()
+        if stats is not None :
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+
+def instrument_hash_pool(pool : HashPool) -> None :
+    def _observe(queue_wait : float, hash_time : float) -> None :
+        BCRYPT_QUEUE_WAIT_SECONDS.observe(queue_wait)
+        BCRYPT_HASH_SECONDS.observe(hash_time)
+
+    pool.observers.append(_observe)
+    registry.gauge("bcrypt_pool_in_flight", "bcrypt 워커 풀에서 실행/대기중인 작업 수", lambda : [({}, pool.metrics.in_flight)])
+    registry.counter_func("bcrypt_pool_rejected_total", "풀 포화로 거절된 bcrypt 작업 수", lambda : [({}, pool.metrics.rejected)])
+
+
+def instrument_scheduler(scheduler : MaintenanceScheduler) -> None :
+    def _collect(field : str) :
+        return lambda : [({"job" : name}, metrics[field]) for name, metrics in scheduler.snapshot().items()]
+
+    registry.counter_func("maintenance_job_runs_total", "유지보수 작업 실행 횟수", _collect("runs"), ["job"])
+    registry.counter_func("maintenance_job_failures_total", "유지보수 작업 실패 횟수", _collect("failures"), ["job"])
+    registry.counter_func("maintenance_job_rows_total", "유지보수 작업이 처리한 행 수", _collect("rows_total"), ["job"])
+    registry.gauge("maintenance_job_last_duration_seconds", "유지보수 작업의 마지막 실행 시간", _collect("last_duration_seconds"), ["job"])
@@ -0,0 +1,180 @@
+'''
+JWT 서명 키 모음 (kid 로 찾음)
+    - JWT_KEYS_DIR 가 비어있으면 기존처럼 JWT_SECRET_KEY + ALGORITHM(HS256)으로 서명 (kid 없음)
+    - JWT_KEYS_DIR 를 설정하면 비대칭 키로 서명하고 공개키를 JWKS(/.well-known/jwks.json)로 공개
+        <kid>.pem     : 개인키 (서명 + 검증), 암호 없는 PKCS8/PEM
+        <kid>.pub.pem : 공개키 (검증만, 폐기 예정이거나 다른 서버가 발급한 키)
+      키 종류로 알고리즘 결정 : RSA -> RS256, Ed25519 -> EdDSA, EC P-256 -> ES256
+    - PEM 은 읽을 때 한번만 파싱해서 키 객체로 보관 (검증할 때마다 파싱하지 않음)
+    - 키 교체 (재시작 없이, 기존 세션 유지)
+        1. 새 개인키 파일 추가 -> 다음 reload 때 JWKS 에 공개, 검증 가능
+        2. 파일이 생긴 지 JWT_KEY_ACTIVATION_DELAY_SECONDS 가 지나면 서명 키로 사용
+           (다른 서버가 캐시한 JWKS 가 갱신될 시간을 줌, 활성화된 키 중 kid 가 가장 큰 키 = 서명 키)
+        3. 이전 키로 발급한 토큰이 모두 만료된 뒤(refresh token 수명) 이전 키 파일 삭제
+      JWT_ACTIVE_KID 를 지정하면 위 규칙 대신 그 키로 서명
+    - kid 가 없는 토큰(HS256으로 발급된 이전 토큰)은 JWT_ACCEPT_LEGACY_HS256 이면 JWT_SECRET_KEY 로 검증
+'''
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JWKS_CONTENT_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class SigningKey :
+    kid : str
+    algorithm : str
+    public_key : Any
+    private_key : Any | None = None
+    created_at : float = 0.0
+
+
+def _algorithm_for(key : Any) -> str :
+    from cryptography.hazmat.primitives.asymmetric import rsa, ed25519, ec
+
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)) :
+        return "RS256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)) :
+        return "EdDSA"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and key.curve.name == "secp256r1" :
+        return "ES256"
+    raise ValueError(f"지원하지 않는 키 종류입니다 : {type(key).__name__}")
+
+
+def _to_jwk(key : SigningKey) -> dict :
+    from jwt.algorithms import RSAAlgorithm, OKPAlgorithm, ECAlgorithm
+
+    converter = {"RS256" : RSAAlgorithm, "EdDSA" : OKPAlgorithm, "ES256" : ECAlgorithm}[key.algorithm]
+    jwk = converter.to_jwk(key.public_key, as_dict=True)
+    jwk.update({"kid" : key.kid, "alg" : key.algorithm, "use" : "sig"})
+    return jwk
+
+
+class Keyring :
+    def __init__(
+        self,
+        keys_dir : str,
+        secret_key : str,
+        secret_algorithm : str,
+        active_kid : str = "",
+        activation_delay : float = 0.0,
+        accept_legacy : bool = True
+    ) :
+        self.keys_dir = Path(keys_dir) if keys_dir else None
+        self.secret_key = secret_key
+        self.secret_algorithm = secret_algorithm
+        self.active_kid = active_kid
+        self.activation_delay = activation_delay
+        self.accept_legacy = accept_legacy
+
+        self.keys : dict[str, SigningKey] = {}
+        self.jwks : bytes = b'{"keys":[]}'
+        self._fingerprint : tuple = ()
+
+    @property
+    def asymmetric(self) -> bool :
+        return self.keys_dir is not None
+
+    '''
+        키 디렉터리를 다시 읽음 (파일 목록/수정시각이 그대로면 아무것도 하지 않음)
+        - 읽기에 실패하면 기존 키를 그대로 사용
+        - 새로 읽었으면 키 개수, 변경 없으면 0 반환 (스케줄러 작업)
+    '''
+    def reload(self) -> int :
+        if self.keys_dir is None :
+            return 0
+
+        files = sorted(self.keys_dir.glob("*.pem"))
+        fingerprint = tuple((path.name, path.stat().st_mtime_ns) for path in files)
+        if fingerprint == self._fingerprint :
+            return 0
+
+        from cryptography.hazmat.primitives import serialization
+
+        keys : dict[str, SigningKey] = {}
+        for path in files :
+            data = path.read_bytes()
+            created_at = path.stat().st_mtime
+            if path.name.endswith(".pub.pem") :
+                kid = path.name.removesuffix(".pub.pem")
+                public_key = serialization.load_pem_public_key(data)
+                private_key = None
+            else :
+                kid = path.name.removesuffix(".pem")
+                private_key = serialization.load_pem_private_key(data, password=None)
+                public_key = private_key.public_key()
+
+            # 같은 kid 의 개인키와 공개키가 모두 있으면 개인키 사용
+            if kid in keys and keys[kid].private_key is not None :
+                continue
+            keys[kid] = SigningKey(kid, _algorithm_for(public_key), public_key, private_key, created_at)
+
+        if not any(key.private_key is not None for key in keys.values()) :
+            raise ValueError(f"서명에 사용할 개인키가 없습니다 : {self.keys_dir}")
+        if self.active_kid and (self.active_kid not in keys or keys[self.active_kid].private_key is None) :
+            raise ValueError(f"JWT_ACTIVE_KID 에 해당하는 개인키가 없습니다 : {self.active_kid}")
+
+        self.keys = keys
+        self.jwks = json.dumps({"keys" : [_to_jwk(key) for key in keys.values()]}, separators=(",", ":")).encode()
+        self._fingerprint = fingerprint
+        logger.info("jwt keyring loaded", extra={"kids" : sorted(keys)})
+        return len(keys)
+
+    # 스케줄러 작업용 (키 파일 변경 감지)
+    async def refresh(self) -> int :
+        return self.reload()
+
+    def signing_key(self) -> SigningKey :
+        if self.active_kid :
+            return self.keys[self.active_kid]
+
+        private_keys = sorted((key for key in self.keys.values() if key.private_key is not None), key=lambda key : key.kid)
+        now = time.time()
+        active = [key for key in private_keys if key.created_at + self.activation_delay <= now]
+        # 아직 활성화된 키가 없으면(처음 배포) kid 가 가장 작은 키 사용 (새로 추가한 키보다 먼저 공개됐을 가능성이 큼)
+        return active[-1] if active else private_keys[0]
+
+    def encode(self, payload : dict) -> str :
+        if self.keys_dir is None :
+            return jwt.encode(payload, self.secret_key, self.secret_algorithm)
+
+        key = self.signing_key()
+        return jwt.encode(payload, key.private_key, algorithm=key.algorithm, headers={"kid" : key.kid})
+
+    # 서명/만료 검증 (실패하면 jwt.InvalidTokenError 계열 예외)
+    def decode(self, token : str) -> dict :
+        if self.keys_dir is None :
+            return jwt.decode(token, self.secret_key, algorithms=[self.secret_algorithm])
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None :
+            if not self.accept_legacy :
+                raise jwt.InvalidTokenError("kid 가 없는 토큰입니다.")
+            return jwt.decode(token, self.secret_key, algorithms=[self.secret_algorithm])
+
+        key = self.keys.get(kid)
+        if key is None :
+            raise jwt.InvalidTokenError(f"알 수 없는 kid 입니다 : {kid}")
+        # 헤더의 alg 가 아니라 키에 정해진 알고리즘만 허용 (alg 바꿔치기 방지)
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+
+keyring = Keyring(
+    keys_dir = settings.jwt_keys_dir,
+    secret_key = settings.secret_key,
+    secret_algorithm = settings.algorithm,
+    active_kid = settings.jwt_active_kid,
+    activation_delay = settings.jwt_key_activation_delay,
+    accept_legacy = settings.jwt_accept_legacy_hs256
+)
+keyring.reload()
@@ -0,0 +1,187 @@
+'''
+할 일 목록 응답 캐시
+    - 직렬화가 끝난 응답(JSON bytes)을 저장 -> 캐시 적중 시 DB 조회와 Pydantic 검증/직렬화를 모두 건너뜀
+    - 사용자별 버전 카운터를 키에 포함, 할 일을 쓰면 버전을 올려서 이전 페이지들을 한번에 무효화
+      (이전 버전의 항목은 ttl/LRU 로 자연스럽게 사라짐)
+    - 같은 버전이면 같은 ETag -> If-None-Match 가 맞으면 캐시 조회 없이 304
+      ETag / 304 는 버전을 모든 워커가 공유할 때(redis)만 사용
+      (memory 는 다른 워커의 쓰기로 버전이 바뀌지 않으므로, 그 워커가 쓰기를 처리할 때까지 오래된 목록에 304 를 계속 보낼 수 있음)
+    - 캐시 저장과 ETag 는 primary(또는 방금 쓴 사용자의 sticky) 조회 결과만 -> 지연된 replica 의 이전 목록이 새 버전으로 저장되지 않음
+    - 백엔드
+        memory : 프로세스 내부 LRU (워커마다 따로 동작, 다른 워커의 쓰기는 ttl 이 지나야 반영)
+        redis  : 여러 워커가 공유 (app/core/redis_client.py)
+    - 백엔드 오류는 캐시 미스로 처리 (캐시 때문에 요청이 실패하지 않도록)
+'''
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis_client import client_from_url
+
+logger = logging.getLogger(__name__)
+
+TODO_LIST_CACHE_REQUESTS = registry.counter(
+    "todo_list_cache_requests_total", "할 일 목록 캐시 조회 결과", ["result"]
+)
+
+
+'''
+    버전 초기값은 현재 시각(ns) 사용
+    - 재시작/키 만료로 카운터가 사라져도 이전에 내려준 ETag 와 겹치지 않음
+'''
+def _initial_version() -> int :
+    return time.time_ns()
+
+
+class MemoryCacheBackend :
+    def __init__(self, maxsize : int, ttl : float) :
+        self._values = LRUTTLCache(maxsize, ttl)
+        # 버전도 같은 크기/ttl 로 제한 (버전이 사라지면 새 시각 기반 버전으로 시작 -> 이전 항목은 조회되지 않을 뿐)
+        self._versions = LRUTTLCache(maxsize, ttl)
+
+    async def get(self, key : str) -> bytes | None :
+        return self._values.get(key)
+
+    async def set(self, key : str, value : bytes, ttl : float) -> None :
+        self._values.set(key, value, ttl)
+
+    async def get_version(self, key : str) -> int :
+        version = self._versions.get(key)
+        if version is None :
+            version = _initial_version()
+            self._versions.set(key, version)
+        return version
+
+    async def bump_version(self, key : str) -> int :
+        version = max(self._versions.get(key, 0) + 1, _initial_version())
+        self._versions.set(key, version)
+        return version
+
+
+class RedisCacheBackend :
+    def __init__(self, client : Any) :
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url : str) -> "RedisCacheBackend" :
+        return cls(client_from_url(url))
+
+    async def get(self, key : str) -> bytes | None :
+        return await self._client.get(key)
+
+    async def set(self, key : str, value : bytes, ttl : float) -> None :
+        await self._client.set(key, value, ex=max(1, int(ttl)))
+
+    # 키가 없으면 초기값을 먼저 넣고(NX) 읽음 -> 여러 워커가 동시에 만들어도 하나의 값으로 수렴
+    async def get_version(self, key : str) -> int :
+        value = await self._client.get(key)
+        if value is None :
+            await self._client.set(key, _initial_version(), nx=True)
+            value = await self._client.get(key)
+        return int(value)
+
+    async def bump_version(self, key : str) -> int :
+        await self._client.set(key, _initial_version(), nx=True)
+        return int(await self._client.incr(key))
+
+    async def close(self) -> None :
+        await self._client.aclose()
+
+
+class TodoListCache :
+    def __init__(self, backend : MemoryCacheBackend | RedisCacheBackend | None, ttl : float) :
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool :
+        return self.backend is not None
+
+    # 버전을 모든 워커가 공유하는지 (ETag / 304 사용 가능 여부)
+    @property
+    def shared(self) -> bool :
+        return isinstance(self.backend, RedisCacheBackend)
+
+    @staticmethod
+    def _version_key(user_id : int) -> str :
+        return f"todos:version:{user_id}"
+
+    # 조회 조건(정렬, 커서, 필터...)을 짧은 해시로
+    @staticmethod
+    def params_digest(params : dict) -> str :
+        raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def etag(user_id : int, version : int, digest : str) -> str :
+        return f'"{user_id}-{version}-{digest}"'
+
+    '''
+        현재 버전 조회
+        - DB 조회보다 먼저 읽어야 함 (버전을 읽은 뒤에 시작한 조회만 그 버전으로 저장되도록)
+        - 백엔드 오류면 None -> 캐시를 사용하지 않음
+    '''
+    async def version(self, user_id : int) -> int | None :
+        if self.backend is None :
+            return None
+        try :
+            return await self.backend.get_version(self._version_key(user_id))
+        except Exception :
+            logger.warning("todo list cache version lookup failed", exc_info=True)
+            return None
+
+    # If-None-Match 가 현재 ETag 와 같은지 (쉼표로 여러 값, 약한 비교)
+    def not_modified(self, if_none_match : str | None, etag : str) -> bool :
+        if not if_none_match :
+            return False
+
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        matched = "*" in tags or etag in tags
+        if matched :
+            TODO_LIST_CACHE_REQUESTS.inc(result="not_modified")
+        return matched
+
+    async def get(self, user_id : int, version : int, digest : str) -> bytes | None :
+        try :
+            body = await self.backend.get(f"todos:list:{user_id}:{version}:{digest}")
+        except Exception :
+            logger.warning("todo list cache get failed", exc_info=True)
+            body = None
+
+        TODO_LIST_CACHE_REQUESTS.inc(result="hit" if body is not None else "miss")
+        return body
+
+    async def set(self, user_id : int, version : int, digest : str, body : bytes) -> None :
+        try :
+            await self.backend.set(f"todos:list:{user_id}:{version}:{digest}", body, self.ttl)
+        except Exception :
+            logger.warning("todo list cache set failed", exc_info=True)
+
+    # 할 일을 쓴 뒤(커밋 후) 호출
+    async def invalidate(self, user_id : int) -> None :
+        if self.backend is None :
+            return
+        try :
+            await self.backend.bump_version(self._version_key(user_id))
+        except Exception :
+            logger.warning("todo list cache invalidate failed", exc_info=True)
+
+    async def close(self) -> None :
+        if isinstance(self.backend, RedisCacheBackend) :
+            await self.backend.close()
+
+
+def _build_backend() -> MemoryCacheBackend | RedisCacheBackend | None :
+    if settings.todo_list_cache_backend == "memory" :
+        return MemoryCacheBackend(settings.todo_list_cache_size, settings.todo_list_cache_ttl)
+    if settings.todo_list_cache_backend == "redis" :
+        return RedisCacheBackend.from_url(settings.todo_list_cache_redis_url)
+    return None
+
+
+todo_list_cache = TodoListCache(_build_backend(), settings.todo_list_cache_ttl)
@@ -0,0 +1,163 @@
+'''
+Prometheus 텍스트 포맷(exposition format 0.0.4)으로 내보내는 최소한의 메트릭 구현
+    - Counter   : 누적 값
+    - Histogram : 버킷별 누적 개수 + 합계 + 개수
+    - Gauge     : 수집 시점에 콜백으로 값을 읽음 (커넥션 풀 상태 등)
+    - 이벤트 루프(단일 스레드)에서 갱신하므로 락은 두지 않음
+    - 워커 프로세스마다 따로 집계됨 (Prometheus가 워커별로 수집하거나 합산)
+'''
+import math
+from typing import Callable, Iterable, Sequence
+
+LabelValues = tuple[str, ...]
+
+# 요청 지연시간용 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _escape(value : str) -> str :
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names : Sequence[str], values : Sequence[str], extra : dict[str, str] | None = None) -> str :
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra :
+        pairs += [f'{name}="{_escape(value)}"' for name, value in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value : float) -> str :
+    if value == math.inf :
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric :
+    type_name = ""
+
+    def __init__(self, name : str, documentation : str, labelnames : Sequence[str] = ()) :
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels : dict[str, str]) -> LabelValues :
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> list[str] :
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def samples(self) -> Iterable[str] :
+        raise NotImplementedError
+
+
+class Counter(_Metric) :
+    type_name = "counter"
+
+    def __init__(self, name : str, documentation : str, labelnames : Sequence[str] = ()) :
+        super().__init__(name, documentation, labelnames)
+        self._values : dict[LabelValues, float] = {}
+
+    def inc(self, amount : float = 1, **labels : str) -> None :
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels : str) -> float :
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterable[str] :
+        for key, value in self._values.items() :
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric) :
+    type_name = "histogram"
+
+    def __init__(self, name : str, documentation : str, labelnames : Sequence[str] = (), buckets : Sequence[float] = DEFAULT_BUCKETS) :
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 라벨 조합 -> [버킷별 개수..., 합계, 개수]
+        self._values : dict[LabelValues, list[float]] = {}
+
+    def observe(self, value : float, **labels : str) -> None :
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None :
+            state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+
+        for index, bound in enumerate(self.buckets) :
+            if value <= bound :
+                state[index] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+    def samples(self) -> Iterable[str] :
+        for key, state in self._values.items() :
+            cumulative = 0
+            for bound, count in zip(self.buckets, state) :
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, {"le" : _format_value(bound)})
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(state[-2])}"
+            yield f"{self.name}_count{labels} {state[-1]}"
+
+
+class Gauge(_Metric) :
+    '''
+        collect 콜백은 [(라벨 dict, 값), ...] 을 반환
+    '''
+    type_name = "gauge"
+
+    def __init__(self, name : str, documentation : str, collect : Callable[[], Iterable[tuple[dict[str, str], float]]], labelnames : Sequence[str] = ()) :
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def samples(self) -> Iterable[str] :
+        for labels, value in self._collect() :
+            yield f"{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}"
+
+
+class CounterFunc(Gauge) :
+    '''
+        값은 다른 곳에서 누적하고, 수집 시점에 콜백으로 읽는 counter (해시 풀 거절 횟수 등)
+    '''
+    type_name = "counter"
+
+
+class Registry :
+    def __init__(self) :
+        self._metrics : dict[str, _Metric] = {}
+
+    def register(self, metric : _Metric) -> _Metric :
+        if metric.name in self._metrics :
+            raise ValueError(f"이미 등록된 메트릭입니다 : {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name : str, documentation : str, labelnames : Sequence[str] = ()) -> Counter :
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name : str, documentation : str, labelnames : Sequence[str] = (), buckets : Sequence[float] = DEFAULT_BUCKETS) -> Histogram :
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name : str, documentation : str, collect : Callable[[], Iterable[tuple[dict[str, str], float]]], labelnames : Sequence[str] = ()) -> Gauge :
+        return self.register(Gauge(name, documentation, collect, labelnames))
+
+    def counter_func(self, name : str, documentation : str, collect : Callable[[], Iterable[tuple[dict[str, str], float]]], labelnames : Sequence[str] = ()) -> CounterFunc :
+        return self.register(CounterFunc(name, documentation, collect, labelnames))
+
+    def render(self) -> str :
+        lines : list[str] = []
+        for metric in self._metrics.values() :
+            lines += metric.header()
+            lines += metric.samples()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,143 @@
+'''
+로그인 시도 rate limit (bcrypt 워커 풀 보호, credential stuffing 완화)
+    - IP 별, 이메일 별로 각각 window 초 동안 limit 회까지 허용
+    - DB 조회/비밀번호 검증 전에 확인 -> 거절된 요청은 bcrypt 비용이 들지 않음
+    - 백엔드
+        memory : 프로세스 내부 token bucket (워커마다 따로 동작 -> 실제 허용량은 limit x 워커 수)
+        redis  : 여러 워커가 공유하는 sliding window counter (app/core/redis_client.py)
+    - 백엔드 오류면 허용 (rate limit 때문에 로그인이 막히지 않도록)
+'''
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis_client import client_from_url
+from app import LoginRateLimited
+
+logger = logging.getLogger(__name__)
+
+LOGIN_RATE_LIMITED = registry.counter(
+    "login_rate_limited_total", "rate limit 으로 거절한 로그인 시도", ["scope"]
+)
+
+
+class MemoryRateLimitBackend :
+    '''
+        token bucket : limit 개까지 쌓이고 limit / window 개/초 속도로 다시 채워짐
+        - 버킷 수는 maxsize 로 제한 (가장 오래 사용하지 않은 버킷부터 제거 = 가득 찬 상태로 초기화)
+    '''
+    def __init__(self, maxsize : int = 100_000) :
+        self.maxsize = maxsize
+        self._buckets : OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    # 허용이면 0, 거절이면 다시 시도할 수 있을 때까지 남은 시간(초)
+    async def hit(self, key : str, limit : int, window : float) -> float :
+        now = time.monotonic()
+        rate = limit / window
+        tokens, updated_at = self._buckets.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - updated_at) * rate)
+
+        retry_after = 0.0
+        if tokens < 1 :
+            retry_after = (1 - tokens) / rate
+        else :
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize :
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def close(self) -> None :
+        self._buckets.clear()
+
+
+class RedisRateLimitBackend :
+    '''
+        sliding window counter : 현재/이전 고정 구간의 카운터를 경과 비율로 가중합
+        - 원자적인 INCR 만 사용 -> 여러 워커가 동시에 갱신해도 안전
+        - 거절된 시도도 카운트 (계속 시도하면 계속 막힘)
+    '''
+    def __init__(self, client : Any) :
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url : str) -> "RedisRateLimitBackend" :
+        return cls(client_from_url(url))
+
+    async def hit(self, key : str, limit : int, window : float) -> float :
+        now = time.time()
+        index = int(now // window)
+        elapsed = (now % window) / window
+
+        current_key = f"ratelimit:{key}:{index}"
+        current = int(await self._client.incr(current_key))
+        if current == 1 :
+            await self._client.expire(current_key, math.ceil(window * 2))
+        previous = int(await self._client.get(f"ratelimit:{key}:{index - 1}") or 0)
+
+        if previous * (1 - elapsed) + current <= limit :
+            return 0.0
+        if current > limit :
+            return window * (1 - elapsed)
+        # 이전 구간의 가중치가 충분히 줄어들 때까지
+        return window * (1 - (limit - current) / previous - elapsed)
+
+    async def close(self) -> None :
+        await self._client.aclose()
+
+
+class LoginRateLimiter :
+    def __init__(self, backend : MemoryRateLimitBackend | RedisRateLimitBackend | None, ip_limit : int, email_limit : int, window : float) :
+        self.backend = backend
+        self.ip_limit = ip_limit
+        self.email_limit = email_limit
+        self.window = window
+
+    '''
+        로그인 시도 1회 기록, 한도를 넘으면 LoginRateLimited(retry_after)
+        - IP 한도에 걸리면 이메일 카운트는 올리지 않음
+    '''
+    async def check(self, ip : str | None, email : str) -> None :
+        if self.backend is None :
+            return
+
+        checks = [("email", f"login:email:{email.strip().lower()}", self.email_limit)]
+        if ip :
+            checks.insert(0, ("ip", f"login:ip:{ip}", self.ip_limit))
+
+        for scope, key, limit in checks :
+            try :
+                retry_after = await self.backend.hit(key, limit, self.window)
+            except Exception :
+                logger.warning("login rate limit backend failed", exc_info=True)
+                return
+
+            if retry_after > 0 :
+                LOGIN_RATE_LIMITED.inc(scope=scope)
+                raise LoginRateLimited(max(1, math.ceil(retry_after)))
+
+    async def close(self) -> None :
+        if self.backend is not None :
+            await self.backend.close()
+
+
+def _build_backend() -> MemoryRateLimitBackend | RedisRateLimitBackend | None :
+    if settings.login_rate_limit_backend == "memory" :
+        return MemoryRateLimitBackend()
+    if settings.login_rate_limit_backend == "redis" :
+        return RedisRateLimitBackend.from_url(settings.login_rate_limit_redis_url)
+    return None
+
+
+login_rate_limiter = LoginRateLimiter(
+    _build_backend(),
+    ip_limit = settings.login_rate_limit_ip_attempts,
+    email_limit = settings.login_rate_limit_email_attempts,
+    window = settings.login_rate_limit_window
+)
@@ -0,0 +1,198 @@
+'''
+할 일 변경 실시간 전달 (Postgres LISTEN/NOTIFY -> WebSocket/SSE)
+    - 쓰기 : 할 일을 바꾼 트랜잭션 안에서 pg_notify('todo_changes_<user_id>', payload)
+      -> 커밋될 때만 전달되고 롤백되면 사라짐, 여러 워커/서버 어디에서 쓰든 모든 리스너가 받음
+    - 워커마다 LISTEN 전용 asyncpg 커넥션 1개 (커넥션 풀과 별도, 첫 구독이 생길 때 연결)
+      구독자가 있는 사용자 채널만 LISTEN, 마지막 구독자가 나가면 UNLISTEN
+    - 받은 이벤트는 그 사용자의 모든 구독(연결) 큐에 넣음
+      큐가 가득 찬(느린) 구독은 끊음 -> 다른 구독자와 리스너는 막히지 않고, 클라이언트는 다시 연결해서 목록을 새로 받음
+    - 리스너 커넥션이 끊기면 모든 구독을 끊음 (그 사이의 이벤트를 놓쳤을 수 있으므로)
+    - LISTEN 은 세션 단위 기능이므로 DB 앞에 transaction pooling(pgbouncer 등)이 있으면 리스너는 DB에 직접 연결해야 함
+    - payload : {"op" : "created" | "updated" | "deleted", "ids" : [...]}
+      NOTIFY payload 한도(8000 bytes)를 넘으면 ids 를 null 로 보냄 (많이 바뀌었으니 다시 조회)
+'''
+import asyncio
+import json
+import logging
+from typing import Any
+
+import asyncpg
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app import RealtimeUnavailable
+
+logger = logging.getLogger(__name__)
+
+REALTIME_EVENTS = registry.counter(
+    "realtime_events_total", "구독 연결로 전달한 할 일 변경 이벤트", ["result"]
+)
+
+_CHANNEL_PREFIX = "todo_changes_"
+_MAX_PAYLOAD_BYTES = 7900
+
+
+def channel_name(user_id : int) -> str :
+    return f"{_CHANNEL_PREFIX}{user_id}"
+
+
+def _payload(op : str, ids : list[int] | None) -> str :
+    payload = json.dumps({"op" : op, "ids" : ids}, separators=(",", ":"))
+    if len(payload) > _MAX_PAYLOAD_BYTES :
+        payload = json.dumps({"op" : op, "ids" : None}, separators=(",", ":"))
+    return payload
+
+
+'''
+    변경 알림 (커밋 전에 같은 세션에서 호출 -> 커밋될 때 전달)
+    - ids 가 None 이면 어떤 할 일인지 보내지 않음 (가져오기처럼 많이 바뀐 경우, 클라이언트가 다시 조회)
+'''
+async def publish_change(db : AsyncSession, user_id : int, op : str, ids : list[int] | None) -> None :
+    if not settings.realtime_enabled or ids == [] :
+        return
+    await db.execute(select(func.pg_notify(channel_name(user_id), _payload(op, ids))))
+
+
+class Subscription :
+    def __init__(self, user_id : int, queue_size : int) :
+        self.user_id = user_id
+        self.closed = False
+        self.reason : str | None = None
+        self._queue : asyncio.Queue[dict | None] = asyncio.Queue(maxsize=queue_size)
+
+    # 큐가 가득 찼으면 False
+    def push(self, event : dict) -> bool :
+        try :
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull :
+            return False
+
+    # 남은 이벤트를 버리고 종료 표시(None)를 넣어서 대기중인 get 을 깨움
+    def close(self, reason : str) -> None :
+        if self.closed :
+            return
+        self.closed = True
+        self.reason = reason
+        while not self._queue.empty() :
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    # 다음 이벤트, 닫혔으면 None, timeout 초 동안 없으면 TimeoutError
+    async def get(self, timeout : float) -> dict | None :
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class ChangeHub :
+    def __init__(self, dsn : str, queue_size : int, max_subscribers : int) :
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers : dict[int, set[Subscription]] = {}
+        self._conn : Any = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def subscriber_count(self) -> int :
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    '''
+        사용자 채널 구독 (연결이 끝나면 반드시 unsubscribe)
+        - 비활성화 / 구독 수 초과 / 리스너 연결 실패면 RealtimeUnavailable
+    '''
+    async def subscribe(self, user_id : int) -> Subscription :
+        if not settings.realtime_enabled :
+            raise RealtimeUnavailable("Realtime change stream is disabled.")
+        if self.subscriber_count >= self.max_subscribers :
+            raise RealtimeUnavailable("Too many realtime subscribers.")
+
+        async with self._lock :
+            try :
+                conn = await self._connection()
+                if user_id not in self._subscribers :
+                    await conn.add_listener(channel_name(user_id), self._on_notify)
+                    self._subscribers[user_id] = set()
+            except Exception as e :
+                logger.warning("realtime listener failed", exc_info=True)
+                raise RealtimeUnavailable() from e
+
+            subscription = Subscription(user_id, self.queue_size)
+            self._subscribers[user_id].add(subscription)
+            return subscription
+
+    '''
+        구독 해제 (여러 번 호출해도 됨)
+        - 구독 목록에서는 await 전에 바로 빼므로 도중에 취소되어도 구독이 남지 않음
+          (UNLISTEN 이 취소되면 채널만 남고 이벤트는 버려짐, 같은 사용자가 다시 구독하면 재사용)
+        - 호출하는 쪽은 취소되지 않도록 shield 해서 호출 (anyio.CancelScope(shield=True))
+    '''
+    async def unsubscribe(self, subscription : Subscription) -> None :
+        subscription.close("unsubscribed")
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions :
+            return
+        subscriptions.discard(subscription)
+        if subscriptions :
+            return
+        del self._subscribers[subscription.user_id]
+
+        async with self._lock :
+            # 락을 기다리는 동안 같은 사용자가 다시 구독했으면 리스너 유지
+            if subscription.user_id in self._subscribers :
+                return
+            if self._conn is not None and not self._conn.is_closed() :
+                try :
+                    await self._conn.remove_listener(channel_name(subscription.user_id), self._on_notify)
+                except Exception :
+                    logger.warning("realtime unlisten failed", exc_info=True)
+
+    # 모든 구독을 끊고 리스너 커넥션 종료 (앱 종료 시)
+    async def close(self) -> None :
+        async with self._lock :
+            self._close_all("shutdown")
+            conn, self._conn = self._conn, None
+            if conn is not None and not conn.is_closed() :
+                await conn.close()
+
+    async def _connection(self) -> Any :
+        if self._conn is None or self._conn.is_closed() :
+            self._conn = await asyncpg.connect(self.dsn)
+            self._conn.add_termination_listener(self._on_terminate)
+        return self._conn
+
+    # asyncpg 리스너 콜백 (이벤트 루프에서 동기로 실행 -> 큐에 넣기만 함)
+    def _on_notify(self, conn : Any, pid : int, channel : str, payload : str) -> None :
+        user_id = int(channel.removeprefix(_CHANNEL_PREFIX))
+        event = json.loads(payload)
+        for subscription in list(self._subscribers.get(user_id, ())) :
+            if subscription.closed :
+                continue
+            if subscription.push(event) :
+                REALTIME_EVENTS.inc(result="delivered")
+            else :
+                REALTIME_EVENTS.inc(result="dropped")
+                subscription.close("slow_consumer")
+
+    def _on_terminate(self, conn : Any) -> None :
+        if conn is not self._conn :
+            return
+        logger.warning("realtime listener connection lost", extra={"subscribers" : self.subscriber_count})
+        self._conn = None
+        self._close_all("listener_lost")
+
+    def _close_all(self, reason : str) -> None :
+        for subscriptions in self._subscribers.values() :
+            for subscription in subscriptions :
+                subscription.close(reason)
+        self._subscribers.clear()
+
+
+change_hub = ChangeHub(
+    dsn = settings.db_url.replace("postgresql+asyncpg://", "postgresql://", 1),
+    queue_size = settings.realtime_queue_size,
+    max_subscribers = settings.realtime_max_subscribers
+)
+
+registry.gauge("realtime_subscribers", "워커의 실시간 구독 연결 수", lambda : [({}, change_hub.subscriber_count)])
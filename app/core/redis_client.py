@@ -0,0 +1,63 @@
+'''
+redis 클라이언트 생성 (할 일 목록 캐시, 로그인 rate limit 등에서 공유)
+    - redis 패키지는 선택 의존성 (pip install "todo-server[redis]")
+    - local:// 주소면 프로세스 내부 대체 구현(LocalRedis) 사용 -> redis 서버 없이 redis 백엔드 경로를 실행해볼 때
+'''
+import time
+from typing import Any
+
+
+class LocalRedis :
+    '''
+        이 프로젝트에서 사용하는 명령(get/set/incr/expire)만 흉내낸 프로세스 내부 구현
+    '''
+    def __init__(self) :
+        self._data : dict[str, tuple[float | None, Any]] = {}
+
+    def _get(self, key : str) -> Any :
+        item = self._data.get(key)
+        if item is None :
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic() :
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key : str) -> Any :
+        value = self._get(key)
+        return str(value).encode() if isinstance(value, int) else value
+
+    async def set(self, key : str, value : Any, ex : float | None = None, nx : bool = False) -> bool | None :
+        if nx and self._get(key) is not None :
+            return None
+        self._data[key] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    # 기존 만료시간은 유지
+    async def incr(self, key : str) -> int :
+        value = int(self._get(key) or 0) + 1
+        expires_at = self._data[key][0] if key in self._data else None
+        self._data[key] = (expires_at, value)
+        return value
+
+    async def expire(self, key : str, seconds : float) -> bool :
+        value = self._get(key)
+        if value is None :
+            return False
+        self._data[key] = (time.monotonic() + seconds, value)
+        return True
+
+    async def aclose(self) -> None :
+        self._data.clear()
+
+
+def client_from_url(url : str) -> Any :
+    if url.startswith("local://") :
+        return LocalRedis()
+
+    try :
+        import redis.asyncio as redis
+    except ImportError as e :
+        raise RuntimeError(f"redis 백엔드를 사용하려면 redis 패키지가 필요합니다 : {url}") from e
+    return redis.Redis.from_url(url)
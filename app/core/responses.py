@@ -0,0 +1,29 @@
+'''
+빠른 JSON 응답 경로
+    - 기본 경로 : 라우트가 ORM 객체/모델을 반환 -> FastAPI가 response_model로 검증 -> dict로 변환 -> json.dumps
+    - 빠른 경로 : TypeAdapter 로 한번만 검증(from_attributes)하고 pydantic-core 가 바로 JSON bytes 로 직렬화
+      (중간 dict 생성과 파이썬 json 인코더를 건너뜀)
+    - 스키마 타입별 TypeAdapter 는 한번만 만들어서 재사용 (생성 비용이 큼)
+    - FAST_JSON_RESPONSES=true 일 때 라우트에서 사용 (기본값 false)
+'''
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema : Any) -> TypeAdapter :
+    return TypeAdapter(schema)
+
+
+# ORM 객체(또는 dict/이미 검증된 모델)를 schema 로 검증해서 JSON bytes 로
+# 이미 schema 인스턴스면 다시 검증하지 않음 (pydantic 기본값 revalidate_instances='never')
+def dump_json(schema : Any, obj : Any) -> bytes :
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+
+
+def fast_json_response(schema : Any, obj : Any, status_code : int = status.HTTP_200_OK, headers : dict[str, str] | None = None) -> Response :
+    return Response(content=dump_json(schema, obj), status_code=status_code, media_type="application/json", headers=headers)
@@ -0,0 +1,34 @@
+'''
+access token 폐기 목록 (DB 조회 없이 토큰만 믿는 인증 경로에서 확인)
+    - jti 단위 : 특정 토큰 하나 폐기
+    - 사용자 단위 : 그 시각 이전에 발급(iat)된 해당 사용자의 토큰 모두 폐기 (비활성화, 리프레시 토큰 재사용 감지)
+      iat 와 같은 초 단위로 저장하고 iat < 폐기 시각 인 토큰만 거절
+      -> 폐기 직후 같은 초에 다시 발급한 토큰은 통과 (그 초 안에서 폐기 전에 발급된 토큰도 통과)
+    - access token 만료시간이 지나면 항목도 필요 없으므로 같은 ttl 로 자동 제거
+    - 워커 프로세스마다 따로 존재 -> 다른 워커에는 반영되지 않으므로 즉시 차단이 필요한 경로는 get_current_user(DB 조회) 사용
+'''
+import time
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+
+
+class RevocationList :
+    def __init__(self, maxsize : int, ttl : float) :
+        self._tokens = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._users = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+
+    def revoke_token(self, jti : str, exp : float) -> None :
+        self._tokens.set(jti, True, ttl=exp - time.time())
+
+    def revoke_user(self, user_id : int) -> None :
+        self._users.set(user_id, int(time.time()))
+
+    def is_revoked(self, user_id : int | None, jti : str | None, iat : int | None) -> bool :
+        if jti is not None and self._tokens.get(jti) :
+            return True
+        revoked_at = self._users.get(user_id) if user_id is not None else None
+        return revoked_at is not None and (iat is None or iat < revoked_at)
+
+
+revocation_list = RevocationList(maxsize=settings.revocation_list_size, ttl=settings.access_expire_time)
@@ -0,0 +1,106 @@
+'''
+앱 내부 asyncio 유지보수 스케줄러
+    - FastAPI lifespan에서 start/stop
+    - 작업(job)마다 주기적으로 실행, 작업 함수는 처리한 행 수(int)를 반환
+    - 작업별 실행 횟수 / 실패 횟수 / 소요시간 / 처리 행 수를 집계
+    - 한 작업이 실패해도 다른 작업과 다음 주기 실행에는 영향 없음
+    - maintenance=False 로 등록한 작업(워커 상태 동기화 : JWT 키 다시 읽기 등)은 MAINTENANCE_ENABLED 와 관계없이 실행
+'''
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Awaitable, Callable
+
+
+@dataclass
+class JobMetrics :
+    runs : int = 0
+    failures : int = 0
+    rows_total : int = 0
+    last_rows : int = 0
+    last_duration_seconds : float = 0.0
+    total_duration_seconds : float = 0.0
+    last_finished_at : float | None = None # epoch seconds
+    last_error : str | None = None
+
+
+@dataclass
+class Job :
+    name : str
+    interval : float
+    func : Callable[[], Awaitable[int]]
+    maintenance : bool = True
+    metrics : JobMetrics = field(default_factory=JobMetrics)
+
+
+class MaintenanceScheduler :
+    def __init__(self) :
+        self._jobs : dict[str, Job] = {}
+        self._tasks : list[asyncio.Task] = []
+
+    def add_job(self, name : str, interval : float, func : Callable[[], Awaitable[int]], maintenance : bool = True) -> None :
+        if name in self._jobs :
+            raise ValueError(f"이미 등록된 작업입니다 : {name}")
+        self._jobs[name] = Job(name=name, interval=interval, func=func, maintenance=maintenance)
+
+    @property
+    def running(self) -> bool :
+        return bool(self._tasks)
+
+    # maintenance=False 면 유지보수 작업은 빼고 워커 상태 동기화 작업만 실행
+    def start(self, maintenance : bool = True) -> None :
+        if self._tasks :
+            return
+        self._tasks = [
+            asyncio.create_task(self._run_forever(job), name=f"maintenance:{job.name}")
+            for job in self._jobs.values()
+            if maintenance or not job.maintenance
+        ]
+
+    async def stop(self) -> None :
+        for task in self._tasks :
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # 즉시 한번 실행 (관리용/점검용)
+    async def run_once(self, name : str) -> int :
+        return await self._run(self._jobs[name])
+
+    def snapshot(self) -> dict[str, dict] :
+        return {name : asdict(job.metrics) for name, job in self._jobs.items()}
+
+    async def _run_forever(self, job : Job) -> None :
+        # 여러 워커가 동시에 시작해도 같은 시각에 몰리지 않도록 첫 실행을 분산
+        await asyncio.sleep(random.uniform(0, job.interval))
+        while True :
+            try :
+                await self._run(job)
+            except Exception :
+                pass # 실패 내용은 metrics에 기록됨
+            await asyncio.sleep(job.interval)
+
+    async def _run(self, job : Job) -> int :
+        metrics = job.metrics
+        start = time.perf_counter()
+        try :
+            rows = await job.func()
+        except Exception as e :
+            metrics.failures += 1
+            metrics.last_error = repr(e)
+            raise
+        else :
+            metrics.last_rows = rows
+            metrics.rows_total += rows
+            metrics.last_error = None
+            return rows
+        finally :
+            duration = time.perf_counter() - start
+            metrics.runs += 1
+            metrics.last_duration_seconds = duration
+            metrics.total_duration_seconds += duration
+            metrics.last_finished_at = time.time()
+
+
+scheduler = MaintenanceScheduler()
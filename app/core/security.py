@@ -1,49 +1,100 @@
 import bcrypt
 import jwt
 import time
+import hashlib
+import uuid
 from .config import settings
+from .hash_pool import HashPool
+from .cache import LRUTTLCache
+from .keyring import keyring
 from datetime import datetime, timedelta
 '''
     bcrypt는 문자열이 아닌 바이트 데이터를 받아 연산합니다
         => 암호화 알고리즘은 '문자(text)'라는 추상적인 개념을 직접 다루지 못하고, 
             '바이트(bytes)'라는 구체적인 데이터 단위를 다루기 때문
 '''
-_algorithm = settings.algorithm
-_secret_key = settings.secret_key
 _access_expire_time = settings.access_expire_time
 _refresh_expire_time = settings.refresh_expire_time
 
+# bcrypt 작업을 이벤트 루프 밖에서 실행하기 위한 워커 풀
+hash_pool = HashPool(
+    kind=settings.hash_pool_kind,
+    max_workers=settings.hash_pool_workers,
+    max_queue=settings.hash_pool_max_queue
+)
+
+# 검증이 끝난 access token 캐시 : sha256(token) -> (payload, user)
+# 워커 프로세스마다 따로 존재하므로 다른 워커의 무효화는 최대 TOKEN_CACHE_TTL_SECONDS 만큼 늦게 반영됨
+verified_token_cache = LRUTTLCache(maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl)
+
 # 비밀번호 해싱 (bcrypt)
 # bcrypt.haspw( bytes, bytes )
-def pwd_hashing(pwd : str) -> bytes :
+def pwd_hashing(pwd : str, rounds : int | None = None) -> bytes :
     password = pwd.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
     hashed_pwd = bcrypt.hashpw(password, salt)
     return hashed_pwd
 
+# 저장된 해시의 비용이 설정값과 다르면 True ($2b$<cost>$<salt+hash>)
+def needs_rehash(hashed_pwd : bytes) -> bool :
+    try :
+        rounds = int(hashed_pwd.split(b"$")[2])
+    except (IndexError, ValueError) :
+        return True
+    return rounds != settings.bcrypt_rounds
+
 # 비밀번호 검증
 def verify_password(pwd : str, hashed_pwd : bytes) -> bool :
     password = pwd.encode('utf-8')
     result = bcrypt.checkpw(password, hashed_pwd) 
     return result
+
+# 비밀번호 해싱 (비동기) - 워커 풀에서 실행되므로 이벤트 루프를 막지 않음
+# 풀이 포화 상태이면 HashPoolSaturated 발생
+async def pwd_hashing_async(pwd : str) -> bytes :
+    return await hash_pool.run(pwd_hashing, pwd)
+
+# 비밀번호 검증 (비동기)
+async def verify_password_async(pwd : str, hashed_pwd : bytes) -> bool :
+    return await hash_pool.run(verify_password, pwd, hashed_pwd)
+
+# 가입되지 않은 이메일로 로그인할 때 검증할 더미 해시 (처음 사용할 때 한번만 생성, 앱 시작 시 미리 생성)
+_dummy_hash : bytes | None = None
+
+async def dummy_password_hash() -> bytes :
+    global _dummy_hash
+    if _dummy_hash is None :
+        _dummy_hash = await pwd_hashing_async(uuid.uuid4().hex)
+    return _dummy_hash
+
+# 가입된 사용자와 같은 비용으로 검증만 하고 항상 실패 -> 응답 시간으로 가입 여부가 드러나지 않도록
+async def verify_dummy_password_async(pwd : str) -> bool :
+    await verify_password_async(pwd, await dummy_password_hash())
+    return False
     
 # ACCESS_JWT 토큰 생성 
-def create_access_token(email : str, username : str) -> dict: 
+# sub(사용자 id), is_active(발급 시점 값), iat, jti 를 담아서 DB 조회 없이 인증 가능 (app/api/deps.py get_token_claims)
+def create_access_token(email : str, username : str, user_id : int, is_active : bool = True) -> dict: 
     
     expiration_time = datetime.now() + timedelta(seconds=_access_expire_time)
     expiration_timestamp = int(time.mktime(expiration_time.timetuple()))
     payload = {
+        "sub" : str(user_id), # JWT 규격상 문자열
         "email" : email,
         "username" : username,
+        "is_active" : is_active,
+        "iat" : int(time.time()),
+        "jti" : uuid.uuid4().hex, # 토큰 단위 폐기용
         "exp" : expiration_timestamp
     }
     '''
         HS256 사용 이유
         1. 널리 사용되고 있음
         2. 단일 서버에서 JWT를 발급하고 검증하는 경우, HS256과 같은 대칭 키 알고리즘을 사용해도 충분
+        -> 다른 서버에서도 검증해야 하면 JWT_KEYS_DIR 로 비대칭 키(RS256/EdDSA) 사용 (app/core/keyring.py)
     '''
     
-    token = jwt.encode(payload, _secret_key, _algorithm)
+    token = keyring.encode(payload)
     
     token_info = {
         "access_token": token,
@@ -55,7 +106,7 @@ def create_access_token(email : str, username : str) -> dict:
 
 # ACCESS_JWT 디코딩 함수 구현
 def decode_access_token(token : str) -> dict : 
-    decode_payload = jwt.decode(token, _secret_key, algorithms=_algorithm)
+    decode_payload = keyring.decode(token)
     
     return decode_payload
 
@@ -67,15 +118,24 @@ def create_refresh_token(email:str, username:str) -> dict :
     payload = {
         "email" : email,
         "username" : username,
-        "exp" : expiration_timestamp
+        "exp" : expiration_timestamp,
+        "jti" : uuid.uuid4().hex # 같은 초에 발급해도 토큰이 달라지도록 (DB에는 해시가 unique)
     }
-    token = jwt.encode(payload, _secret_key, _algorithm)
+    token = keyring.encode(payload)
     token_info = {
         "refresh_token": token,
         "expire_time": _refresh_expire_time
     }
     return token_info
 
+# REFRESH_TOKEN 디코딩 (서명/만료 검증)
+def decode_refresh_token(token : str) -> dict :
+    return keyring.decode(token)
+
+# 토큰 원문 대신 DB에 저장할 해시값 (sha256 hex)
+def hash_token(token : str) -> str :
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 if __name__ == '__main__' : 
     test_pwd = "super password"
     test_hashed_pwd = pwd_hashing(test_pwd)
@@ -88,7 +148,7 @@ if __name__ == '__main__' :
     print(f"timetuple : {(datetime.now() + timedelta(minutes=1)).timetuple()}") # time.struct_time(tm_year=2025, tm_mon=7, tm_mday=19, tm_hour=10, tm_min=38, tm_sec=38, tm_wday=5, tm_yday=200, tm_isdst=-1)
     print(f"time.mktime : {int(time.mktime((datetime.now() + timedelta(minutes=1)).timetuple()))}") # datetime : 1752889118
     
-    test_token = create_access_token("test", "testtest")
+    test_token = create_access_token("test", "testtest", 1)
     print(f"test_access_token : {test_token} , {test_token.__class__}")
     dec_test_token = decode_access_token(test_token.get("access_token"))
     print(f"test_decode_access_token : {dec_test_token} , {dec_test_token.__class__}")
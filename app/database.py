@@ -4,12 +4,41 @@
   주입)으로 데이터베이스 세션을 빌려 쓰고 반납할 수 있도록 해주는 공장(Factory)   
   같은 역할을 합니다.
 '''
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine, AsyncConnection
 from sqlalchemy.orm import declarative_base
+from sqlalchemy import text
 from app.core.config import settings
+from app.core.cache import LRUTTLCache
+from app.core.instrumentation import TimedQueuePool, instrument_engine
 from typing import AsyncGenerator
+import asyncio
+import time
 
-async_engine = create_async_engine(settings.db_url)
+'''
+    커넥션 풀 / 드라이버 옵션
+    - pool_pre_ping  : 풀에서 꺼낼 때 끊어진 커넥션인지 확인
+    - pool_recycle   : 오래된 커넥션 재생성 (LB/방화벽 idle timeout 대비)
+    - statement_timeout : 서버측 쿼리 실행 시간 제한 (ms)
+    - prepared_statement_cache_size : asyncpg prepared statement 캐시 크기 (커넥션 단위)
+'''
+def create_engine_from_settings(url : str) -> AsyncEngine :
+    connect_args = {"prepared_statement_cache_size" : settings.db_prepared_statement_cache_size}
+    if settings.db_statement_timeout_ms > 0 :
+        connect_args["server_settings"] = {"statement_timeout" : str(settings.db_statement_timeout_ms)}
+    
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool, # 커넥션 대기시간 측정 (app/core/instrumentation.py)
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args=connect_args
+    )
+
+async_engine = create_engine_from_settings(settings.db_url)
+instrument_engine(async_engine, "primary")
 
 AsyncSesionLocal = async_sessionmaker(
     bind = async_engine,
@@ -17,12 +46,142 @@ AsyncSesionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+'''
+    읽기 전용 복제본(replica) 라우팅
+    - SELECT 만 하는 의존성(get_read_db)은 replica로 보내서 primary의 부하를 줄임
+    - replica 지연(lag)이 DB_REPLICA_MAX_LAG_SECONDS 를 넘으면 해당 replica는 제외
+    - 같은 사용자가 최근(DB_REPLICA_STICKY_SECONDS 이내)에 쓰기를 했다면 자기 변경사항을 볼 수 있도록 primary 사용
+    - 사용 가능한 replica가 없으면 primary로 대체
+'''
+# replica 지연 시간(초) : WAL을 모두 재생했다면 0, 아니면 마지막 재생 트랜잭션 이후 경과 시간
+_REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class ReplicaRouter :
+    def __init__(
+        self,
+        primary : async_sessionmaker,
+        replica_engines : list[AsyncEngine],
+        max_lag : float,
+        lag_check_interval : float,
+        sticky_seconds : float
+    ) :
+        self.primary = primary
+        self.replica_engines = replica_engines
+        self.replicas = [
+            async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in replica_engines
+        ]
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self._lags = [0.0] * len(replica_engines)
+        self._checked_at = [0.0] * len(replica_engines)
+        self._checking = [False] * len(replica_engines)
+        self._next = 0
+        # 최근에 쓰기를 한 사용자 (워커 프로세스 단위)
+        self._recent_writes = LRUTTLCache(maxsize=100_000, ttl=sticky_seconds)
+
+    def mark_write(self, key : str) -> None :
+        self._recent_writes.set(key, True)
+
+    async def session_factory(self, key : str | None = None) -> async_sessionmaker :
+        if not self.replicas or (key is not None and self._recent_writes.get(key)) :
+            return self.primary
+
+        # round-robin으로 지연이 허용 범위인 replica 선택
+        for _ in range(len(self.replicas)) :
+            index = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+            if await self._lag(index) <= self.max_lag :
+                return self.replicas[index]
+
+        return self.primary
+
+    # 측정 주기가 지났을 때만 실제로 조회, 동시에 여러 요청이 측정하지 않도록 _checking 플래그 사용
+    async def _lag(self, index : int) -> float :
+        now = time.monotonic()
+        if self._checking[index] or now - self._checked_at[index] < self.lag_check_interval :
+            return self._lags[index]
+
+        self._checking[index] = True
+        try :
+            async with self.replica_engines[index].connect() as conn :
+                self._lags[index] = float((await conn.execute(_REPLICA_LAG_QUERY)).scalar() or 0)
+        except Exception :
+            # 연결 실패 시 다음 측정 때까지 사용하지 않음
+            self._lags[index] = float("inf")
+        finally :
+            self._checked_at[index] = time.monotonic()
+            self._checking[index] = False
+
+        return self._lags[index]
+
+replica_engines = [create_engine_from_settings(url) for url in settings.replica_db_urls]
+for index, engine in enumerate(replica_engines) :
+    instrument_engine(engine, f"replica{index}")
+
+replica_router = ReplicaRouter(
+    primary=AsyncSesionLocal,
+    replica_engines=replica_engines,
+    max_lag=settings.db_replica_max_lag_seconds,
+    lag_check_interval=settings.db_replica_lag_check_seconds,
+    sticky_seconds=settings.db_replica_sticky_seconds
+)
+
 Base = declarative_base()
 
+'''
+    요청마다 세션을 빌려주는 의존성 함수
+    - AsyncSession은 첫 쿼리를 실행할 때 풀에서 커넥션을 꺼내므로(lazy),
+      DB를 사용하지 않고 끝나는 요청(토큰 캐시 적중 등)은 커넥션을 점유하지 않음
+'''
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSesionLocal() as session :
         yield session
 
+'''
+    진행중인 트랜잭션을 끝내고 커넥션을 풀에 반납
+    - bcrypt 해싱처럼 DB와 무관한 긴 작업 전에 호출해서 커넥션을 붙잡고 있지 않도록 함
+    - expire_on_commit=False 이므로 이미 읽어온 ORM 객체는 그대로 사용 가능
+    - 이후 쿼리를 실행하면 새 트랜잭션으로 다시 커넥션을 꺼냄
+'''
+async def release_connection(session : AsyncSession) -> None :
+    if session.in_transaction() :
+        await session.commit()
+
+'''
+    커넥션 풀 예열 (앱 시작 시)
+    - size 개의 커넥션을 동시에 열어서 풀에 채워둠 (첫 요청들이 연결 수립(TCP/TLS/인증)을 기다리지 않도록)
+    - 열린 커넥션마다 statements 를 한번씩 실행
+      -> SQLAlchemy 컴파일 캐시(엔진 단위)와 asyncpg prepared statement 캐시(커넥션 단위)가 미리 채워짐
+      -> 결과가 없도록 존재하지 않는 값으로 조회하는 문장을 넘김
+    - 예열한 커넥션 수 반환
+'''
+async def warm_pool(engine : AsyncEngine, statements : list, size : int) -> int :
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    opened = [conn for conn in connections if isinstance(conn, AsyncConnection)]
+    try :
+        for conn in opened :
+            for statement in statements :
+                await conn.execute(statement)
+            await conn.rollback()
+    finally :
+        # close 하면 커넥션은 끊기지 않고 풀로 돌아감
+        await asyncio.gather(*(conn.close() for conn in opened), return_exceptions=True)
+
+    errors = [conn for conn in connections if isinstance(conn, BaseException)]
+    if errors and not opened :
+        raise errors[0]
+    return len(opened)
+
+# 모든 엔진의 커넥션 정리 (앱 종료 시, 처리중인 요청이 모두 끝난 뒤)
+async def dispose_engines() -> None :
+    await asyncio.gather(*(engine.dispose() for engine in [async_engine, *replica_engines]))
+
 if __name__ == "__main__" :
     print("데이터베이스 연결 테스트 시작...")
     print(f"데이터베이스 URL : {settings.db_url}")
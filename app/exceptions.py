@@ -13,3 +13,64 @@ class UserDoesNotExist(Exception):
 class PasswordDoesNotMatch(Exception):
     def __init__(self, detail : str = "Your email or password does not match.") :
         super().__init__(detail)
+
+
+"""bcrypt 해싱 워커 풀이 포화 상태일 때 발생하는 예외"""
+class HashPoolSaturated(Exception):
+    def __init__(self, detail : str = "Password hashing pool is saturated.") :
+        super().__init__(detail)
+
+"""할 일이 존재하지 않거나 다른 사용자의 할 일일 때 발생하는 예외"""
+class TodoDoesNotExist(Exception):
+    def __init__(self, todo_id : int) :
+        self.todo_id = todo_id
+        super().__init__(f"Todo '{todo_id}' does not exist.")
+
+"""페이지네이션 커서가 올바르지 않을 때 발생하는 예외"""
+class InvalidCursorError(Exception):
+    def __init__(self, detail : str = "Invalid pagination cursor.") :
+        super().__init__(detail)
+
+"""리프레시 토큰이 없거나 만료/무효일 때 발생하는 예외"""
+class InvalidRefreshToken(Exception):
+    def __init__(self, detail : str = "Invalid refresh token.") :
+        super().__init__(detail)
+
+"""이미 사용(회전)된 리프레시 토큰이 다시 사용되었을 때 발생하는 예외"""
+class RefreshTokenReused(Exception):
+    def __init__(self, user_id : int) :
+        self.user_id = user_id
+        super().__init__(f"Refresh token reuse detected for user '{user_id}'.")
+
+"""로그인 시도가 rate limit 을 넘었을 때 발생하는 예외"""
+class LoginRateLimited(Exception):
+    def __init__(self, retry_after : int) :
+        self.retry_after = retry_after
+        super().__init__(f"Too many login attempts. Retry after {retry_after} seconds.")
+
+"""실시간 변경 구독을 받을 수 없을 때(비활성화, 구독 수 초과, 리스너 연결 실패) 발생하는 예외"""
+class RealtimeUnavailable(Exception):
+    def __init__(self, detail : str = "Realtime change stream is unavailable.") :
+        super().__init__(detail)
+
+"""가져오기 파일의 한 줄이 형식에 맞지 않거나 검증에 실패했을 때 발생하는 예외"""
+class InvalidImportRow(Exception):
+    def __init__(self, line : int, detail : str) :
+        self.line = line
+        self.detail = detail
+        super().__init__(f"Invalid import row at line {line}: {detail}")
+
+"""가져오기 파일이 허용된 행 수 / 줄 길이를 넘었을 때 발생하는 예외"""
+class ImportTooLarge(Exception):
+    def __init__(self, detail : str = "Import is too large.") :
+        super().__init__(detail)
+
+"""가져오기 본문이 TODO_IMPORT_READ_TIMEOUT_SECONDS 동안 들어오지 않았을 때 발생하는 예외"""
+class ImportReadTimeout(Exception):
+    def __init__(self, detail : str = "Import body was not received in time.") :
+        super().__init__(detail)
+
+"""변경분 동기화 커서가 삭제 기록 보관 기간보다 오래되었을 때 발생하는 예외 (전체 다시 동기화 필요)"""
+class ChangeCursorExpired(Exception):
+    def __init__(self, detail : str = "Change cursor is older than the tombstone retention window.") :
+        super().__init__(detail)
@@ -1,20 +1,137 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.api import auth
-import sys
+from app.core.scheduler import scheduler
+from app.core.security import hash_pool, dummy_password_hash
+from app.core.list_cache import todo_list_cache
+from app.core.rate_limit import login_rate_limiter
+from app.core.email_filter import registered_emails
+from app.core.keyring import keyring
+from app.core.realtime import change_hub
+from app.core.instrumentation import MetricsMiddleware, instrument_hash_pool, instrument_scheduler
+from app.core.log import setup_logging, shutdown_logging, RequestLoggingMiddleware
+from app.database import async_engine, replica_engines, warm_pool, dispose_engines
+from app.models.user import Users
+from app.models.todo import Todos
+from app.services.todo_service import Todo_service
+from app.services.maintenance_service import Maintenance_service
+from app.api import auth, todo, realtime, metrics, jwks
+from sqlalchemy import select
+import asyncio
+import logging
 
-app = FastAPI()
+setup_logging(settings.log_level)
+logger = logging.getLogger(__name__)
+
+# 유지보수 작업 등록
+maintenance_service = Maintenance_service()
+scheduler.add_job(
+    "purge_expired_refresh_tokens",
+    settings.refresh_token_purge_interval,
+    maintenance_service.purge_expired_refresh_tokens
+)
+scheduler.add_job(
+    "purge_todo_tombstones",
+    settings.todo_tombstone_purge_interval,
+    maintenance_service.purge_todo_tombstones
+)
+scheduler.add_job(
+    "reconcile_todo_stats",
+    settings.todo_stats_reconcile_interval,
+    maintenance_service.reconcile_todo_stats
+)
+# 워커마다 가진 filter 를 따라잡는 작업이므로 MAINTENANCE_ENABLED 와 관계없이 실행
+if settings.email_filter_enabled :
+    scheduler.add_job(
+        "refresh_email_filter",
+        settings.email_filter_refresh_interval,
+        registered_emails.refresh,
+        maintenance = False
+    )
+# 새 kid 로 서명된 토큰을 검증하려면 워커마다 키를 다시 읽어야 하므로 MAINTENANCE_ENABLED 와 관계없이 실행
+if keyring.asymmetric :
+    scheduler.add_job(
+        "reload_jwt_keys",
+        settings.jwt_keys_reload_interval,
+        keyring.refresh,
+        maintenance = False
+    )
+
+# bcrypt 워커 풀 / 유지보수 작업 메트릭을 /metrics 에 노출
+instrument_hash_pool(hash_pool)
+instrument_scheduler(scheduler)
+
+'''
+    커넥션 풀 예열 때 실행할 자주 쓰는 쿼리 (서비스와 같은 문장 구조, 결과는 없음)
+    - 로그인 / 토큰 검증의 이메일 조회, 할 일 단건 조회, 목록 조회(생성순 / 기한순)
+'''
+def _hot_queries() -> list :
+    todo_service = Todo_service()
+    return [
+        select(Users).filter(Users.email == ""),
+        select(Todos).filter(Todos.id == 0, Todos.user_id == 0),
+        todo_service.build_list_query(user_id=0),
+        todo_service.build_list_query(user_id=0, sort="due_date"),
+    ]
+
+async def _warm_up_database() -> None :
+    statements = _hot_queries()
+    engines = {"primary" : async_engine, **{f"replica{index}" : engine for index, engine in enumerate(replica_engines)}}
+    results = await asyncio.gather(
+        *(warm_pool(engine, statements, settings.db_pool_size) for engine in engines.values()),
+        return_exceptions=True
+    )
+    for name, result in zip(engines, results) :
+        if isinstance(result, BaseException) :
+            logger.warning("db pool warm-up failed", extra={"engine" : name}, exc_info=result)
+        else :
+            logger.info("db pool warmed", extra={"engine" : name, "connections" : result})
+
+'''
+    앱 시작/종료 시 실행 (startup / shutdown)
+    - 시작 : 요청을 받기 전에 커넥션 풀 / 더미 해시 / 이메일 filter 를 준비 (배포 직후 첫 요청들의 지연 방지)
+    - 종료 : uvicorn 이 처리중인 요청을 모두 끝낸 뒤(최대 GRACEFUL_SHUTDOWN_SECONDS) 실행됨
+      (SSE 스트림은 스스로 끝나지 않으므로 열려 있으면 타임아웃에 취소됨, 구독 해제는 shield 되어 끝까지 실행)
+      실시간 구독 -> 스케줄러 -> 캐시/rate limit 연결 -> DB 커넥션 -> 해싱 풀 -> 로그 순서로 정리
+'''
+@asynccontextmanager
+async def lifespan(app : FastAPI) :
+    # 실패해도 시작은 계속 (요청이 들어올 때 커넥션을 엶)
+    if settings.db_warm_pool :
+        await _warm_up_database()
+    
+    # 가입되지 않은 이메일 로그인에 사용할 더미 해시를 미리 생성 (첫 요청이 느려지지 않도록)
+    await dummy_password_hash()
+    
+    # 실패하면 filter 없이 동작하다가 refresh_email_filter 작업에서 다시 생성
+    if settings.email_filter_enabled :
+        try :
+            await registered_emails.rebuild()
+        except Exception :
+            logger.warning("email filter rebuild failed", exc_info=True)
+    
+    # MAINTENANCE_ENABLED=false 여도 워커 상태 동기화 작업(JWT 키 다시 읽기 등)은 실행
+    scheduler.start(maintenance = settings.maintenance_enabled)
+    
+    yield
+    
+    await change_hub.close()
+    await scheduler.stop()
+    await todo_list_cache.close()
+    await login_rate_limiter.close()
+    await dispose_engines()
+    hash_pool.shutdown(wait=False)
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth.router)
+app.include_router(realtime.router) # /todos/events, /todos/ws 가 /todos/{todo_id} 에 먼저 매칭되지 않도록 todo.router 보다 먼저
+app.include_router(todo.router)
+app.include_router(metrics.router)
+app.include_router(jwks.router)
 
-# --- 디버깅 코드 추가 ---
-print("="*50, file=sys.stderr)
-print(f"CORS Origins Loaded in main.py: {settings.cors_origins}", file=sys.stderr)
-print(f"Type of CORS Origins: {type(settings.cors_origins)}", file=sys.stderr)
-print("="*50, file=sys.stderr)
-# -------------------------
-   
 app.add_middleware(
     CORSMiddleware,
     allow_origins = settings.cors_origins, # origins 리스트에 있는 출처에서의 요청을 허용한다
@@ -23,6 +140,15 @@ app.add_middleware(
     allow_headers=["*"],    # 모든 요청 헤더를 허용
 )
 
+# 나중에 추가한 미들웨어가 바깥쪽에서 실행됨
+# -> 메트릭은 CORS 포함 전체 시간을, request id는 그 안의 모든 로그에 적용
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_routes=settings.log_sample_routes,
+    sample_rate=settings.log_sample_rate
+)
+
 @app.get("/")
 def home() :
     return {"home" : "home!!!"}
@@ -0,0 +1,93 @@
+'''
+간단한 버전 기반 마이그레이션 실행기
+    - versions/ 아래의 모듈을 revision 순서대로 실행하고, 적용 이력을 schema_migrations 테이블에 기록
+    - 각 마이그레이션 모듈은 다음을 정의
+        revision      : "0001" 처럼 정렬 가능한 문자열
+        description   : 설명
+        transactional : False 이면 AUTOCOMMIT 으로 실행 (CREATE INDEX CONCURRENTLY 등)
+        async def upgrade(conn : AsyncConnection) -> None
+    - 여러 프로세스가 동시에 실행해도 한번만 적용되도록 advisory lock 사용
+
+    실행 : python -m app.migrations upgrade | status | explain
+'''
+import importlib
+import pkgutil
+from types import ModuleType
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.migrations import versions
+
+# 마이그레이션 실행기 전용 advisory lock 키 (임의의 고정값)
+_LOCK_KEY = 727_001
+
+_CREATE_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    revision VARCHAR(32) PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def load_migrations() -> list[ModuleType] :
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module : module.revision)
+
+    revisions = [module.revision for module in modules]
+    if len(revisions) != len(set(revisions)) :
+        raise RuntimeError(f"중복된 revision이 있습니다 : {revisions}")
+    return modules
+
+
+async def applied_revisions(engine : AsyncEngine) -> set[str] :
+    async with engine.begin() as conn :
+        await conn.execute(text(_CREATE_VERSION_TABLE))
+        result = await conn.execute(text("SELECT revision FROM schema_migrations"))
+        return set(result.scalars().all())
+
+
+'''
+    적용되지 않은 마이그레이션을 순서대로 실행하고 적용한 revision 목록을 반환
+'''
+async def upgrade(engine : AsyncEngine) -> list[str] :
+    applied : list[str] = []
+
+    # advisory lock은 세션 단위이므로 lock 전용 커넥션을 끝까지 잡고 있음
+    async with engine.connect() as lock_conn :
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key" : _LOCK_KEY})
+        await lock_conn.commit()
+        try :
+            done = await applied_revisions(engine)
+
+            for migration in load_migrations() :
+                if migration.revision in done :
+                    continue
+
+                if getattr(migration, "transactional", True) :
+                    async with engine.begin() as conn :
+                        await migration.upgrade(conn)
+                        await _record(conn, migration)
+                else :
+                    async with engine.connect() as conn :
+                        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                        await migration.upgrade(conn)
+                        await _record(conn, migration)
+
+                applied.append(migration.revision)
+        finally :
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key" : _LOCK_KEY})
+            await lock_conn.commit()
+
+    return applied
+
+
+async def _record(conn, migration : ModuleType) -> None :
+    await conn.execute(
+        text("INSERT INTO schema_migrations (revision, description) VALUES (:revision, :description)"),
+        {"revision" : migration.revision, "description" : migration.description}
+    )
@@ -0,0 +1,39 @@
+import asyncio
+import sys
+
+from app.database import async_engine
+from app.migrations import upgrade, applied_revisions, load_migrations
+from app.migrations.explain import check_list_query_indexes
+
+
+async def main(command : str) -> int :
+    try :
+        if command == "upgrade" :
+            applied = await upgrade(async_engine)
+            print(f"적용된 마이그레이션 : {applied or '없음'}")
+
+        elif command == "status" :
+            done = await applied_revisions(async_engine)
+            for migration in load_migrations() :
+                mark = "x" if migration.revision in done else " "
+                print(f"[{mark}] {migration.revision} {migration.description}")
+
+        elif command == "explain" :
+            failures = await check_list_query_indexes(async_engine)
+            for failure in failures :
+                print(f"❌ {failure}")
+            if failures :
+                return 1
+            print("✅ 모든 목록 조회 / 검색 쿼리가 인덱스를 사용합니다.")
+
+        else :
+            print("사용법 : python -m app.migrations [upgrade | status | explain]")
+            return 2
+
+        return 0
+    finally :
+        await async_engine.dispose()
+
+
+if __name__ == "__main__" :
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "upgrade")))
@@ -0,0 +1,113 @@
+'''
+주요 목록 조회 / 검색 쿼리가 인덱스를 사용하는지 EXPLAIN 으로 점검
+    - Todo_service.build_list_query / build_search_query 로 실제 API와 같은 쿼리를 만들어 실행계획을 확인
+    - 데이터가 적은 DB에서는 플래너가 seq scan을 고르므로 enable_seqscan = off 로 "인덱스를 쓸 수 있는지"를 확인
+    - 트랜잭션은 항상 롤백 (SET LOCAL 만 사용)
+
+    실행 : python -m app.migrations explain
+'''
+import json
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cursor import encode_cursor
+from app.services.todo_service import Todo_service
+
+# (설명, build_list_query 인자, 사용되어야 하는 인덱스)
+LIST_QUERY_CASES = [
+    (
+        "최신순 목록",
+        {"sort" : "created_at"},
+        "ix_todos_user_id_created_at",
+    ),
+    (
+        "최신순 목록 (커서)",
+        {"sort" : "created_at", "cursor" : encode_cursor({"created_at" : datetime(2025, 1, 1), "id" : 100})},
+        "ix_todos_user_id_created_at",
+    ),
+    (
+        "미완료 최신순 목록",
+        {"sort" : "created_at", "is_completed" : False},
+        "ix_todos_open_user_id_created_at",
+    ),
+    (
+        "기한순 목록",
+        {"sort" : "due_date"},
+        "ix_todos_user_id_due_date",
+    ),
+    (
+        "완료 여부 + 기한순 목록 (커서)",
+        {"sort" : "due_date", "is_completed" : True, "cursor" : encode_cursor({"due_date" : date(2025, 1, 1), "id" : 100})},
+        "ix_todos_user_id_is_completed_due_date",
+    ),
+]
+
+# (설명, build_search_query 인자, 사용되어야 하는 인덱스)
+SEARCH_QUERY_CASES = [
+    (
+        "검색 (전문 검색)",
+        {"q" : "장보기"},
+        "ix_todos_user_id_search_vector",
+    ),
+    (
+        "검색 (제목 유사도)",
+        {"q" : "장보기"},
+        "ix_todos_user_id_title_trgm",
+    ),
+    (
+        "검색 (커서)",
+        {"q" : "장보기", "cursor" : encode_cursor({"rank" : 0.5, "id" : 100})},
+        "ix_todos_user_id_search_vector",
+    ),
+]
+
+
+# 실행계획(JSON)에서 사용된 인덱스 이름과 seq scan 대상 테이블을 수집
+def _walk_plan(plan : dict, indexes : set[str], seq_scans : set[str]) -> None :
+    if "Index Name" in plan :
+        indexes.add(plan["Index Name"])
+    if plan.get("Node Type") == "Seq Scan" :
+        seq_scans.add(plan.get("Relation Name"))
+    for child in plan.get("Plans", []) :
+        _walk_plan(child, indexes, seq_scans)
+
+
+async def explain(engine : AsyncEngine, statement) -> dict :
+    compiled = statement.compile(dialect=engine.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    async with engine.connect() as conn :
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", params)
+        plan = result.scalar()
+        await conn.rollback()
+
+    if isinstance(plan, str) :
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+'''
+    모든 케이스를 점검하고 실패한 케이스의 메시지 목록을 반환 (비어있으면 통과)
+'''
+async def check_list_query_indexes(engine : AsyncEngine, user_id : int = 1) -> list[str] :
+    todo_service = Todo_service()
+    failures : list[str] = []
+
+    cases = [
+        *((name, todo_service.build_list_query(user_id = user_id, **kwargs), index) for name, kwargs, index in LIST_QUERY_CASES),
+        *((name, todo_service.build_search_query(user_id = user_id, **kwargs), index) for name, kwargs, index in SEARCH_QUERY_CASES),
+    ]
+    for name, statement, expected_index in cases :
+        plan = await explain(engine, statement)
+
+        indexes : set[str] = set()
+        seq_scans : set[str] = set()
+        _walk_plan(plan, indexes, seq_scans)
+
+        if "todos" in seq_scans or expected_index not in indexes :
+            failures.append(f"{name} : 기대 인덱스 {expected_index}, 사용된 인덱스 {sorted(indexes)}, seq scan {sorted(seq_scans)}")
+
+    return failures
@@ -0,0 +1,56 @@
+'''
+초기 스키마 (users, todos, refresh_tokens)
+    - 이미 테이블이 있는 기존 DB에서는 아무것도 하지 않음
+'''
+from sqlalchemy import text
+
+revision = "0001"
+description = "initial schema"
+transactional = True
+
+_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR NOT NULL,
+        email VARCHAR NOT NULL,
+        hashed_password BYTEA NOT NULL,
+        is_active BOOLEAN,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)",
+    "CREATE INDEX IF NOT EXISTS ix_users_username ON users (username)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)",
+    """
+    CREATE TABLE IF NOT EXISTS todos (
+        id SERIAL PRIMARY KEY,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        title VARCHAR NOT NULL,
+        description VARCHAR,
+        is_completed BOOLEAN,
+        priority VARCHAR,
+        due_date DATE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_todos_id ON todos (id)",
+    """
+    CREATE TABLE IF NOT EXISTS refresh_tokens (
+        id SERIAL PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        refresh_token VARCHAR NOT NULL,
+        expires_at TIMESTAMP NOT NULL,
+        created_at TIMESTAMP,
+        is_revoked BOOLEAN
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_id ON refresh_tokens (id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_refresh_token ON refresh_tokens (refresh_token)",
+]
+
+async def upgrade(conn) -> None :
+    for statement in _STATEMENTS :
+        await conn.execute(text(statement))
@@ -0,0 +1,24 @@
+'''
+할 일 목록 조회 패턴에 맞춘 복합/부분 인덱스
+    - (user_id, created_at, id)              : 최신순 목록
+    - (user_id, due_date, id)                : 기한순 목록
+    - (user_id, is_completed, due_date, id)  : 완료 여부 필터 + 기한순
+    - (user_id, created_at, id) WHERE is_completed = false : 미완료 할 일 최신순 (부분 인덱스)
+    운영 중인 테이블을 잠그지 않도록 CONCURRENTLY 로 생성 -> 트랜잭션 밖에서 실행
+'''
+from sqlalchemy import text
+
+revision = "0002"
+description = "composite and partial indexes for todo list queries"
+transactional = False
+
+_STATEMENTS = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_user_id_created_at ON todos (user_id, created_at, id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_user_id_due_date ON todos (user_id, due_date, id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_user_id_is_completed_due_date ON todos (user_id, is_completed, due_date, id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_open_user_id_created_at ON todos (user_id, created_at, id) WHERE is_completed = false",
+]
+
+async def upgrade(conn) -> None :
+    for statement in _STATEMENTS :
+        await conn.execute(text(statement))
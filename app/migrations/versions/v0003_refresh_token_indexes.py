@@ -0,0 +1,19 @@
+'''
+리프레시 토큰 회전/무효화 조회용 인덱스
+    - (user_id, is_revoked, expires_at) : 사용자의 유효 토큰 조회, 재사용 감지 시 일괄 무효화
+    - (expires_at)                      : 만료 토큰 배치 삭제
+'''
+from sqlalchemy import text
+
+revision = "0003"
+description = "indexes for refresh token rotation and purge"
+transactional = False
+
+_STATEMENTS = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_refresh_tokens_user_id_is_revoked_expires_at ON refresh_tokens (user_id, is_revoked, expires_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens (expires_at)",
+]
+
+async def upgrade(conn) -> None :
+    for statement in _STATEMENTS :
+        await conn.execute(text(statement))
@@ -0,0 +1,32 @@
+'''
+할 일 검색 (제목/설명 전문 검색 + 제목 오타 허용 검색)
+    - search_vector : 제목(가중치 A) + 설명(가중치 B) tsvector 생성 컬럼 (STORED, 쓰기 시점에 계산)
+      한국어 형태소 분석 사전이 없으므로 'simple' 설정 사용 (공백/구두점 기준 분리, 소문자화만)
+    - (user_id, search_vector) GIN      : 사용자 범위 + 전문 검색을 인덱스 하나로 (btree_gin 으로 정수 컬럼 포함)
+    - (user_id, title gin_trgm_ops) GIN : 사용자 범위 + 제목 trigram 유사도 검색 (pg_trgm)
+    생성 컬럼 추가는 테이블을 다시 쓰므로(ACCESS EXCLUSIVE) 트래픽이 적을 때 실행
+    인덱스는 운영 중인 테이블을 잠그지 않도록 CONCURRENTLY 로 생성 -> 트랜잭션 밖에서 실행
+'''
+from sqlalchemy import text
+
+revision = "0004"
+description = "generated tsvector column and GIN indexes for todo search"
+transactional = False
+
+_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    """
+    ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_user_id_search_vector ON todos USING gin (user_id, search_vector)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_user_id_title_trgm ON todos USING gin (user_id, title gin_trgm_ops)",
+]
+
+async def upgrade(conn) -> None :
+    for statement in _STATEMENTS :
+        await conn.execute(text(statement))
@@ -0,0 +1,51 @@
+'''
+할 일 변경분 동기화 (/todos/changes)
+    - todo_tombstones : 삭제된 할 일 기록 (TODO_TOMBSTONE_RETENTION_SECONDS 동안 보관 후 유지보수 작업으로 삭제)
+      todos 의 statement-level AFTER DELETE 트리거가 transition table 로 한번에 기록
+      -> 어떤 경로로 삭제해도(ORM, 일괄 DELETE, 사용자 삭제 CASCADE) 빠지지 않음, 삭제 문장당 INSERT 한번
+      deleted_at 은 LOCALTIMESTAMP (트랜잭션 시작 시각, todos.updated_at 과 같은 기준)
+    - (user_id, updated_at, id)         : 사용자별 변경된 할 일 keyset 조회
+    - (user_id, deleted_at, id)         : 사용자별 삭제 기록 keyset 조회
+    - (deleted_at)                      : 보관 기간이 지난 삭제 기록 일괄 삭제
+    운영 중인 todos 를 잠그지 않도록 인덱스는 CONCURRENTLY 로 생성 -> 트랜잭션 밖에서 실행
+'''
+from sqlalchemy import text
+
+revision = "0005"
+description = "todo tombstones and updated_at index for delta sync"
+transactional = False
+
+_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS todo_tombstones (
+        id BIGSERIAL PRIMARY KEY,
+        todo_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        deleted_at TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_todo_tombstones_user_id_deleted_at ON todo_tombstones (user_id, deleted_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_todo_tombstones_deleted_at ON todo_tombstones (deleted_at)",
+    """
+    CREATE OR REPLACE FUNCTION todos_record_tombstones() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO todo_tombstones (todo_id, user_id, deleted_at)
+        SELECT id, user_id, LOCALTIMESTAMP FROM deleted_todos WHERE user_id IS NOT NULL;
+        RETURN NULL;
+    END
+    $$
+    """,
+    "DROP TRIGGER IF EXISTS todos_record_tombstones ON todos",
+    """
+    CREATE TRIGGER todos_record_tombstones
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS deleted_todos
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_record_tombstones()
+    """,
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_user_id_updated_at ON todos (user_id, updated_at, id)",
+]
+
+async def upgrade(conn) -> None :
+    for statement in _STATEMENTS :
+        await conn.execute(text(statement))
@@ -0,0 +1,138 @@
+'''
+사용자별 할 일 통계 (/todos/stats)
+    - todo_stats     (user_id, priority)           : 미완료 / 완료 개수
+    - todo_due_stats (user_id, priority, due_date) : 기한이 있는 미완료 개수 -> 기한 지남 = due_date < 오늘 인 행의 합
+      (기한 지남은 시간이 지나면 쓰기 없이도 바뀌므로 날짜별로 쌓아두고 조회 시 합산, 행 수는 할 일 수가 아닌 기한 날짜 수에 비례)
+    - todos 의 statement-level 트리거(INSERT / UPDATE / DELETE, transition table)가 같은 트랜잭션에서 증감
+      -> 어떤 경로로 쓰든(ORM, 일괄 처리, 사용자 삭제 CASCADE) 통계가 같이 커밋/롤백됨
+      증감이 0인 변경(제목/설명 수정 등)은 통계 행을 건드리지 않음, 행 잠금 순서를 고정해서 교착 방지
+    - 사용자 삭제 후에도 행이 남을 수 있으므로 FK 없음 (0이 된 행은 정합성 점검 작업이 정리)
+    - 기존 데이터는 트리거 생성 후 같은 트랜잭션에서 채움 (트리거 생성이 todos 쓰기를 커밋까지 막으므로 누락 없음)
+      -> todos 전체를 집계하는 동안 쓰기가 멈추므로 트래픽이 적을 때 실행
+'''
+from sqlalchemy import text
+
+revision = "0006"
+description = "per-user todo stats maintained by triggers"
+transactional = True
+
+_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS todo_stats (
+        user_id INTEGER NOT NULL,
+        priority VARCHAR(10) NOT NULL,
+        open_count INTEGER NOT NULL DEFAULT 0,
+        completed_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, priority)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS todo_due_stats (
+        user_id INTEGER NOT NULL,
+        priority VARCHAR(10) NOT NULL,
+        due_date DATE NOT NULL,
+        open_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, priority, due_date)
+    )
+    """,
+    # 변경 전 행은 -1, 변경 후 행은 +1 로 받아서 (user_id, priority[, due_date]) 별로 합산한 만큼 증감
+    """
+    CREATE OR REPLACE FUNCTION todo_stats_apply(
+        user_ids INTEGER[], priorities VARCHAR[], completed BOOLEAN[], due_dates DATE[], signs INTEGER[]
+    ) RETURNS void
+    LANGUAGE sql AS $$
+        WITH delta AS (
+            SELECT user_id, coalesce(priority, 'medium') AS priority, coalesce(is_completed, false) AS is_completed, due_date, n
+            FROM unnest(user_ids, priorities, completed, due_dates, signs) AS d (user_id, priority, is_completed, due_date, n)
+            WHERE user_id IS NOT NULL
+        ), counts AS (
+            INSERT INTO todo_stats AS s (user_id, priority, open_count, completed_count)
+            SELECT user_id, priority,
+                   sum(CASE WHEN is_completed THEN 0 ELSE n END),
+                   sum(CASE WHEN is_completed THEN n ELSE 0 END)
+            FROM delta
+            GROUP BY user_id, priority
+            HAVING sum(CASE WHEN is_completed THEN 0 ELSE n END) <> 0 OR sum(CASE WHEN is_completed THEN n ELSE 0 END) <> 0
+            ORDER BY user_id, priority
+            ON CONFLICT (user_id, priority) DO UPDATE
+            SET open_count = s.open_count + EXCLUDED.open_count,
+                completed_count = s.completed_count + EXCLUDED.completed_count
+        )
+        INSERT INTO todo_due_stats AS s (user_id, priority, due_date, open_count)
+        SELECT user_id, priority, due_date, sum(n)
+        FROM delta
+        WHERE NOT is_completed AND due_date IS NOT NULL
+        GROUP BY user_id, priority, due_date
+        HAVING sum(n) <> 0
+        ORDER BY user_id, priority, due_date
+        ON CONFLICT (user_id, priority, due_date) DO UPDATE
+        SET open_count = s.open_count + EXCLUDED.open_count
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION todos_maintain_stats() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM todo_stats_apply(array_agg(user_id), array_agg(priority), array_agg(is_completed), array_agg(due_date), array_agg(1))
+            FROM new_todos;
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM todo_stats_apply(array_agg(user_id), array_agg(priority), array_agg(is_completed), array_agg(due_date), array_agg(-1))
+            FROM old_todos;
+        ELSE
+            PERFORM todo_stats_apply(array_agg(user_id), array_agg(priority), array_agg(is_completed), array_agg(due_date), array_agg(n))
+            FROM (
+                SELECT user_id, priority, is_completed, due_date, -1 AS n FROM old_todos
+                UNION ALL
+                SELECT user_id, priority, is_completed, due_date, 1 AS n FROM new_todos
+            ) changed;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    "DROP TRIGGER IF EXISTS todos_stats_insert ON todos",
+    "DROP TRIGGER IF EXISTS todos_stats_update ON todos",
+    "DROP TRIGGER IF EXISTS todos_stats_delete ON todos",
+    """
+    CREATE TRIGGER todos_stats_insert
+    AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS new_todos
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_maintain_stats()
+    """,
+    """
+    CREATE TRIGGER todos_stats_update
+    AFTER UPDATE ON todos
+    REFERENCING OLD TABLE AS old_todos NEW TABLE AS new_todos
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_maintain_stats()
+    """,
+    """
+    CREATE TRIGGER todos_stats_delete
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS old_todos
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_maintain_stats()
+    """,
+    # 기존 데이터 채우기 (다시 실행해도 중복되지 않도록 비운 뒤 집계)
+    "DELETE FROM todo_stats",
+    "DELETE FROM todo_due_stats",
+    """
+    INSERT INTO todo_stats (user_id, priority, open_count, completed_count)
+    SELECT user_id, coalesce(priority, 'medium'),
+           count(*) FILTER (WHERE NOT coalesce(is_completed, false)),
+           count(*) FILTER (WHERE coalesce(is_completed, false))
+    FROM todos
+    WHERE user_id IS NOT NULL
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO todo_due_stats (user_id, priority, due_date, open_count)
+    SELECT user_id, coalesce(priority, 'medium'), due_date, count(*)
+    FROM todos
+    WHERE user_id IS NOT NULL AND NOT coalesce(is_completed, false) AND due_date IS NOT NULL
+    GROUP BY 1, 2, 3
+    """,
+]
+
+async def upgrade(conn) -> None :
+    for statement in _STATEMENTS :
+        await conn.execute(text(statement))
@@ -1,3 +1,5 @@
 from .todo import Todos
 from .user import Users
-from .refresh_token import RefreshToken
\ No newline at end of file
+from .refresh_token import RefreshToken
+from .todo_tombstone import TodoTombstone
+from .todo_stats import TodoStats, TodoDueStats
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import datetime
@@ -9,12 +9,18 @@ class RefreshToken(Base) :
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id",ondelete="CASCADE"), nullable=False)
-    refresh_token = Column(String, index=True, unique=True, nullable=False)
+    refresh_token = Column(String, index=True, unique=True, nullable=False) # 토큰 원문이 아닌 sha256 해시
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     is_revoked = Column(Boolean, default=False) # 토큰 무효화 여부
 
     users = relationship("Users", back_populates="refresh_tokens")
     
+    # app/migrations/versions/v0003_refresh_token_indexes.py 와 동일하게 유지
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id_is_revoked_expires_at", "user_id", "is_revoked", "expires_at"), # 사용자별 유효 토큰 조회/일괄 무효화
+        Index("ix_refresh_tokens_expires_at", "expires_at"), # 만료 토큰 일괄 삭제
+    )
+    
     def __repr__(self) :
         return f"[refresh_token : {self.refresh_token} , is_revoked : {self.is_revoked}]"
\ No newline at end of file
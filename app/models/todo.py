@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DATE, TIMESTAMP, text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DATE, TIMESTAMP, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 
 class Todos(Base):
@@ -15,9 +16,39 @@ class Todos(Base):
     created_at = Column(TIMESTAMP, server_default=text("CURRENT_TIMESTAMP"))
     updated_at = Column(TIMESTAMP, server_default=text('CURRENT_TIMESTAMP'), onupdate=text('CURRENT_TIMESTAMP'))
     
+    # 검색용 생성 컬럼 (app/migrations/versions/v0004_todo_search.py), 응답에는 필요 없으므로 조회 시 읽지 않음(deferred)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+    
     # back_populates는 Users 모델의 todos 속성과 연결됨을 의미
     users = relationship("Users", back_populates="todos")
     
+    # INSERT 시 RETURNING 으로 server default / 생성 컬럼(search_vector 포함)을 받아오지 않음 (create_todo 에서 refresh)
+    __mapper_args__ = {"eager_defaults" : False}
+    
+    # 목록 조회 / 검색 패턴용 인덱스 (app/migrations/versions/v0002, v0004, v0005 와 동일하게 유지)
+    __table_args__ = (
+        Index("ix_todos_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_todos_user_id_due_date", "user_id", "due_date", "id"),
+        Index("ix_todos_user_id_is_completed_due_date", "user_id", "is_completed", "due_date", "id"),
+        Index(
+            "ix_todos_open_user_id_created_at", "user_id", "created_at", "id",
+            postgresql_where=text("is_completed = false")
+        ),
+        Index("ix_todos_user_id_updated_at", "user_id", "updated_at", "id"),
+        Index("ix_todos_user_id_search_vector", "user_id", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_todos_user_id_title_trgm", "user_id", "title",
+            postgresql_using="gin", postgresql_ops={"title" : "gin_trgm_ops"}
+        ),
+    )
+    
     # 3. 기능(메소드) 구현
     def __repr__(self):
         return f"<User(id={self.id}, title='{self.title}')>"
\ No newline at end of file
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DATE
+from app.database import Base
+
+# 사용자별 / 중요도별 할 일 개수 (todos 트리거가 증감, app/migrations/versions/v0006_todo_stats.py)
+class TodoStats(Base) :
+    __tablename__ = "todo_stats"
+
+    user_id = Column(Integer, primary_key=True) # 사용자 삭제 후에도 남을 수 있도록 FK 없음 (정합성 점검 작업이 정리)
+    priority = Column(String, primary_key=True)
+    open_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) :
+        return f"<TodoStats(user_id={self.user_id}, priority='{self.priority}')>"
+
+# 사용자별 / 중요도별 / 기한별 미완료 할 일 개수 (기한 지남 = due_date < 오늘 인 행의 합)
+class TodoDueStats(Base) :
+    __tablename__ = "todo_due_stats"
+
+    user_id = Column(Integer, primary_key=True)
+    priority = Column(String, primary_key=True)
+    due_date = Column(DATE, primary_key=True)
+    open_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) :
+        return f"<TodoDueStats(user_id={self.user_id}, priority='{self.priority}', due_date={self.due_date})>"
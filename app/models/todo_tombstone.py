@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, BigInteger, TIMESTAMP, Index, text
+from app.database import Base
+
+# 삭제된 할 일 기록 (todos 의 AFTER DELETE 트리거가 기록, /todos/changes 에서 사용)
+class TodoTombstone(Base) :
+    __tablename__ = "todo_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    todo_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False) # 사용자 삭제 후에도 남도록 FK 없음 (보관 기간이 지나면 삭제)
+    deleted_at = Column(TIMESTAMP, nullable=False, server_default=text("LOCALTIMESTAMP"))
+
+    # app/migrations/versions/v0005_todo_changes.py 와 동일하게 유지
+    __table_args__ = (
+        Index("ix_todo_tombstones_user_id_deleted_at", "user_id", "deleted_at", "id"), # 사용자별 삭제 기록 keyset 조회
+        Index("ix_todo_tombstones_deleted_at", "deleted_at"), # 보관 기간이 지난 기록 일괄 삭제
+    )
+
+    def __repr__(self) :
+        return f"<TodoTombstone(todo_id={self.todo_id}, deleted_at={self.deleted_at})>"
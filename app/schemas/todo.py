@@ -12,8 +12,8 @@ CREATE TABLE todos (
  );
 '''
 
-from pydantic import BaseModel, Field, ValidationError, ConfigDict, EmailStr
-from typing import Annotated, Literal
+from pydantic import BaseModel, Field, ValidationError, ConfigDict, EmailStr, model_validator, field_validator
+from typing import Annotated, Literal, Union
 from datetime import datetime, date
 
 # datetime.datetime : YYYY-MM-DD HH:MM:SS
@@ -35,6 +35,14 @@ class TodoUpdate(BaseModel) :
     due_date : Annotated[date | None, Field(default=None, description="작업 기한")]
     is_completed : Annotated[bool | None, Field(default=None, description="작업완료여부")]
     
+    # 생략(변경 안 함)은 허용하지만 명시적인 null 은 거부 (응답 스키마에서 null 이 될 수 없는 필드)
+    @field_validator("title", "priority", "is_completed")
+    @classmethod
+    def reject_null(cls, value) :
+        if value is None :
+            raise ValueError("null 로 변경할 수 없습니다.")
+        return value
+    
 class Todo(TodoBase) : 
     id : int
     user_id : Annotated[int, Field(default=False, description="할 일 생성한 사용자 ID")]
@@ -46,4 +54,112 @@ class Todo(TodoBase) :
         from_attributes=True,
         title = "할 일 정보",
         decription = "API 응답용 할 일 상세 정보 스키마"
-    )
\ No newline at end of file
+    )
+    
+class TodoPage(BaseModel) :
+    items : Annotated[list[Todo], Field(description="할 일 목록")]
+    next_cursor : Annotated[str | None, Field(default=None, description="다음 페이지 커서 (마지막 페이지면 null)")]
+    
+    model_config = ConfigDict(
+        title = "할 일 목록 페이지",
+        description = "keyset 페이지네이션 응답 스키마"
+    )
+
+class TodoChanges(BaseModel) :
+    changed : Annotated[list[Todo], Field(description="커서 이후 생성/수정된 할 일 (이미 받은 할 일이 다시 올 수 있음, id 로 덮어쓰기)")]
+    deleted : Annotated[list[int], Field(description="커서 이후 삭제된 할 일 id")]
+    next_cursor : Annotated[str, Field(description="다음 동기화에 보낼 커서")]
+    has_more : Annotated[bool, Field(description="true 면 next_cursor 로 바로 이어서 조회")]
+
+    model_config = ConfigDict(
+        title = "할 일 변경분",
+        description = "변경분 동기화 응답 스키마"
+    )
+
+# ---------------- 내보내기 / 가져오기 ----------------
+# 가져오기 한 줄 (내보낸 파일을 그대로 넣을 수 있도록 id, 날짜 등 나머지 필드는 무시)
+class TodoImport(TodoCreate) :
+    is_completed : Annotated[bool, Field(default=False, description="작업완료여부")]
+
+class TodoImportResult(BaseModel) :
+    imported : Annotated[int, Field(description="추가된 할 일 개수")]
+
+    model_config = ConfigDict(
+        title = "할 일 가져오기 결과"
+    )
+
+class TodoCounts(BaseModel) :
+    open : Annotated[int, Field(description="미완료 개수")]
+    completed : Annotated[int, Field(description="완료 개수")]
+    overdue : Annotated[int, Field(description="기한이 지난 미완료 개수")]
+
+class TodoStats(TodoCounts) :
+    by_priority : Annotated[dict[str, TodoCounts], Field(description="중요도별 개수 (low / medium / high)")]
+
+    model_config = ConfigDict(
+        title = "할 일 통계",
+        description = "사용자별 할 일 개수 응답 스키마"
+    )
+
+# ---------------- 일괄(bulk) 처리 ----------------
+class TodoBulkCreate(BaseModel) :
+    op : Literal["create"]
+    data : TodoCreate
+
+class TodoBulkUpdate(BaseModel) :
+    op : Literal["update"]
+    id : int
+    data : TodoUpdate
+
+class TodoBulkDelete(BaseModel) :
+    op : Literal["delete"]
+    id : int
+
+class TodoBulkComplete(BaseModel) :
+    op : Literal["complete"]
+    id : int
+
+TodoBulkOperation = Annotated[
+    Union[TodoBulkCreate, TodoBulkUpdate, TodoBulkDelete, TodoBulkComplete],
+    Field(discriminator="op")
+]
+
+class TodoBulkRequest(BaseModel) :
+    operations : Annotated[list[TodoBulkOperation], Field(min_length=1, max_length=500, description="처리할 작업 목록")]
+    
+    # 같은 할 일에 여러 작업이 있으면 실행 순서가 모호하므로 거부
+    @model_validator(mode="after")
+    def check_unique_ids(self) :
+        ids = [operation.id for operation in self.operations if operation.op != "create"]
+        if len(ids) != len(set(ids)) :
+            raise ValueError("하나의 요청에서 같은 할 일 id를 여러 번 사용할 수 없습니다.")
+        return self
+    
+    model_config = ConfigDict(
+        title = "할 일 일괄 처리 요청",
+        json_schema_extra = {
+            "example" : {
+                "operations" : [
+                    {"op" : "create", "data" : {"title" : "장보기", "priority" : "high"}},
+                    {"op" : "update", "id" : 3, "data" : {"title" : "운동하기"}},
+                    {"op" : "complete", "id" : 4},
+                    {"op" : "delete", "id" : 5}
+                ]
+            }
+        }
+    )
+
+class TodoBulkItemResult(BaseModel) :
+    index : Annotated[int, Field(description="요청 operations 내 위치")]
+    op : Literal["create", "update", "delete", "complete"]
+    id : Annotated[int | None, Field(default=None, description="할 일 ID")]
+    status : Literal["ok", "not_found"]
+    todo : Annotated[Todo | None, Field(default=None, description="처리 후 할 일 (delete는 null)")]
+
+class TodoBulkResponse(BaseModel) :
+    results : list[TodoBulkItemResult]
+    
+    model_config = ConfigDict(
+        title = "할 일 일괄 처리 결과",
+        description = "작업별 처리 결과 (요청 순서와 동일)"
+    )
@@ -155,6 +155,16 @@ class TokenData(BaseModel):
     username: str | None = None
     email : str | None = None
 
+# DB 조회 없이 access token 만으로 만든 현재 사용자 정보 (app/api/deps.py get_token_claims)
+class TokenClaims(BaseModel):
+    id : Annotated[int, Field(description="사용자 ID (토큰의 sub)")]
+    email : Annotated[str, Field(description="사용자 이메일")]
+    username : Annotated[str, Field(description="사용자 이름")]
+    is_active : Annotated[bool, Field(description="토큰 발급 시점의 활동 계정 여부")]
+    jti : Annotated[str, Field(description="토큰 ID")]
+    iat : Annotated[int, Field(description="토큰 발급 시각 (unix time)")]
+    exp : Annotated[int, Field(description="토큰 만료 시각 (unix time)")]
+
 if __name__ == "__main__" : 
     import json
     try:
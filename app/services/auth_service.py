@@ -1,9 +1,19 @@
+import logging
+
+from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import update
 from app.schemas import user as user_schema
 from app.models import user as user_model
-from app.core.security import pwd_hashing, verify_password, create_access_token, create_refresh_token
-from app import UserAlreadyExistsError, UserDoesNotExist, PasswordDoesNotMatch
+from app.database import release_connection, replica_router
+from app.core.security import pwd_hashing_async, verify_password_async, verify_dummy_password_async, needs_rehash, verified_token_cache
+from app.core.email_filter import registered_emails
+from app.core.revocation import revocation_list
+from app.services.token_service import Token_service
+from app import UserAlreadyExistsError, UserDoesNotExist, PasswordDoesNotMatch, HashPoolSaturated
+
+logger = logging.getLogger(__name__)
 
 # 인증 비즈니스 로직 구현
 class Auth_service() :
@@ -25,9 +35,11 @@ class Auth_service() :
         if db_user :
             raise UserAlreadyExistsError(username=user.username)
         
+        # 해싱하는 동안 커넥션을 점유하지 않도록 반납 (중복 가입 경합은 UNIQUE 제약으로 처리됨)
+        await release_connection(db)
         
-        # 2. 비밀번호 해싱 
-        hashed_password = pwd_hashing(user.password)
+        # 2. 비밀번호 해싱 (워커 풀에서 실행)
+        hashed_password = await pwd_hashing_async(user.password)
         
         # 3. User 모델 객체 생성
         # Pydantic 스키마(user)에서 받은 정보와 해싱된 비밀번호로 SQLAlchemy 모델(db_user) 객체를 만듭니다.
@@ -47,33 +59,68 @@ class Auth_service() :
     '''
         로그인 함수
         - 이메일 검증 & 패스워드 검증
-        - access, refresh token 발급
+        - access, refresh token 발급 (refresh token 해시는 DB에 저장 -> 호출하는 쪽에서 커밋)
+        - 가입되지 않은 이메일도 더미 해시로 같은 비용의 검증을 하고 PasswordDoesNotMatch
+          (응답 코드/시간으로 가입 여부가 드러나지 않도록)
+        - 저장된 해시의 bcrypt 비용이 설정값과 다르면 응답을 보낸 뒤(background_tasks) 새 비용으로 다시 해싱
     '''
-    async def user_login(self, db : AsyncSession, user : user_schema.UserLogin) -> list[dict] :
+    async def user_login(self, db : AsyncSession, user : user_schema.UserLogin, background_tasks : BackgroundTasks | None = None) -> list[dict] :
+        # 0. Bloom filter 에 없으면 가입되지 않은 이메일 -> DB 조회 생략
+        #    (다른 워커에서 방금 가입했으면 백그라운드 따라잡기가 끝난 뒤 다시 시도하면 성공)
+        if not registered_emails.might_contain(user.email) :
+            await verify_dummy_password_async(user.password)
+            raise PasswordDoesNotMatch()
+        
         # 1. 가입된 회원인지 확인
         query = select(user_model.Users).filter(user_model.Users.email == user.email)
         result = await db.execute(query)
         db_user = result.scalar()
         
         if db_user is None : 
-            # 이메일이 일치하지 않을 경우
-            raise UserDoesNotExist()
+            # 이메일이 일치하지 않을 경우 (Bloom filter 오탐)
+            await release_connection(db)
+            await verify_dummy_password_async(user.password)
+            raise PasswordDoesNotMatch()
         
-        # 2. 패스워드 검증
-        decode_password = verify_password(user.password, db_user.hashed_password)
+        # 검증하는 동안 커넥션을 점유하지 않도록 반납
+        await release_connection(db)
+        
+        # 2. 패스워드 검증 (워커 풀에서 실행)
+        decode_password = await verify_password_async(user.password, db_user.hashed_password)
         
         # 2-1. 성공시 access_token + refresh_token 발급
         if decode_password :
-            access_token = create_access_token(db_user.email, db_user.username)
-            refresh_token = create_refresh_token(db_user.email, db_user.username)
-            return {
-                "access" : access_token, 
-                "refresh" : refresh_token
-            }
+            if background_tasks is not None and needs_rehash(db_user.hashed_password) :
+                background_tasks.add_task(self.rehash_password, db_user.id, user.password, db_user.hashed_password)
+            return await Token_service().issue_tokens(db, db_user)
         else :
             # 패스워드가 일치하지 않을 경우
             raise PasswordDoesNotMatch()
     
+    '''
+        비밀번호를 현재 bcrypt 비용으로 다시 해싱해서 저장 (로그인 응답 이후 실행)
+        - 요청 세션은 이미 닫혔으므로 별도 세션 사용
+        - 그 사이에 비밀번호가 바뀌었으면 덮어쓰지 않음 (기존 해시가 같을 때만 UPDATE)
+        - 실패해도 로그인에는 영향 없음 -> 다음 로그인 때 다시 시도
+    '''
+    async def rehash_password(self, user_id : int, password : str, old_hash : bytes) -> None :
+        try :
+            new_hash = await pwd_hashing_async(password)
+        except HashPoolSaturated :
+            return
+        
+        try :
+            async with replica_router.primary() as db :
+                query = (
+                    update(user_model.Users)
+                    .where(user_model.Users.id == user_id, user_model.Users.hashed_password == old_hash)
+                    .values(hashed_password=new_hash)
+                )
+                await db.execute(query)
+                await db.commit()
+        except Exception :
+            logger.warning("password rehash failed", extra={"user_id" : user_id}, exc_info=True)
+    
     async def get_user_by_email(self, db: AsyncSession, email : str) -> user_schema.User :
         query = select(user_model.Users).filter(user_model.Users.email == email)
         result = await db.execute(query)
@@ -84,6 +131,31 @@ class Auth_service() :
         
         return user
     
+    '''
+        계정 비활성화 (커밋은 호출하는 쪽에서 수행)
+        - is_active = False 로 변경
+        - 커밋한 뒤 forget_user_tokens 를 호출해야 이 워커의 토큰 캐시/폐기 목록에 반영됨
+          (롤백되면 토큰도 그대로 유효해야 하므로 여기서는 건드리지 않음)
+    '''
+    async def deactivate_user(self, db : AsyncSession, user_id : int) -> None :
+        query = (
+            update(user_model.Users)
+            .where(user_model.Users.id == user_id)
+            .values(is_active=False)
+            .returning(user_model.Users.id)
+        )
+        result = await db.execute(query)
+        
+        if result.scalar() is None :
+            raise UserDoesNotExist()
+    
+    '''
+        사용자의 검증된 토큰 캐시를 비우고 이미 발급된 access token 을 폐기 목록에 추가 (커밋 후 호출)
+    '''
+    def forget_user_tokens(self, user_id : int) -> None :
+        verified_token_cache.invalidate_where(lambda _, cached : cached[1].id == user_id)
+        revocation_list.revoke_user(user_id)
+    
 if __name__ == "__main__" : 
     pass
 
@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import async_engine, AsyncSesionLocal
+from app.core.config import settings
+from app.services.token_service import Token_service
+from app.services.todo_service import Todo_service
+from app.services.todo_stats_service import Todo_stats_service
+
+# 작업별 advisory lock 키 (여러 워커 프로세스 중 하나만 실행)
+_LOCK_KEYS = {
+    "purge_expired_refresh_tokens" : 727_101,
+    "purge_todo_tombstones" : 727_102,
+    "reconcile_todo_stats" : 727_103,
+}
+
+# 스케줄러에서 실행되는 유지보수 작업
+class Maintenance_service() :
+
+    '''
+        만료된 리프레시 토큰 삭제
+        - batch_size 행씩 별도 트랜잭션으로 삭제하고 배치 사이에 잠시 대기
+        - 삭제한 전체 행 수를 반환
+    '''
+    async def purge_expired_refresh_tokens(self) -> int :
+        token_service = Token_service()
+        return await self._run_locked(
+            "purge_expired_refresh_tokens",
+            lambda db : token_service.purge_expired(db, settings.maintenance_batch_size)
+        )
+
+    '''
+        보관 기간이 지난 할 일 삭제 기록(/todos/changes 용) 삭제
+    '''
+    async def purge_todo_tombstones(self) -> int :
+        todo_service = Todo_service()
+        return await self._run_locked(
+            "purge_todo_tombstones",
+            lambda db : todo_service.purge_tombstones(db, settings.maintenance_batch_size)
+        )
+
+    '''
+        할 일 통계 정합성 점검 (todo_stats / todo_due_stats 를 todos 에서 다시 집계해서 차이를 바로잡음)
+        - TODO_STATS_RECONCILE_BATCH_USERS 명씩 별도 트랜잭션으로 점검하고 배치 사이에 잠시 대기
+        - 바로잡은 전체 행 수를 반환 (0이 아니면 트리거 누락/수동 수정 등으로 어긋났던 것)
+    '''
+    async def reconcile_todo_stats(self) -> int :
+        stats_service = Todo_stats_service()
+        total = 0
+
+        async with self._locked("reconcile_todo_stats") as locked :
+            if not locked :
+                return 0
+
+            after_user_id = None
+            while True :
+                async with AsyncSesionLocal() as db :
+                    until_user_id = await stats_service.next_user_boundary(
+                        db, after_user_id, settings.todo_stats_reconcile_batch_users
+                    )
+                    total += await stats_service.reconcile(db, after_user_id, until_user_id)
+                    await db.commit()
+
+                if until_user_id is None :
+                    break
+                after_user_id = until_user_id
+                await asyncio.sleep(settings.maintenance_batch_sleep)
+
+        return total
+
+    '''
+        배치 삭제 공통 루프
+        - 다른 워커가 같은 작업을 실행중이면(advisory lock 획득 실패) 건너뜀
+        - 배치가 batch_size 보다 적게 삭제되면 종료, 최대 배치 수 제한
+    '''
+    async def _run_locked(self, name : str, batch : Callable[[AsyncSession], Awaitable[int]]) -> int :
+        total = 0
+
+        async with self._locked(name) as locked :
+            if not locked :
+                return 0
+
+            for _ in range(settings.maintenance_max_batches) :
+                async with AsyncSesionLocal() as db :
+                    deleted = await batch(db)
+                    await db.commit()
+
+                total += deleted
+                if deleted < settings.maintenance_batch_size :
+                    break
+                await asyncio.sleep(settings.maintenance_batch_sleep)
+
+        return total
+
+    # 작업별 advisory lock (세션 단위라 lock 전용 커넥션을 끝까지 잡고 있음), 획득 여부를 넘겨줌
+    @asynccontextmanager
+    async def _locked(self, name : str) -> AsyncIterator[bool] :
+        lock_key = _LOCK_KEYS[name]
+
+        async with async_engine.connect() as lock_conn :
+            locked = (await lock_conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key" : lock_key})).scalar()
+            await lock_conn.commit()
+            if not locked :
+                yield False
+                return
+
+            try :
+                yield True
+            finally :
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key" : lock_key})
+                await lock_conn.commit()
@@ -0,0 +1,473 @@
+from datetime import date, datetime, timedelta
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import Select, Integer, tuple_, true, false, union_all, any_, literal, literal_column, bindparam, insert, update, delete, func, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import aliased
+from app.schemas import todo as todo_schema
+from app.models import todo as todo_model
+from app.models.todo_tombstone import TodoTombstone
+from app.core.config import settings
+from app.core.cursor import encode_cursor, decode_cursor
+from app.core.realtime import publish_change
+from app import TodoDoesNotExist, InvalidCursorError, ChangeCursorExpired
+
+Todos = todo_model.Todos
+
+# null 로 바꿀 수 없는 필드 (TodoUpdate 에서 거부하지만 DB에 쓰기 전에 한번 더 제외)
+_NOT_NULL_FIELDS = ("title", "priority", "is_completed")
+
+# 할 일 비즈니스 로직 구현
+class Todo_service() :
+
+    '''
+        할 일 생성
+        - server_default(created_at 등)를 채우기 위해 flush 후 refresh
+    '''
+    async def create_todo(self, db : AsyncSession, user_id : int, todo : todo_schema.TodoCreate) -> Todos :
+        db_todo = Todos(user_id = user_id, **todo.model_dump())
+
+        db.add(db_todo)
+        await db.flush()
+        await db.refresh(db_todo)
+        await publish_change(db, user_id, "created", [db_todo.id])
+
+        return db_todo
+
+    '''
+        할 일 단건 조회
+        - 다른 사용자의 할 일은 존재하지 않는 것으로 취급
+    '''
+    async def get_todo(self, db : AsyncSession, user_id : int, todo_id : int) -> Todos :
+        query = select(Todos).filter(Todos.id == todo_id, Todos.user_id == user_id)
+        result = await db.execute(query)
+        db_todo = result.scalar()
+
+        if db_todo is None :
+            raise TodoDoesNotExist(todo_id)
+
+        return db_todo
+
+    '''
+        할 일 수정
+        - 요청에 포함된 필드만 변경 (_changed_fields)
+        - onupdate(updated_at) 값을 반영하기 위해 flush 후 refresh
+    '''
+    async def update_todo(self, db : AsyncSession, user_id : int, todo_id : int, todo : todo_schema.TodoUpdate) -> Todos :
+        db_todo = await self.get_todo(db, user_id, todo_id)
+
+        for key, value in self._changed_fields(todo).items() :
+            setattr(db_todo, key, value)
+
+        await db.flush()
+        await db.refresh(db_todo)
+        await publish_change(db, user_id, "updated", [todo_id])
+
+        return db_todo
+
+    # 요청에 포함된 필드만 (exclude_unset), null 로 바꿀 수 없는 필드의 None 은 제외
+    @staticmethod
+    def _changed_fields(todo : todo_schema.TodoUpdate) -> dict :
+        fields = todo.model_dump(exclude_unset=True)
+        return {key : value for key, value in fields.items() if value is not None or key not in _NOT_NULL_FIELDS}
+
+    async def delete_todo(self, db : AsyncSession, user_id : int, todo_id : int) -> None :
+        db_todo = await self.get_todo(db, user_id, todo_id)
+
+        await db.delete(db_todo)
+        await db.flush()
+        await publish_change(db, user_id, "deleted", [todo_id])
+
+    '''
+        할 일 일괄 처리 (하나의 트랜잭션, 작업 종류별로 집합 단위 SQL 실행)
+        - create   : multi-row INSERT ... RETURNING 한번
+        - update   : 소유 여부 확인 SELECT 한번 + 변경 필드 조합별 executemany UPDATE
+        - complete : UPDATE ... WHERE id = ANY(:ids) RETURNING id 한번
+        - delete   : DELETE ... WHERE id = ANY(:ids) RETURNING id 한번
+        - 마지막으로 변경된 행을 SELECT 한번으로 다시 읽어 결과에 담음
+        - 다른 사용자의 할 일이나 없는 id는 not_found 로 보고 (요청 전체를 실패시키지 않음)
+        - 작업 내용은 요청 스키마(TodoBulkRequest)에서 전부 검증된 뒤 실행 -> 잘못된 작업이 있으면 아무것도 쓰지 않고 422
+        - 실시간 변경 알림은 작업 종류별로 한번씩 (app/core/realtime.py)
+        - 커밋은 호출하는 쪽(router)에서 수행
+    '''
+    async def bulk_apply(self, db : AsyncSession, user_id : int, request : todo_schema.TodoBulkRequest) -> list[dict] :
+        operations = list(enumerate(request.operations))
+        creates = [(index, op) for index, op in operations if op.op == "create"]
+        updates = [(index, op) for index, op in operations if op.op == "update"]
+        completes = [(index, op) for index, op in operations if op.op == "complete"]
+        deletes = [(index, op) for index, op in operations if op.op == "delete"]
+
+        results : dict[int, dict] = {}
+        touched_ids : list[int] = []
+
+        # 1. create
+        if creates :
+            rows = [{"user_id" : user_id, **op.data.model_dump()} for _, op in creates]
+            created = await db.scalars(
+                insert(Todos).returning(Todos, sort_by_parameter_order=True),
+                rows
+            )
+            for (index, op), db_todo in zip(creates, created.all()) :
+                results[index] = {"index" : index, "op" : op.op, "id" : db_todo.id, "status" : "ok", "todo" : db_todo}
+            await publish_change(db, user_id, "created", [result["id"] for result in results.values()])
+
+        # 2. update
+        if updates :
+            owned = await self._owned_ids(db, user_id, [op.id for _, op in updates])
+
+            # 변경할 필드 조합이 같은 것끼리 묶어서 executemany
+            groups : dict[tuple[str, ...], list[dict]] = {}
+            for index, op in updates :
+                if op.id not in owned :
+                    results[index] = {"index" : index, "op" : op.op, "id" : op.id, "status" : "not_found"}
+                    continue
+
+                fields = self._changed_fields(op.data)
+                results[index] = {"index" : index, "op" : op.op, "id" : op.id, "status" : "ok"}
+                touched_ids.append(op.id)
+                if fields :
+                    params = {"b_id" : op.id, **{f"b_{key}" : value for key, value in fields.items()}}
+                    groups.setdefault(tuple(sorted(fields)), []).append(params)
+
+            table = Todos.__table__
+            for keys, params in groups.items() :
+                query = (
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"), table.c.user_id == user_id)
+                    .values({key : bindparam(f"b_{key}") for key in keys})
+                )
+                await db.execute(query, params)
+
+        # 3. complete
+        if completes :
+            result = await db.execute(
+                update(Todos)
+                .where(Todos.user_id == user_id, self._id_in([op.id for _, op in completes]))
+                .values(is_completed=True)
+                .returning(Todos.id)
+                .execution_options(synchronize_session=False)
+            )
+            completed = set(result.scalars().all())
+            for index, op in completes :
+                found = op.id in completed
+                results[index] = {"index" : index, "op" : op.op, "id" : op.id, "status" : "ok" if found else "not_found"}
+                if found :
+                    touched_ids.append(op.id)
+
+        # 4. delete
+        if deletes :
+            result = await db.execute(
+                delete(Todos)
+                .where(Todos.user_id == user_id, self._id_in([op.id for _, op in deletes]))
+                .returning(Todos.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted = set(result.scalars().all())
+            for index, op in deletes :
+                results[index] = {"index" : index, "op" : op.op, "id" : op.id, "status" : "ok" if op.id in deleted else "not_found"}
+            await publish_change(db, user_id, "deleted", sorted(deleted))
+
+        # 5. 변경된 행 다시 읽기
+        if touched_ids :
+            await publish_change(db, user_id, "updated", sorted(set(touched_ids)))
+            query = (
+                select(Todos)
+                .where(self._id_in(touched_ids))
+                .execution_options(populate_existing=True)
+            )
+            todos = {db_todo.id : db_todo for db_todo in (await db.scalars(query)).all()}
+            for result in results.values() :
+                if result["op"] in ("update", "complete") and result["status"] == "ok" :
+                    result["todo"] = todos.get(result["id"])
+
+        return [results[index] for index in sorted(results)]
+
+    async def _owned_ids(self, db : AsyncSession, user_id : int, ids : list[int]) -> set[int] :
+        query = select(Todos.id).where(Todos.user_id == user_id, self._id_in(ids))
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    # id = ANY(:ids) -> 개수와 상관없이 같은 SQL 이므로 prepared statement 캐시를 재사용
+    @staticmethod
+    def _id_in(ids : list[int]) :
+        return Todos.id == any_(literal(ids, ARRAY(Integer)))
+
+    '''
+        할 일 목록 조회 (keyset 페이지네이션)
+        - sort = "created_at" : (created_at, id) 내림차순 -> 최신순
+        - sort = "due_date"   : (due_date, id) 오름차순, 기한이 없는 할 일은 마지막
+        - OFFSET 대신 마지막 행의 정렬 키보다 뒤에 있는 행만 조회하므로 페이지 깊이와 무관하게 O(page)
+        - limit + 1개를 조회해서 다음 페이지 존재 여부를 판단
+    '''
+    async def list_todos(
+        self,
+        db : AsyncSession,
+        user_id : int,
+        sort : Literal["created_at", "due_date"] = "created_at",
+        limit : int = 20,
+        cursor : str | None = None,
+        is_completed : bool | None = None,
+        priority : str | None = None
+    ) -> tuple[list[Todos], str | None] :
+
+        query = self.build_list_query(
+            user_id = user_id,
+            sort = sort,
+            limit = limit,
+            cursor = cursor,
+            is_completed = is_completed,
+            priority = priority
+        )
+        result = await db.execute(query)
+        todos = list(result.scalars().all())
+
+        next_cursor = None
+        if len(todos) > limit :
+            todos = todos[:limit]
+            last = todos[-1]
+            next_cursor = encode_cursor({sort : getattr(last, sort), "id" : last.id})
+
+        return todos, next_cursor
+
+    '''
+        목록 조회 SELECT 문 생성 (limit + 1)
+        - 인덱스 사용 여부 점검(app/migrations/explain.py)에서도 같은 쿼리를 사용
+    '''
+    def build_list_query(
+        self,
+        user_id : int,
+        sort : Literal["created_at", "due_date"] = "created_at",
+        limit : int = 20,
+        cursor : str | None = None,
+        is_completed : bool | None = None,
+        priority : str | None = None
+    ) -> Select :
+
+        query = select(Todos).filter(Todos.user_id == user_id)
+
+        # 필터 (is_completed는 파라미터가 아닌 리터럴로 넣어야 부분 인덱스 조건과 매칭됨)
+        if is_completed is not None :
+            query = query.filter(Todos.is_completed == (true() if is_completed else false()))
+        if priority is not None :
+            query = query.filter(Todos.priority == priority)
+
+        # 정렬 + 커서 조건
+        if sort == "due_date" :
+            if cursor is not None :
+                return self._due_date_page(query, decode_cursor(cursor), limit)
+            query = query.order_by(Todos.due_date.asc().nulls_last(), Todos.id.asc())
+        else :
+            query = query.order_by(Todos.created_at.desc(), Todos.id.desc())
+            if cursor is not None :
+                query = query.filter(self._created_at_before(decode_cursor(cursor)))
+
+        return query.limit(limit + 1)
+
+    # (created_at, id) < (커서 값)
+    @staticmethod
+    def _created_at_before(values : dict) :
+        try :
+            created_at = datetime.fromisoformat(values["created_at"])
+            last_id = int(values["id"])
+        except (KeyError, TypeError, ValueError) as e :
+            raise InvalidCursorError() from e
+
+        return tuple_(Todos.created_at, Todos.id) < (created_at, last_id)
+
+    '''
+        기한순(NULLS LAST) 다음 페이지
+        - 커서의 due_date가 NULL : 남은 NULL 행 중 id가 큰 것
+        - 커서의 due_date가 값   : (due_date, id)가 더 큰 행 + 모든 NULL 행
+          "A OR due_date IS NULL" 로 쓰면 인덱스 범위 검색이 안되므로
+          두 범위를 각각 인덱스로 limit + 1개씩 읽어 UNION ALL 후 다시 정렬
+    '''
+    @staticmethod
+    def _due_date_page(query : Select, values : dict, limit : int) -> Select :
+        try :
+            due_date = values["due_date"]
+            due_date = None if due_date is None else date.fromisoformat(due_date)
+            last_id = int(values["id"])
+        except (KeyError, TypeError, ValueError) as e :
+            raise InvalidCursorError() from e
+
+        nulls = (
+            query.filter(Todos.due_date.is_(None), Todos.id > last_id)
+            .order_by(Todos.id.asc())
+            .limit(limit + 1)
+        )
+        if due_date is None :
+            return nulls
+
+        after = (
+            query.filter(tuple_(Todos.due_date, Todos.id) > (due_date, last_id))
+            .order_by(Todos.due_date.asc(), Todos.id.asc())
+            .limit(limit + 1)
+        )
+        nulls = (
+            query.filter(Todos.due_date.is_(None))
+            .order_by(Todos.id.asc())
+            .limit(limit + 1)
+        )
+
+        page = aliased(Todos, union_all(after, nulls).subquery())
+        return (
+            select(page)
+            .order_by(page.due_date.asc().nulls_last(), page.id.asc())
+            .limit(limit + 1)
+        )
+
+    '''
+        할 일 검색 (관련도순 keyset 페이지네이션)
+        - 제목/설명 전문 검색(search_vector @@ websearch_to_tsquery) 또는 제목 trigram 단어 유사도(q <% title)로 매칭
+          -> 오타가 있거나 단어 앞부분만 입력해도 제목으로 찾을 수 있음
+        - 관련도 = ts_rank_cd + word_similarity, (관련도, id) 내림차순
+        - 두 조건 모두 (user_id, ...) GIN 인덱스로 찾으므로 다른 사용자의 행은 읽지 않음
+    '''
+    async def search_todos(
+        self,
+        db : AsyncSession,
+        user_id : int,
+        q : str,
+        limit : int = 20,
+        cursor : str | None = None
+    ) -> tuple[list[Todos], str | None] :
+
+        query = self.build_search_query(user_id = user_id, q = q, limit = limit, cursor = cursor)
+        rows = (await db.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit :
+            rows = rows[:limit]
+            last, rank = rows[-1]
+            next_cursor = encode_cursor({"rank" : rank, "id" : last.id})
+
+        return [todo for todo, _ in rows], next_cursor
+
+    # 검색 SELECT 문 생성 (limit + 1), (Todos, rank) 행을 반환
+    def build_search_query(self, user_id : int, q : str, limit : int = 20, cursor : str | None = None) -> Select :
+        # 생성 컬럼과 같은 설정을 써야 인덱스의 tsvector 와 비교 가능 (문자열 파라미터는 regconfig 로 변환되지 않음)
+        tsquery = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+        rank = func.ts_rank_cd(Todos.search_vector, tsquery) + func.word_similarity(q, Todos.title)
+
+        query = (
+            select(Todos, rank.label("rank"))
+            .filter(
+                Todos.user_id == user_id,
+                or_(
+                    Todos.search_vector.bool_op("@@")(tsquery),
+                    literal(q).bool_op("<%")(Todos.title)
+                )
+            )
+        )
+        if cursor is not None :
+            query = query.filter(self._ranked_before(rank, decode_cursor(cursor)))
+
+        return query.order_by(rank.desc(), Todos.id.desc()).limit(limit + 1)
+
+    # (rank, id) < (커서 값)
+    @staticmethod
+    def _ranked_before(rank, values : dict) :
+        try :
+            last_rank = float(values["rank"])
+            last_id = int(values["id"])
+        except (KeyError, TypeError, ValueError) as e :
+            raise InvalidCursorError() from e
+
+        return tuple_(rank, Todos.id) < (last_rank, last_id)
+
+    '''
+        변경분 동기화 : 커서 이후에 생성/수정된 할 일과 삭제된 할 일 id
+        - 변경 : (updated_at, id) 순, 삭제 : 삭제 기록의 (deleted_at, id) 순으로 각각 커서 이후 limit 개까지 (keyset)
+        - updated_at / deleted_at 은 트랜잭션 시작 시각 -> 조회 시점에 진행중이던 트랜잭션이 커서보다 이전 시각으로 나중에 커밋될 수 있음
+          끝까지 읽은 쪽의 다음 커서는 (조회 시각 - overlap) 보다 뒤로 가지 않게 해서 그 구간을 다음 동기화 때 다시 읽음
+          (다시 받은 행은 클라이언트가 id 로 덮어씀, 변경이 없는 동안에는 커서가 마지막 행에 머무름)
+        - 커서가 없으면 처음 동기화 : 전체 할 일 + 지금부터의 삭제
+        - 커서가 삭제 기록 보관 기간보다 오래되었으면 ChangeCursorExpired (그 사이 삭제 기록이 지워졌을 수 있음)
+        - (변경된 할 일, 삭제된 id, 다음 커서, 더 있는지) 반환
+    '''
+    async def list_changes(
+        self,
+        db : AsyncSession,
+        user_id : int,
+        cursor : str | None = None,
+        limit : int = 100
+    ) -> tuple[list[Todos], list[int], str, bool] :
+
+        now = (await db.execute(select(func.localtimestamp()))).scalar()
+        settled = (now - timedelta(seconds=settings.todo_changes_overlap), 0)
+
+        if cursor is None :
+            changed_after, deleted_after = None, settled
+        else :
+            changed_after, deleted_after = self._change_positions(decode_cursor(cursor))
+            if deleted_after[0] < now - timedelta(seconds=settings.todo_tombstone_retention) :
+                raise ChangeCursorExpired()
+
+        changed_query = select(Todos).filter(Todos.user_id == user_id)
+        if changed_after is not None :
+            changed_query = changed_query.filter(tuple_(Todos.updated_at, Todos.id) > changed_after)
+        changed = list((await db.scalars(
+            changed_query.order_by(Todos.updated_at.asc(), Todos.id.asc()).limit(limit + 1)
+        )).all())
+
+        tombstones = (await db.execute(
+            select(TodoTombstone.id, TodoTombstone.todo_id, TodoTombstone.deleted_at)
+            .filter(TodoTombstone.user_id == user_id, tuple_(TodoTombstone.deleted_at, TodoTombstone.id) > deleted_after)
+            .order_by(TodoTombstone.deleted_at.asc(), TodoTombstone.id.asc())
+            .limit(limit + 1)
+        )).all()
+
+        changed_more = len(changed) > limit
+        deleted_more = len(tombstones) > limit
+        changed, tombstones = changed[:limit], tombstones[:limit]
+
+        if changed :
+            changed_after = (changed[-1].updated_at, changed[-1].id)
+        if tombstones :
+            deleted_after = (tombstones[-1].deleted_at, tombstones[-1].id)
+        if not changed_more and changed_after is not None :
+            changed_after = min(changed_after, settled)
+        if not deleted_more :
+            deleted_after = min(deleted_after, settled)
+
+        next_cursor = encode_cursor({"changed" : changed_after, "deleted" : deleted_after})
+        return changed, [tombstone.todo_id for tombstone in tombstones], next_cursor, changed_more or deleted_more
+
+    # 커서 -> (변경 위치, 삭제 위치), 변경 위치가 null 이면 아직 처음 동기화 중 (할 일이 없음)
+    @staticmethod
+    def _change_positions(values : dict) -> tuple[tuple[datetime, int] | None, tuple[datetime, int]] :
+        try :
+            changed = values["changed"]
+            changed = None if changed is None else (datetime.fromisoformat(changed[0]), int(changed[1]))
+            deleted = (datetime.fromisoformat(values["deleted"][0]), int(values["deleted"][1]))
+        except (KeyError, IndexError, TypeError, ValueError) as e :
+            raise InvalidCursorError() from e
+
+        return changed, deleted
+
+    '''
+        보관 기간이 지난 삭제 기록을 최대 batch_size 개만 삭제 (유지보수 작업)
+        - 삭제한 행 수를 반환 -> 0이 될 때까지 호출하는 쪽에서 반복
+    '''
+    async def purge_tombstones(self, db : AsyncSession, batch_size : int) -> int :
+        expired_ids = (
+            select(TodoTombstone.id)
+            .where(TodoTombstone.deleted_at < func.localtimestamp() - timedelta(seconds=settings.todo_tombstone_retention))
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        query = (
+            delete(TodoTombstone)
+            .where(TodoTombstone.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        return result.rowcount
+
+'''
+    keyset 페이지네이션
+    - OFFSET 방식은 앞쪽 행을 모두 읽고 버리기 때문에 뒤 페이지로 갈수록 느려짐
+    - 마지막으로 본 행의 정렬 키를 기준으로 WHERE 조건을 걸면 인덱스에서 바로 다음 행부터 읽을 수 있음
+'''
@@ -0,0 +1,207 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import and_, or_, false, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from app.models import todo as todo_model
+from app.models import user as user_model
+from app.models.todo_stats import TodoStats, TodoDueStats
+from app.core.metrics import registry
+
+Todos = todo_model.Todos
+Users = user_model.Users
+
+logger = logging.getLogger(__name__)
+
+TODO_STATS_DRIFT = registry.counter(
+    "todo_stats_drift_total", "정합성 점검에서 바로잡은 할 일 통계 행 수", ["table"]
+)
+
+_PRIORITIES = ("low", "medium", "high")
+
+# user_id 가 (after_user_id, until_user_id] 범위, None 이면 그쪽 끝 제한 없음
+def _user_range(column, after_user_id : int | None, until_user_id : int | None) :
+    conditions = []
+    if after_user_id is not None :
+        conditions.append(column > after_user_id)
+    if until_user_id is not None :
+        conditions.append(column <= until_user_id)
+    return and_(column.is_not(None), *conditions)
+
+# 사용자별 할 일 통계 (app/migrations/versions/v0006_todo_stats.py 의 트리거가 증감하는 테이블을 읽고 점검)
+class Todo_stats_service() :
+
+    '''
+        사용자 할 일 통계 (통계 테이블만 읽음 -> 할 일 수와 무관하게 사용자당 몇 행)
+        - 기한 지남 : 미완료이고 due_date 가 오늘(DB 기준)보다 이전
+    '''
+    async def get_stats(self, db : AsyncSession, user_id : int) -> dict :
+        counts = (await db.execute(
+            select(TodoStats.priority, TodoStats.open_count, TodoStats.completed_count)
+            .where(TodoStats.user_id == user_id)
+        )).all()
+        overdue = (await db.execute(
+            select(TodoDueStats.priority, func.sum(TodoDueStats.open_count))
+            .where(TodoDueStats.user_id == user_id, TodoDueStats.due_date < func.current_date())
+            .group_by(TodoDueStats.priority)
+        )).all()
+
+        by_priority = {priority : {"open" : 0, "completed" : 0, "overdue" : 0} for priority in _PRIORITIES}
+        for priority, open_count, completed_count in counts :
+            stats = by_priority.setdefault(priority, {"open" : 0, "completed" : 0, "overdue" : 0})
+            stats["open"] = open_count
+            stats["completed"] = completed_count
+        for priority, overdue_count in overdue :
+            by_priority.setdefault(priority, {"open" : 0, "completed" : 0, "overdue" : 0})["overdue"] = int(overdue_count)
+
+        return {
+            "open" : sum(stats["open"] for stats in by_priority.values()),
+            "completed" : sum(stats["completed"] for stats in by_priority.values()),
+            "overdue" : sum(stats["overdue"] for stats in by_priority.values()),
+            "by_priority" : by_priority,
+        }
+
+    '''
+        정합성 점검을 나눠서 돌릴 다음 사용자 경계 (after_user_id 다음 batch_size 번째 사용자 id)
+        - 남은 사용자가 batch_size 보다 적으면 None (끝까지)
+    '''
+    async def next_user_boundary(self, db : AsyncSession, after_user_id : int | None, batch_size : int) -> int | None :
+        query = select(Users.id).order_by(Users.id).offset(batch_size - 1).limit(1)
+        if after_user_id is not None :
+            query = query.where(Users.id > after_user_id)
+        return (await db.execute(query)).scalar()
+
+    '''
+        통계 정합성 점검 : user_id 가 (after_user_id, until_user_id] 인 사용자의 통계를 todos 에서 다시 집계해서 비교
+        - 집계와 비교를 한 문장(같은 스냅샷)에서 하고 차이만큼 증감
+          -> 트리거 증감은 todos 와 같이 커밋되므로 스냅샷 안에서는 항상 맞아야 하고, 동시에 커밋되는 증감을 덮어쓰지 않음
+        - 0이 된 행(완료/삭제된 기한, 삭제된 사용자)은 정리
+        - 바로잡은 행 수를 반환
+    '''
+    async def reconcile(self, db : AsyncSession, after_user_id : int | None, until_user_id : int | None) -> int :
+        stats_drift = await self._reconcile_counts(db, after_user_id, until_user_id)
+        due_drift = await self._reconcile_due_counts(db, after_user_id, until_user_id)
+
+        await db.execute(
+            delete(TodoStats)
+            .where(
+                _user_range(TodoStats.user_id, after_user_id, until_user_id),
+                TodoStats.open_count == 0,
+                TodoStats.completed_count == 0
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(TodoDueStats)
+            .where(_user_range(TodoDueStats.user_id, after_user_id, until_user_id), TodoDueStats.open_count == 0)
+            .execution_options(synchronize_session=False)
+        )
+
+        if stats_drift or due_drift :
+            TODO_STATS_DRIFT.inc(stats_drift, table="todo_stats")
+            TODO_STATS_DRIFT.inc(due_drift, table="todo_due_stats")
+            logger.warning(
+                "todo stats drift corrected",
+                extra={
+                    "after_user_id" : after_user_id, "until_user_id" : until_user_id,
+                    "todo_stats" : stats_drift, "todo_due_stats" : due_drift
+                }
+            )
+        return stats_drift + due_drift
+
+    async def _reconcile_counts(self, db : AsyncSession, after_user_id : int | None, until_user_id : int | None) -> int :
+        is_completed = func.coalesce(Todos.is_completed, false())
+        priority = func.coalesce(Todos.priority, "medium")
+        expected = (
+            select(
+                Todos.user_id.label("user_id"),
+                priority.label("priority"),
+                func.count().filter(~is_completed).label("open_count"),
+                func.count().filter(is_completed).label("completed_count")
+            )
+            .where(_user_range(Todos.user_id, after_user_id, until_user_id))
+            .group_by(Todos.user_id, priority)
+            .subquery()
+        )
+        actual = (
+            select(TodoStats.user_id, TodoStats.priority, TodoStats.open_count, TodoStats.completed_count)
+            .where(_user_range(TodoStats.user_id, after_user_id, until_user_id))
+            .subquery()
+        )
+
+        user_id = func.coalesce(expected.c.user_id, actual.c.user_id)
+        priority = func.coalesce(expected.c.priority, actual.c.priority)
+        open_diff = func.coalesce(expected.c.open_count, 0) - func.coalesce(actual.c.open_count, 0)
+        completed_diff = func.coalesce(expected.c.completed_count, 0) - func.coalesce(actual.c.completed_count, 0)
+        drift = (
+            select(user_id, priority, open_diff, completed_diff)
+            .select_from(expected.join(
+                actual,
+                and_(expected.c.user_id == actual.c.user_id, expected.c.priority == actual.c.priority),
+                full=True
+            ))
+            .where(or_(open_diff != 0, completed_diff != 0))
+            .order_by(user_id, priority)
+        )
+
+        query = insert(TodoStats).from_select(["user_id", "priority", "open_count", "completed_count"], drift)
+        query = query.on_conflict_do_update(
+            index_elements=[TodoStats.user_id, TodoStats.priority],
+            set_={
+                "open_count" : TodoStats.open_count + query.excluded.open_count,
+                "completed_count" : TodoStats.completed_count + query.excluded.completed_count,
+            }
+        )
+        result = await db.execute(query)
+        return result.rowcount
+
+    async def _reconcile_due_counts(self, db : AsyncSession, after_user_id : int | None, until_user_id : int | None) -> int :
+        priority = func.coalesce(Todos.priority, "medium")
+        expected = (
+            select(
+                Todos.user_id.label("user_id"),
+                priority.label("priority"),
+                Todos.due_date.label("due_date"),
+                func.count().label("open_count")
+            )
+            .where(
+                _user_range(Todos.user_id, after_user_id, until_user_id),
+                ~func.coalesce(Todos.is_completed, false()),
+                Todos.due_date.is_not(None)
+            )
+            .group_by(Todos.user_id, priority, Todos.due_date)
+            .subquery()
+        )
+        actual = (
+            select(TodoDueStats.user_id, TodoDueStats.priority, TodoDueStats.due_date, TodoDueStats.open_count)
+            .where(_user_range(TodoDueStats.user_id, after_user_id, until_user_id))
+            .subquery()
+        )
+
+        user_id = func.coalesce(expected.c.user_id, actual.c.user_id)
+        priority = func.coalesce(expected.c.priority, actual.c.priority)
+        due_date = func.coalesce(expected.c.due_date, actual.c.due_date)
+        open_diff = func.coalesce(expected.c.open_count, 0) - func.coalesce(actual.c.open_count, 0)
+        drift = (
+            select(user_id, priority, due_date, open_diff)
+            .select_from(expected.join(
+                actual,
+                and_(
+                    expected.c.user_id == actual.c.user_id,
+                    expected.c.priority == actual.c.priority,
+                    expected.c.due_date == actual.c.due_date
+                ),
+                full=True
+            ))
+            .where(open_diff != 0)
+            .order_by(user_id, priority, due_date)
+        )
+
+        query = insert(TodoDueStats).from_select(["user_id", "priority", "due_date", "open_count"], drift)
+        query = query.on_conflict_do_update(
+            index_elements=[TodoDueStats.user_id, TodoDueStats.priority, TodoDueStats.due_date],
+            set_={"open_count" : TodoDueStats.open_count + query.excluded.open_count}
+        )
+        result = await db.execute(query)
+        return result.rowcount
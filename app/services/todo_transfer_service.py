@@ -0,0 +1,318 @@
+'''
+할 일 내보내기 / 가져오기 (행 수와 무관하게 일정한 메모리)
+    - 내보내기 : 서버 측 커서(stream + yield_per)로 TODO_EXPORT_CHUNK_ROWS 행씩 읽어서 NDJSON / CSV 로 바로 응답
+      ORM 객체가 아닌 컬럼만 조회 -> identity map 에 쌓이지 않음
+    - 가져오기 : 요청 본문을 줄 단위로 읽으면서 TodoImport(TodoCreate) 로 검증하고
+      asyncpg COPY 로 임시 스테이징 테이블에 넣은 뒤 INSERT ... SELECT 한번으로 todos 에 추가
+      -> 한 줄이라도 틀리면 전체 롤백, todos 트리거(통계/변경 기록)는 문장당 한번만 실행
+      COPY 하는 동안 커넥션을 잡고 있으므로 첫 행을 검증한 뒤에 커넥션을 꺼내고,
+      본문 청크 사이에 TODO_IMPORT_READ_TIMEOUT_SECONDS 넘게 멈추면 ImportReadTimeout 으로 중단
+'''
+import asyncio
+import codecs
+import csv
+import io
+import json
+from collections import deque
+from typing import AsyncIterator, Literal
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+from sqlalchemy import Table, Column, MetaData, Integer, String, Boolean, DATE, insert, literal
+from sqlalchemy.schema import CreateTable
+from app.schemas import todo as todo_schema
+from app.models import todo as todo_model
+from app.core.config import settings
+from app.core.responses import dump_json
+from app.core.realtime import publish_change
+from app import InvalidImportRow, ImportTooLarge, ImportReadTimeout
+
+Todos = todo_model.Todos
+
+ExportFormat = Literal["ndjson", "csv"]
+
+_EXPORT_COLUMNS = [
+    Todos.id, Todos.user_id, Todos.title, Todos.description, Todos.is_completed,
+    Todos.priority, Todos.due_date, Todos.created_at, Todos.updated_at
+]
+_CSV_HEADER = ["id", "title", "description", "priority", "due_date", "is_completed", "created_at", "updated_at"]
+
+# 가져오기 스테이징 테이블 (트랜잭션이 끝나면 삭제, Base.metadata 와 별도라 create_all 대상이 아님)
+_staging = Table(
+    "todo_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", String),
+    Column("priority", String, nullable=False),
+    Column("due_date", DATE),
+    Column("is_completed", Boolean, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+_STAGING_COLUMNS = ["line", "title", "description", "priority", "due_date", "is_completed"]
+
+
+def _csv_value(value) -> str :
+    if value is None :
+        return ""
+    if isinstance(value, bool) :
+        return "true" if value else "false"
+    if hasattr(value, "isoformat") :
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows, header : bool = False) -> bytes :
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header :
+        writer.writerow(_CSV_HEADER)
+    for row in rows :
+        writer.writerow([_csv_value(getattr(row, name)) for name in _CSV_HEADER])
+    return buffer.getvalue().encode("utf-8")
+
+
+# 다음 청크가 timeout 초 안에 들어오지 않으면 ImportReadTimeout (느리거나 멈춘 클라이언트가 커넥션을 붙잡지 않도록)
+async def _read_with_timeout(chunks : AsyncIterator[bytes], timeout : float) -> AsyncIterator[bytes] :
+    iterator = aiter(chunks)
+    while True :
+        try :
+            chunk = await asyncio.wait_for(anext(iterator), timeout)
+        except StopAsyncIteration :
+            return
+        except TimeoutError as e :
+            raise ImportReadTimeout(f"No data for {timeout} seconds.") from e
+        yield chunk
+
+
+async def _prepend(first : tuple, records : AsyncIterator[tuple]) -> AsyncIterator[tuple] :
+    yield first
+    async for record in records :
+        yield record
+
+
+'''
+    요청 본문 bytes 청크 -> (줄 번호, 줄) (줄바꿈 제외)
+    - 디코딩 전의 bytes 로 나누고 길이를 잼 (UTF-8 의 여러 바이트 문자에는 0x0A 가 들어가지 않음)
+    - 한 줄이 TODO_IMPORT_MAX_LINE_BYTES 를 넘으면 ImportTooLarge
+'''
+async def _lines(chunks : AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]] :
+    limit = settings.todo_import_max_line_bytes
+    pending = b""
+    number = 0
+
+    def decode(line : bytes) -> str :
+        if number == 1 :
+            line = line.removeprefix(codecs.BOM_UTF8)
+        try :
+            return line.decode("utf-8").removesuffix("\r")
+        except UnicodeDecodeError as e :
+            raise InvalidImportRow(number, "UTF-8 로 인코딩되지 않았습니다.") from e
+
+    async for chunk in chunks :
+        *complete, pending = (pending + chunk).split(b"\n")
+        for line in complete :
+            number += 1
+            if len(line) > limit :
+                raise ImportTooLarge(f"Line {number} is longer than {limit} bytes.")
+            yield number, decode(line)
+        if len(pending) > limit :
+            raise ImportTooLarge(f"Line {number + 1} is longer than {limit} bytes.")
+
+    if pending.strip() :
+        number += 1
+        yield number, decode(pending)
+
+
+async def _ndjson_rows(lines : AsyncIterator[tuple[int, str]]) -> AsyncIterator[tuple[int, dict]] :
+    async for number, line in lines :
+        if not line.strip() :
+            continue
+        try :
+            row = json.loads(line)
+        except json.JSONDecodeError as e :
+            raise InvalidImportRow(number, f"JSON 형식이 아닙니다. ({e.msg})") from e
+        if not isinstance(row, dict) :
+            raise InvalidImportRow(number, "JSON 객체가 아닙니다.")
+        yield number, row
+
+
+class _NeedMoreLines(Exception) :
+    pass
+
+
+# csv.reader 에 넘기는 줄 공급기 : 비었으면 _NeedMoreLines (본문을 더 읽은 뒤 이번 레코드를 처음부터 다시 읽음)
+class _LineFeed :
+    def __init__(self) :
+        self.pending : deque[tuple[int, str]] = deque()
+        self.consumed : list[tuple[int, str]] = []
+        self.finished = False
+
+    def __iter__(self) :
+        return self
+
+    def __next__(self) -> str :
+        if not self.pending :
+            if self.finished :
+                raise StopIteration
+            raise _NeedMoreLines()
+        item = self.pending.popleft()
+        self.consumed.append(item)
+        return item[1] + "\n"
+
+    # 다 읽지 못한 레코드의 줄을 되돌림 (따옴표가 닫히지 않은 레코드도 한 줄과 같은 길이 제한)
+    def rewind(self) -> None :
+        size = sum(len(line.encode("utf-8")) + 1 for _, line in self.consumed)
+        if size > settings.todo_import_max_line_bytes :
+            raise ImportTooLarge(f"Record at line {self.consumed[0][0]} is longer than {settings.todo_import_max_line_bytes} bytes.")
+        self.pending.extendleft(reversed(self.consumed))
+        self.consumed = []
+
+    # 방금 읽은 레코드의 시작 줄 번호
+    def take(self) -> int :
+        start = self.consumed[0][0]
+        self.consumed = []
+        return start
+
+
+'''
+    CSV (첫 줄은 헤더) -> (시작 줄 번호, {컬럼 : 값})
+    - 하나의 csv.reader(strict) 로 읽음 -> 따옴표 안의 줄바꿈은 한 레코드, 따옴표로 시작하지 않은 값 안의 " 는 그대로
+    - 빈 값은 없는 값으로 보고 기본값 적용
+'''
+async def _csv_rows(lines : AsyncIterator[tuple[int, str]]) -> AsyncIterator[tuple[int, dict]] :
+    feed = _LineFeed()
+    reader = csv.reader(feed, strict=True)
+    header = None
+
+    def parse() -> tuple[int, list[str]] | None :
+        try :
+            values = next(reader)
+        except _NeedMoreLines :
+            feed.rewind()
+            return None
+        except csv.Error as e :
+            start = feed.consumed[0][0] if feed.consumed else 1
+            if feed.finished and str(e) == "unexpected end of data" :
+                raise InvalidImportRow(start, "따옴표가 닫히지 않았습니다.") from e
+            raise InvalidImportRow(start, f"CSV 형식이 아닙니다. ({e})") from e
+        return feed.take(), values
+
+    async def records() -> AsyncIterator[tuple[int, list[str]]] :
+        async for item in lines :
+            feed.pending.append(item)
+            while (record := parse()) is not None :
+                yield record
+        feed.finished = True
+        while True :
+            try :
+                record = parse()
+            except StopIteration :
+                return
+            yield record
+
+    async for start, values in records() :
+        if not values :
+            continue
+        if header is None :
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header) :
+            raise InvalidImportRow(start, "컬럼 수가 헤더보다 많습니다.")
+        yield start, {name : value for name, value in zip(header, values) if value != ""}
+
+
+# 할 일 내보내기 / 가져오기 비즈니스 로직
+class Todo_transfer_service() :
+
+    '''
+        사용자의 모든 할 일을 id 순으로 NDJSON(한 줄에 할 일 하나) / CSV(헤더 포함) bytes 청크로
+        - 응답이 끝날 때까지 쓰도록 세션을 직접 열고 닫음 (요청 의존성 세션은 스트리밍 전에 끝남)
+    '''
+    async def export_todos(
+        self,
+        session_factory : async_sessionmaker,
+        user_id : int,
+        format : ExportFormat = "ndjson"
+    ) -> AsyncIterator[bytes] :
+
+        if format == "csv" :
+            yield _csv_chunk([], header=True)
+
+        async with session_factory() as db :
+            result = await db.stream(
+                select(*_EXPORT_COLUMNS)
+                .where(Todos.user_id == user_id)
+                .order_by(Todos.id)
+                .execution_options(yield_per=settings.todo_export_chunk_rows)
+            )
+            async for rows in result.partitions() :
+                if format == "csv" :
+                    yield _csv_chunk(rows)
+                else :
+                    yield b"".join(dump_json(todo_schema.Todo, row) + b"\n" for row in rows)
+
+    '''
+        할 일 가져오기 (커밋은 호출하는 쪽(router)에서 수행)
+        - 줄마다 TodoImport 로 검증, 틀린 줄이 있으면 InvalidImportRow (줄 번호 포함)
+        - TODO_IMPORT_MAX_ROWS 를 넘으면 ImportTooLarge
+        - 청크 사이에 TODO_IMPORT_READ_TIMEOUT_SECONDS 넘게 멈추면 ImportReadTimeout
+        - 파일 순서대로 추가하고 추가한 개수를 반환
+    '''
+    async def import_todos(
+        self,
+        db : AsyncSession,
+        user_id : int,
+        chunks : AsyncIterator[bytes],
+        format : ExportFormat = "ndjson"
+    ) -> int :
+
+        records = self._records(_read_with_timeout(chunks, settings.todo_import_read_timeout), format)
+        # 첫 행을 받아서 검증할 때까지는 커넥션을 꺼내지 않음
+        first = await anext(records, None)
+        if first is None :
+            return 0
+
+        connection = await db.connection()
+        await connection.execute(CreateTable(_staging))
+
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _staging.name,
+            records=_prepend(first, records),
+            columns=_STAGING_COLUMNS
+        )
+
+        query = insert(Todos).from_select(
+            ["user_id", "title", "description", "priority", "due_date", "is_completed"],
+            select(
+                literal(user_id), _staging.c.title, _staging.c.description,
+                _staging.c.priority, _staging.c.due_date, _staging.c.is_completed
+            ).order_by(_staging.c.line)
+        )
+        imported = (await db.execute(query)).rowcount
+
+        # 추가된 id 를 모두 보내지 않고 "많이 추가됨" 으로 알림
+        if imported :
+            await publish_change(db, user_id, "created", None)
+        return imported
+
+    # 검증된 행을 COPY 레코드(스테이징 컬럼 순서의 tuple)로
+    async def _records(self, chunks : AsyncIterator[bytes], format : ExportFormat) -> AsyncIterator[tuple] :
+        rows = _csv_rows(_lines(chunks)) if format == "csv" else _ndjson_rows(_lines(chunks))
+        count = 0
+
+        async for number, row in rows :
+            count += 1
+            if count > settings.todo_import_max_rows :
+                raise ImportTooLarge(f"More than {settings.todo_import_max_rows} rows.")
+            try :
+                todo = todo_schema.TodoImport.model_validate(row)
+            except ValidationError as e :
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"])
+                raise InvalidImportRow(number, f"{field} : {error['msg']}") from e
+
+            yield (number, todo.title, todo.description, todo.priority, todo.due_date, todo.is_completed)
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update, delete
+from app.models import user as user_model
+from app.models import refresh_token as refresh_token_model
+from app.core.config import settings
+from app.core.security import create_access_token, create_refresh_token, decode_refresh_token, hash_token
+from app.core.revocation import revocation_list
+from app import InvalidRefreshToken, RefreshTokenReused
+
+RefreshToken = refresh_token_model.RefreshToken
+
+# DB 컬럼(TIMESTAMP WITHOUT TIME ZONE)과 맞추기 위해 tzinfo가 없는 UTC 시각 사용
+def _utcnow() -> datetime :
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# 리프레시 토큰 발급/회전/정리 비즈니스 로직
+class Token_service() :
+
+    '''
+        access + refresh 토큰 발급
+        - refresh 토큰은 원문이 아닌 해시만 저장
+        - 커밋은 호출하는 쪽(router)에서 수행
+    '''
+    async def issue_tokens(self, db : AsyncSession, user : user_model.Users) -> dict :
+        access_token = create_access_token(user.email, user.username, user.id, user.is_active)
+        refresh_token = create_refresh_token(user.email, user.username)
+
+        db.add(RefreshToken(
+            user_id = user.id,
+            refresh_token = hash_token(refresh_token["refresh_token"]),
+            expires_at = _utcnow() + timedelta(seconds=refresh_token["expire_time"]),
+            is_revoked = False
+        ))
+        await db.flush()
+
+        return {
+            "access" : access_token,
+            "refresh" : refresh_token
+        }
+
+    '''
+        리프레시 토큰 회전
+        - 사용한 토큰은 즉시 무효화하고 새 토큰 쌍을 발급
+        - 이미 무효화된 토큰이 다시 들어오면 탈취로 보고 해당 사용자의 모든 토큰을 무효화 (RefreshTokenReused)
+          -> 무효화 내용이 반영되도록 호출하는 쪽에서 예외를 받은 뒤에도 커밋해야 함
+        - 서명/만료 오류는 jwt.InvalidTokenError 그대로 전달
+    '''
+    async def rotate(self, db : AsyncSession, token : str) -> dict :
+        decode_refresh_token(token)
+
+        # 동시에 같은 토큰으로 회전하는 요청을 직렬화하기 위해 행 잠금
+        query = (
+            select(RefreshToken)
+            .filter(RefreshToken.refresh_token == hash_token(token))
+            .with_for_update()
+        )
+        result = await db.execute(query)
+        stored = result.scalar()
+
+        if stored is None :
+            raise InvalidRefreshToken()
+
+        if stored.is_revoked :
+            await self.revoke_all(db, stored.user_id)
+            raise RefreshTokenReused(stored.user_id)
+
+        if stored.expires_at <= _utcnow() :
+            raise InvalidRefreshToken()
+
+        query = select(user_model.Users).filter(user_model.Users.id == stored.user_id)
+        result = await db.execute(query)
+        db_user = result.scalar()
+
+        if db_user is None or not db_user.is_active :
+            raise InvalidRefreshToken()
+
+        stored.is_revoked = True
+        return await self.issue_tokens(db, db_user)
+
+    # 사용자의 아직 유효한 리프레시 토큰을 모두 무효화 (user_id, is_revoked, expires_at 인덱스 사용)
+    # 이미 발급된 access token 도 폐기 목록에 추가
+    async def revoke_all(self, db : AsyncSession, user_id : int) -> int :
+        revocation_list.revoke_user(user_id)
+        query = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked.is_(False),
+                RefreshToken.expires_at > _utcnow()
+            )
+            .values(is_revoked=True)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        return result.rowcount
+
+    '''
+        만료된 리프레시 토큰을 최대 batch_size 개만 삭제 (한번에 긴 락을 잡지 않도록)
+        - 삭제한 행 수를 반환 -> 0이 될 때까지 호출하는 쪽에서 반복
+    '''
+    async def purge_expired(self, db : AsyncSession, batch_size : int) -> int :
+        expired_ids = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < _utcnow())
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        query = (
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        return result.rowcount
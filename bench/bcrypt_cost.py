@@ -0,0 +1,54 @@
+'''
+bcrypt 비용(work factor)별 해싱 시간 측정 (DB 없이 실행 가능)
+    - 배포할 서버에서 실행해서 BCRYPT_ROUNDS 를 결정
+    - 목표 시간(--target-ms, 기본 250ms) 안에 들어오는 가장 큰 비용을 추천
+    - 동시에 처리할 수 있는 로그인 수 ≒ HASH_POOL_WORKERS / (해싱 시간) 도 함께 출력
+
+    실행 : python -m bench.bcrypt_cost [--min-rounds 10] [--max-rounds 14] [--iterations 5] [--target-ms 250]
+'''
+import argparse
+
+from bench.common import write_results, print_table
+from bench.micro import measure
+from app.core import security
+from app.core.config import settings
+
+
+def run(min_rounds : int, max_rounds : int, iterations : int) -> dict :
+    results = {}
+    for rounds in range(min_rounds, max_rounds + 1) :
+        results[f"rounds={rounds}"] = measure(lambda : security.pwd_hashing("bench-password", rounds), iterations, warmup=1)
+    return results
+
+
+def recommend(results : dict, target_ms : float) -> int | None :
+    within = [int(name.split("=")[1]) for name, row in results.items() if row["p50_ms"] <= target_ms]
+    return max(within) if within else None
+
+
+def main() -> None :
+    parser = argparse.ArgumentParser(description="bcrypt 비용별 해싱 시간")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.min_rounds, args.max_rounds, args.iterations)
+    print_table(results)
+
+    rounds = recommend(results, args.target_ms)
+    if rounds is None :
+        print(f"{args.target_ms}ms 안에 들어오는 비용이 없습니다. --min-rounds 를 낮춰보세요.")
+    else :
+        p50 = results[f"rounds={rounds}"]["p50_ms"]
+        print(f"추천 BCRYPT_ROUNDS={rounds} (p50 {p50}ms, 현재 설정 {settings.bcrypt_rounds})")
+        print(f"워커 {settings.hash_pool_workers}개 기준 초당 최대 로그인 ≒ {settings.hash_pool_workers * 1000 / p50:.1f}")
+
+    path = write_results("bcrypt_cost", vars(args), results, args.output)
+    print(f"결과 저장 : {path}")
+
+
+if __name__ == "__main__" :
+    main()
@@ -0,0 +1,73 @@
+'''
+벤치마크 공통 유틸
+    - 지연시간 목록 -> p50/p95/p99, 평균, 처리량(RPS) 계산
+    - 결과를 bench/results/<이름>-<커밋>.json 으로 저장해서 커밋 간 비교 (bench/compare.py)
+'''
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values : list[float], q : float) -> float :
+    if not sorted_values :
+        return 0.0
+    # nearest-rank 방식
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies : list[float], elapsed : float, errors : int = 0) -> dict :
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count" : count,
+        "errors" : errors,
+        "rps" : round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms" : round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms" : round(percentile(values, 50) * 1000, 3),
+        "p95_ms" : round(percentile(values, 95) * 1000, 3),
+        "p99_ms" : round(percentile(values, 99) * 1000, 3),
+        "max_ms" : round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def git_commit() -> str :
+    try :
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError) :
+        return "unknown"
+
+
+def write_results(name : str, config : dict, results : dict, output : str | None = None) -> Path :
+    commit = git_commit()
+    payload = {
+        "benchmark" : name,
+        "commit" : commit,
+        "created_at" : datetime.now(timezone.utc).isoformat(),
+        "python" : platform.python_version(),
+        "machine" : platform.machine(),
+        "config" : config,
+        "results" : results,
+    }
+
+    path = Path(output) if output else RESULTS_DIR / f"{name}-{commit}-{int(time.time())}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def print_table(results : dict) -> None :
+    print(f"{'name':<28} {'count':>7} {'err':>5} {'rps':>10} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+    for name, row in results.items() :
+        print(
+            f"{name:<28} {row['count']:>7} {row['errors']:>5} {row['rps']:>10} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+        )
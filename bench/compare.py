@@ -0,0 +1,44 @@
+'''
+두 벤치마크 결과(JSON)를 비교
+    - 같은 이름의 항목끼리 rps, p50/p95/p99 변화율을 출력
+    - 실행 : python -m bench.compare <기준.json> <비교.json>
+'''
+import argparse
+import json
+from pathlib import Path
+
+FIELDS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _load(path : str) -> dict :
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _delta(before : float, after : float) -> str :
+    if not before :
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(base : dict, head : dict) -> None :
+    print(f"{base['benchmark']} : {base['commit']} -> {head['commit']}")
+    print(f"{'name':<28} " + " ".join(f"{field:>30}" for field in FIELDS))
+
+    for name, before in base["results"].items() :
+        after = head["results"].get(name)
+        if after is None :
+            continue
+        cells = [f"{before[field]} -> {after[field]} ({_delta(before[field], after[field])})" for field in FIELDS]
+        print(f"{name:<28} " + " ".join(f"{cell:>30}" for cell in cells))
+
+
+def main() -> None :
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    args = parser.parse_args()
+    compare(_load(args.base), _load(args.head))
+
+
+if __name__ == "__main__" :
+    main()
@@ -0,0 +1,155 @@
+'''
+엔드포인트 부하 테스트
+    - 기본 : 앱을 프로세스 안에서 실행 (httpx.ASGITransport) -> .env 의 Postgres 사용 (마이그레이션 적용 필요)
+    - --url : 이미 떠 있는 서버로 요청 (uvicorn/gunicorn 워커 설정까지 포함해서 측정)
+    - 시나리오별로 concurrency 개의 작업자가 duration 초 동안 요청을 반복, p50/p95/p99 와 RPS 를 기록
+    - 작업자마다 별도 사용자로 가입/로그인해서 쿠키를 사용
+
+    실행 : python -m bench.load [--url http://localhost:8000] [--concurrency 32] [--duration 10]
+                                 [--scenarios sign-up,login,me,todo-create,todo-list] [--output path.json]
+    필요 패키지 : httpx (uv sync --group bench)
+'''
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable
+
+try :
+    import httpx
+except ImportError as e :
+    raise SystemExit("httpx 가 필요합니다 : uv sync --group bench") from e
+
+from bench.common import summarize, write_results, print_table
+
+PASSWORD = "bench-password"
+
+Operation = Callable[["Worker"], Awaitable["httpx.Response"]]
+
+
+class Worker :
+    def __init__(self, client : "httpx.AsyncClient", run_id : str, index : int) :
+        self.client = client
+        self.email = f"bench-{run_id}-{index}@example.com"
+        self.run_id = run_id
+        self.index = index
+        self.counter = 0
+
+    async def sign_up_and_login(self) -> None :
+        response = await self.client.post("/auth/sign-up", json={"email" : self.email, "username" : "bench", "password" : PASSWORD})
+        if response.status_code not in (201, 409) :
+            raise RuntimeError(f"가입 실패 : {response.status_code} {response.text}")
+        response = await self.client.post("/auth/login", json={"email" : self.email, "password" : PASSWORD})
+        if response.status_code != 200 :
+            raise RuntimeError(f"로그인 실패 : {response.status_code} {response.text}")
+        # 목록 조회 시나리오용 데이터
+        await self.client.post("/todos/bulk", json={
+            "operations" : [{"op" : "create", "data" : {"title" : f"bench {i}"}} for i in range(50)]
+        })
+
+
+async def _sign_up(worker : Worker) :
+    worker.counter += 1
+    email = f"bench-{worker.run_id}-{worker.index}-{worker.counter}@example.com"
+    return await worker.client.post("/auth/sign-up", json={"email" : email, "username" : "bench", "password" : PASSWORD})
+
+async def _login(worker : Worker) :
+    return await worker.client.post("/auth/login", json={"email" : worker.email, "password" : PASSWORD})
+
+async def _me(worker : Worker) :
+    return await worker.client.get("/auth/me")
+
+async def _todo_create(worker : Worker) :
+    return await worker.client.post("/todos", json={"title" : "bench todo", "priority" : "high"})
+
+async def _todo_list(worker : Worker) :
+    return await worker.client.get("/todos", params={"limit" : 50})
+
+# 시나리오 이름 -> (요청 함수, 성공 상태코드)
+SCENARIOS : dict[str, tuple[Operation, int]] = {
+    "sign-up" : (_sign_up, 201),
+    "login" : (_login, 200),
+    "me" : (_me, 200),
+    "todo-create" : (_todo_create, 201),
+    "todo-list" : (_todo_list, 200),
+}
+
+
+async def run_scenario(workers : list[Worker], operation : Operation, expected_status : int, duration : float) -> dict :
+    latencies : list[float] = []
+    statuses : Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def loop(worker : Worker) -> None :
+        while time.perf_counter() < deadline :
+            t0 = time.perf_counter()
+            try :
+                response = await operation(worker)
+                status = response.status_code
+            except httpx.HTTPError :
+                status = 0
+            elapsed = time.perf_counter() - t0
+            statuses[status] += 1
+            if status == expected_status :
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(loop(worker) for worker in workers))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(latencies, elapsed, errors=sum(count for status, count in statuses.items() if status != expected_status))
+    result["statuses"] = {str(status) : count for status, count in sorted(statuses.items())}
+    return result
+
+
+def _make_transport(url : str | None) :
+    if url is not None :
+        return None, url
+    from app.main import app
+    return httpx.ASGITransport(app=app), "http://bench"
+
+
+async def main_async(args) -> dict :
+    transport, base_url = _make_transport(args.url)
+    run_id = uuid.uuid4().hex[:8]
+
+    clients = [
+        httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout)
+        for _ in range(args.concurrency)
+    ]
+    try :
+        workers = [Worker(client, run_id, index) for index, client in enumerate(clients)]
+        await asyncio.gather(*(worker.sign_up_and_login() for worker in workers))
+
+        results = {}
+        for name in args.scenarios :
+            operation, expected_status = SCENARIOS[name]
+            results[name] = await run_scenario(workers, operation, expected_status, args.duration)
+        return results
+    finally :
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+
+def main() -> None :
+    parser = argparse.ArgumentParser(description="auth / todo 엔드포인트 부하 테스트")
+    parser.add_argument("--url", default=None, help="대상 서버 (생략 시 프로세스 안에서 앱 실행)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="시나리오별 실행 시간(초)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), type=lambda value : value.split(","))
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown :
+        parser.error(f"알 수 없는 시나리오 : {unknown}")
+
+    results = asyncio.run(main_async(args))
+    print_table(results)
+    path = write_results("load", vars(args), results, args.output)
+    print(f"결과 저장 : {path}")
+
+
+if __name__ == "__main__" :
+    main()
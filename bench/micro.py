@@ -0,0 +1,54 @@
+'''
+마이크로 벤치마크 (DB 없이 실행 가능, .env 의 JWT 설정은 필요)
+    - create_access_token / decode_access_token / pwd_hashing / verify_password
+
+    실행 : python -m bench.micro [--iterations 20000] [--hash-iterations 20] [--output path.json]
+'''
+import argparse
+import time
+from typing import Callable
+
+from bench.common import summarize, write_results, print_table
+from app.core import security
+
+
+def measure(func : Callable[[], object], iterations : int, warmup : int = 10) -> dict :
+    for _ in range(min(warmup, iterations)) :
+        func()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations) :
+        t0 = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run(iterations : int, hash_iterations : int) -> dict :
+    token = security.create_access_token("bench@example.com", "bench", 1)["access_token"]
+    hashed = security.pwd_hashing("bench-password")
+
+    return {
+        "create_access_token" : measure(lambda : security.create_access_token("bench@example.com", "bench", 1), iterations),
+        "decode_access_token" : measure(lambda : security.decode_access_token(token), iterations),
+        "pwd_hashing" : measure(lambda : security.pwd_hashing("bench-password"), hash_iterations, warmup=1),
+        "verify_password" : measure(lambda : security.verify_password("bench-password", hashed), hash_iterations, warmup=1),
+    }
+
+
+def main() -> None :
+    parser = argparse.ArgumentParser(description="토큰/해싱 마이크로 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--hash-iterations", type=int, default=20)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.hash_iterations)
+    print_table(results)
+    path = write_results("micro", vars(args), results, args.output)
+    print(f"결과 저장 : {path}")
+
+
+if __name__ == "__main__" :
+    main()
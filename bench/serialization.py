@@ -0,0 +1,129 @@
+'''
+응답 직렬화 벤치마크 (DB 없이 실행 가능, .env 의 설정은 필요)
+    - default : 라우트가 ORM 객체를 반환 -> FastAPI response_model 검증 + json.dumps (현재 기본 경로)
+    - fast    : app.core.responses.fast_json_response (TypeAdapter 검증 + pydantic-core JSON 직렬화)
+    - /auth/me 에 해당하는 사용자 1명, 할 일 목록 N개(기본 20/100/1000)를 비교
+    - 별도의 작은 FastAPI 앱에 ASGI 호출을 직접 보내서 HTTP 클라이언트 비용은 제외
+
+    실행 : python -m bench.serialization [--iterations 2000] [--sizes 20,100,1000] [--output path.json]
+'''
+import argparse
+import asyncio
+import time
+from datetime import date, datetime
+
+from fastapi import FastAPI
+
+from bench.common import summarize, write_results, print_table
+from app.core.responses import fast_json_response
+from app.models import todo as todo_model
+from app.models import user as user_model
+from app.schemas import todo as todo_schema
+from app.schemas import user as user_schema
+
+
+def _user() -> user_model.Users :
+    now = datetime(2025, 7, 12, 10, 0, 0)
+    return user_model.Users(
+        id=1, email="bench@example.com", username="bench", hashed_password=b"x",
+        is_active=True, created_at=now, updated_at=now
+    )
+
+
+def _todos(count : int) -> list[todo_model.Todos] :
+    now = datetime(2025, 7, 12, 10, 0, 0)
+    return [
+        todo_model.Todos(
+            id=i, user_id=1, title=f"할 일 {i}", description="벤치마크용 설명 " * 4,
+            is_completed=i % 3 == 0, priority="medium", due_date=date(2025, 8, 1),
+            created_at=now, updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(user : user_model.Users, pages : dict[int, dict]) -> FastAPI :
+    app = FastAPI()
+
+    @app.get("/default/me", response_model=user_schema.User)
+    async def default_me() :
+        return user
+
+    @app.get("/fast/me")
+    async def fast_me() :
+        return fast_json_response(user_schema.User, user)
+
+    @app.get("/default/todos/{size}", response_model=todo_schema.TodoPage)
+    async def default_todos(size : int) :
+        return pages[size]
+
+    @app.get("/fast/todos/{size}")
+    async def fast_todos(size : int) :
+        return fast_json_response(todo_schema.TodoPage, pages[size])
+
+    return app
+
+
+async def call(app : FastAPI, path : str) -> int :
+    scope = {
+        "type" : "http", "asgi" : {"version" : "3.0"}, "http_version" : "1.1",
+        "method" : "GET", "scheme" : "http", "path" : path, "raw_path" : path.encode(),
+        "query_string" : b"", "root_path" : "", "headers" : [], "client" : ("127.0.0.1", 0), "server" : ("bench", 80),
+    }
+    size = 0
+
+    async def receive() :
+        return {"type" : "http.request", "body" : b"", "more_body" : False}
+
+    async def send(message) :
+        nonlocal size
+        if message["type"] == "http.response.body" :
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size
+
+
+async def measure(app : FastAPI, path : str, iterations : int, warmup : int = 20) -> dict :
+    for _ in range(warmup) :
+        await call(app, path)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations) :
+        t0 = time.perf_counter()
+        await call(app, path)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def run(iterations : int, sizes : list[int]) -> dict :
+    pages = {size : {"items" : _todos(size), "next_cursor" : None} for size in sizes}
+    app = build_app(_user(), pages)
+
+    results = {}
+    for kind in ("default", "fast") :
+        results[f"me/{kind}"] = await measure(app, f"/{kind}/me", iterations)
+    for size in sizes :
+        # 큰 목록은 반복 횟수를 줄임
+        count = max(50, iterations * 20 // max(size, 20))
+        for kind in ("default", "fast") :
+            results[f"todos[{size}]/{kind}"] = await measure(app, f"/{kind}/todos/{size}", count)
+    return results
+
+
+def main() -> None :
+    parser = argparse.ArgumentParser(description="응답 직렬화 경로 비교 벤치마크")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--sizes", default="20,100,1000", type=lambda value : [int(size) for size in value.split(",")])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.sizes))
+    print_table(results)
+    path = write_results("serialization", vars(args), results, args.output)
+    print(f"결과 저장 : {path}")
+
+
+if __name__ == "__main__" :
+    main()
@@ -0,0 +1,16 @@
+import os
+
+# app.core.config 는 import 시점에 필수 환경변수를 읽으므로 테스트용 기본값을 먼저 채움 (이미 있으면 그대로 사용)
+_TEST_ENV = {
+    "DEV_DB_USER" : "postgres",
+    "DEV_DB_PASSWORD" : "postgres",
+    "DEV_DB_HOST" : "localhost",
+    "DEV_DB_NAME" : "todo_test",
+    "JWT_SECRET_KEY" : "test-secret-key-test-secret-key-1234",
+    "ALGORITHM" : "HS256",
+    "ACCESS_TOKEN_EXPIRE_SECONDS" : "900",
+    "REFRESH_TOKEN_EXPIRE_SECONDS" : "86400",
+    "DEV_CORS_ORIGINS" : '["http://localhost"]',
+}
+for key, value in _TEST_ENV.items() :
+    os.environ.setdefault(key, value)
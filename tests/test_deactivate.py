@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.main import app
+from app.database import get_db
+from app.api.deps import get_read_db
+from app.core import security
+from app.core.security import create_access_token, verified_token_cache
+from app.core.revocation import revocation_list
+from app.models import user as user_model
+from app.services.auth_service import Auth_service
+
+
+class _Result :
+    def __init__(self, value) :
+        self.value = value
+
+    def scalar(self) :
+        return self.value
+
+
+# UPDATE ... RETURNING id 만 흉내내는 세션 (커밋 시점의 토큰 캐시 상태를 기록)
+class _Session :
+    def __init__(self, user : user_model.Users, fail_commit : bool = False) :
+        self.user = user
+        self.fail_commit = fail_commit
+        self.pending = False
+        self.cached_at_commit = None
+
+    async def execute(self, query) :
+        self.pending = True
+        return _Result(self.user.id)
+
+    async def commit(self) :
+        self.cached_at_commit = len(verified_token_cache)
+        if self.fail_commit :
+            raise SQLAlchemyError("commit failed")
+        if self.pending :
+            self.user.is_active = False
+
+    async def rollback(self) :
+        self.pending = False
+
+
+def _user(user_id : int) -> user_model.Users :
+    now = datetime(2025, 1, 1)
+    return user_model.Users(
+        id=user_id, email=f"user{user_id}@example.com", username="u", hashed_password=b"x",
+        is_active=True, created_at=now, updated_at=now
+    )
+
+
+@pytest.fixture
+def client(monkeypatch) :
+    async def get_read_session() :
+        yield None
+
+    app.dependency_overrides[get_read_db] = get_read_session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    verified_token_cache.clear()
+    revocation_list._users.clear()
+
+
+def _login(client : TestClient, user : user_model.Users, monkeypatch) -> None :
+    async def get_user_by_email(self, db, email) :
+        return user
+
+    monkeypatch.setattr(Auth_service, "get_user_by_email", get_user_by_email)
+    # 비활성화보다 앞선 초에 발급된 토큰
+    with monkeypatch.context() as m :
+        m.setattr(security.time, "time", lambda : 1_000_000_000)
+        token = create_access_token(user.email, user.username, user.id)["access_token"]
+    client.cookies.set("access_token", token)
+
+
+def test_deactivated_user_cached_token_is_rejected(client, monkeypatch) :
+    user = _user(1)
+    session = _Session(user)
+
+    async def get_session() :
+        yield session
+
+    app.dependency_overrides[get_db] = get_session
+    _login(client, user, monkeypatch)
+    token = client.cookies["access_token"]
+
+    assert client.get("/auth/me").status_code == 200 # 검증된 토큰 캐시에 저장
+
+    assert client.post("/auth/deactivate").status_code == 204
+    assert session.cached_at_commit == 1 # 커밋 전에는 캐시를 건드리지 않음
+
+    client.cookies.set("access_token", token)
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_rolled_back_deactivation_keeps_tokens_valid(client, monkeypatch) :
+    user = _user(2)
+
+    async def get_session() :
+        yield _Session(user, fail_commit=True)
+
+    app.dependency_overrides[get_db] = get_session
+    _login(client, user, monkeypatch)
+
+    assert client.get("/auth/me").status_code == 200
+    assert client.post("/auth/deactivate").status_code == 500
+    assert user.is_active
+    assert client.get("/auth/me").status_code == 200
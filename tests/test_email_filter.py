@@ -0,0 +1,106 @@
+import asyncio
+import operator
+
+import pytest
+
+from app.core import email_filter
+from app.core.email_filter import RegisteredEmailFilter
+from app.schemas import user as user_schema
+from app.services import auth_service
+from app import PasswordDoesNotMatch
+
+
+class _Result :
+    def __init__(self, rows) :
+        self.rows = rows
+
+    def all(self) :
+        return self.rows
+
+    def scalar(self) :
+        return self.rows[0] if self.rows else None
+
+
+# users 테이블 대신 {id : email} 을 읽는 세션 (email_filter 가 쓰는 조건만 해석)
+class _UsersSession :
+    def __init__(self, users : dict[int, str]) :
+        self.users = users
+
+    async def __aenter__(self) :
+        return self
+
+    async def __aexit__(self, *exc) :
+        return False
+
+    async def execute(self, query) :
+        clause = query.whereclause
+        if clause is None :
+            return _Result([len(self.users)])
+        value = clause.right.value
+        if clause.operator is operator.gt :
+            ids = sorted(user_id for user_id in self.users if user_id > value)[:query._limit]
+        else :
+            ids = [user_id for user_id in value if user_id in self.users]
+        return _Result([(user_id, self.users[user_id]) for user_id in ids])
+
+
+@pytest.fixture
+def users(monkeypatch) :
+    users = {}
+    monkeypatch.setattr(email_filter.replica_router, "primary", lambda : _UsersSession(users))
+    return users
+
+
+def test_id_committed_after_larger_ids_is_picked_up(users) :
+    emails = RegisteredEmailFilter(min_capacity=100, error_rate=0.01, batch_size=2, gap_ttl=600)
+    users.update({1 : "a@example.com", 3 : "c@example.com", 4 : "d@example.com"})
+    asyncio.run(emails.rebuild())
+    assert emails.watermark == 4
+    assert set(emails.gaps) == {2}
+
+    # id 2 의 INSERT 가 id 3, 4 보다 늦게 커밋됨 (created_at 과 무관)
+    users[2] = "b@example.com"
+    asyncio.run(emails.refresh())
+    assert emails.might_contain("b@example.com")
+    assert emails.gaps == {}
+
+
+def test_gap_is_dropped_after_ttl(users) :
+    emails = RegisteredEmailFilter(min_capacity=100, error_rate=0.01, batch_size=10, gap_ttl=0)
+    users.update({1 : "a@example.com", 3 : "c@example.com"})
+    asyncio.run(emails.rebuild())
+    assert emails.gaps == {}
+
+
+def test_negative_skips_database_and_catches_up_in_background(users, monkeypatch) :
+    emails = RegisteredEmailFilter(min_capacity=100, error_rate=0.01, batch_size=10, gap_ttl=600)
+    users.update({1 : "a@example.com"})
+    asyncio.run(emails.rebuild())
+    monkeypatch.setattr(auth_service, "registered_emails", emails)
+
+    dummy_checks = []
+
+    async def verify_dummy_password(password) :
+        dummy_checks.append(password)
+        return False
+
+    class _Session :
+        async def execute(self, query) :
+            raise AssertionError("가입되지 않은 이메일은 DB 를 조회하지 않아야 함")
+
+    monkeypatch.setattr(auth_service, "verify_dummy_password_async", verify_dummy_password)
+    login = user_schema.UserLogin(email="new@example.com", password="password1!")
+
+    # 다른 워커에서 방금 가입한 사용자 : 첫 시도는 거절되고 따라잡기가 백그라운드로 시작됨
+    users[2] = "new@example.com"
+    stale = email_filter.EMAIL_FILTER_LOOKUPS.value(result="stale")
+
+    async def run() :
+        with pytest.raises(PasswordDoesNotMatch) :
+            await auth_service.Auth_service().user_login(_Session(), login)
+        await emails.refresh()
+
+    asyncio.run(run())
+    assert dummy_checks == ["password1!"]
+    assert emails.might_contain("new@example.com")
+    assert email_filter.EMAIL_FILTER_LOOKUPS.value(result="stale") == stale + 1
@@ -0,0 +1,56 @@
+'''
+목록 조회 / 검색 쿼리의 인덱스 사용 점검 (app/migrations/explain.py)
+    - TEST_DATABASE_URL (postgresql+asyncpg://...) 이 있을 때만 실행, 마이그레이션을 적용한 뒤 케이스마다 EXPLAIN
+'''
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.migrations import upgrade
+from app.migrations.explain import LIST_QUERY_CASES, SEARCH_QUERY_CASES, explain, _walk_plan
+from app.services.todo_service import Todo_service
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL 이 없음")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def migrated() :
+    async def run() :
+        engine = create_async_engine(TEST_DATABASE_URL)
+        try :
+            await upgrade(engine)
+        finally :
+            await engine.dispose()
+    asyncio.run(run())
+
+
+def _plan_of(statement) -> tuple[set[str], set[str]] :
+    async def run() :
+        engine = create_async_engine(TEST_DATABASE_URL)
+        try :
+            return await explain(engine, statement)
+        finally :
+            await engine.dispose()
+
+    indexes : set[str] = set()
+    seq_scans : set[str] = set()
+    _walk_plan(asyncio.run(run()), indexes, seq_scans)
+    return indexes, seq_scans
+
+
+@pytest.mark.parametrize(("name", "kwargs", "expected_index"), LIST_QUERY_CASES, ids=[case[0] for case in LIST_QUERY_CASES])
+def test_list_query_uses_index(name, kwargs, expected_index) :
+    indexes, seq_scans = _plan_of(Todo_service().build_list_query(user_id = 1, **kwargs))
+    assert expected_index in indexes
+    assert "todos" not in seq_scans
+
+
+@pytest.mark.parametrize(("name", "kwargs", "expected_index"), SEARCH_QUERY_CASES, ids=[case[0] for case in SEARCH_QUERY_CASES])
+def test_search_query_uses_index(name, kwargs, expected_index) :
+    indexes, seq_scans = _plan_of(Todo_service().build_search_query(user_id = 1, **kwargs))
+    assert expected_index in indexes
+    assert "todos" not in seq_scans
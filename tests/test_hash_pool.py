@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hash_pool import HashPool
+from app import HashPoolSaturated
+
+
+def test_cancelled_caller_keeps_slot_until_job_finishes() :
+    pool = HashPool("thread", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def run() :
+        caller = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        caller.cancel() # 클라이언트 연결 끊김
+        await asyncio.sleep(0)
+
+        # 작업은 아직 워커에서 실행중 -> 새 작업은 받지 않음
+        assert pool.metrics.in_flight == 1
+        with pytest.raises(HashPoolSaturated) :
+            await pool.run(release.wait)
+
+        release.set()
+        for _ in range(100) :
+            if pool.metrics.in_flight == 0 :
+                break
+            await asyncio.sleep(0.01)
+        assert pool.metrics.in_flight == 0
+        assert await pool.run(lambda : "done") == "done"
+
+    try :
+        asyncio.run(run())
+    finally :
+        release.set()
+        pool.shutdown()
@@ -0,0 +1,24 @@
+import asyncio
+
+from app.core.instrumentation import MetricsMiddleware, current_request_stats
+from app.core.metrics import registry
+
+
+def test_pool_wait_is_exported_per_route() :
+    class _Route :
+        path = "/todos/{todo_id}"
+
+    # 커넥션을 두번 꺼내면서 기다린 것처럼 누적
+    async def endpoint(scope, receive, send) :
+        scope["route"] = _Route()
+        current_request_stats.get().pool_wait_seconds += 0.25
+        current_request_stats.get().pool_wait_seconds += 0.5
+        await send({"type" : "http.response.start", "status" : 200, "headers" : []})
+        await send({"type" : "http.response.body", "body" : b""})
+
+    async def send(message) :
+        pass
+
+    asyncio.run(MetricsMiddleware(endpoint)({"type" : "http", "method" : "GET"}, None, send))
+
+    assert 'http_request_db_pool_wait_seconds_sum{route="/todos/{todo_id}"} 0.75' in registry.render()
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import todo as todo_api
+from app.api.deps import get_read_db, get_token_claims
+from app.core.list_cache import TodoListCache, MemoryCacheBackend, RedisCacheBackend
+from app.schemas import user as user_schema
+
+
+class _Session :
+    def __init__(self, replica : bool) :
+        self.info = {"replica" : replica}
+
+
+@pytest.fixture
+def client(monkeypatch) :
+    state = {"replica" : False, "queries" : 0}
+
+    async def get_session() :
+        yield _Session(state["replica"])
+
+    async def get_claims() :
+        return user_schema.TokenClaims(id=1, email="a@example.com", username="a", is_active=True, jti="j", iat=0, exp=0)
+
+    async def list_todos(**kwargs) :
+        state["queries"] += 1
+        return [], None
+
+    monkeypatch.setattr(todo_api.todo_service, "list_todos", list_todos)
+    app.dependency_overrides[get_read_db] = get_session
+    app.dependency_overrides[get_token_claims] = get_claims
+    yield TestClient(app), state
+    app.dependency_overrides.clear()
+
+
+def _use_cache(monkeypatch, backend) :
+    monkeypatch.setattr(todo_api, "todo_list_cache", TodoListCache(backend, ttl=30))
+    return todo_api.todo_list_cache
+
+
+def test_memory_backend_never_answers_304(client, monkeypatch) :
+    http, state = client
+    _use_cache(monkeypatch, MemoryCacheBackend(maxsize=100, ttl=30))
+
+    first = http.get("/todos")
+    assert first.status_code == 200
+    assert "etag" not in first.headers
+
+    second = http.get("/todos", headers={"If-None-Match" : "*"})
+    assert second.status_code == 200
+
+
+def test_shared_backend_answers_304_until_write(client, monkeypatch) :
+    http, state = client
+    cache = _use_cache(monkeypatch, RedisCacheBackend.from_url("local://"))
+
+    etag = http.get("/todos").headers["etag"]
+    assert http.get("/todos", headers={"If-None-Match" : etag}).status_code == 304
+
+    asyncio.run(cache.invalidate(1))
+    assert http.get("/todos", headers={"If-None-Match" : etag}).status_code == 200
+
+
+def test_replica_reads_are_not_cached(client, monkeypatch) :
+    http, state = client
+    _use_cache(monkeypatch, RedisCacheBackend.from_url("local://"))
+    state["replica"] = True
+
+    response = http.get("/todos")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+    http.get("/todos")
+    assert state["queries"] == 2
+
+
+def test_memory_versions_are_bounded() :
+    backend = MemoryCacheBackend(maxsize=2, ttl=60)
+
+    async def run() :
+        first = await backend.bump_version("1")
+        for user_id in ("2", "3", "4") :
+            await backend.bump_version(user_id)
+        # 밀려난 사용자는 새 버전으로 시작 -> 이전 버전으로 저장된 항목은 쓰이지 않음
+        return first, await backend.get_version("1")
+
+    first, again = asyncio.run(run())
+    assert len(backend._versions) == 2
+    assert again != first
@@ -0,0 +1,85 @@
+import asyncio
+
+import anyio
+import pytest
+
+from app.api import realtime as realtime_api
+from app.core.config import settings
+from app.core.realtime import ChangeHub
+from app.schemas import user as user_schema
+
+
+class _ListenConnection :
+    def __init__(self) :
+        self.channels = set()
+
+    async def add_listener(self, channel, callback) :
+        self.channels.add(channel)
+
+    async def remove_listener(self, channel, callback) :
+        await asyncio.sleep(0.05)
+        self.channels.discard(channel)
+
+    def is_closed(self) :
+        return False
+
+    async def close(self) :
+        pass
+
+
+class _Session :
+    async def close(self) :
+        pass
+
+
+@pytest.fixture
+def hub(monkeypatch) :
+    hub = ChangeHub(dsn="", queue_size=10, max_subscribers=10)
+    hub._conn = _ListenConnection()
+    monkeypatch.setattr(settings, "realtime_enabled", True)
+    monkeypatch.setattr(realtime_api, "change_hub", hub)
+    return hub
+
+
+def _user() -> user_schema.User :
+    return user_schema.User.model_construct(id=1, email="a@example.com", username="a", is_active=True)
+
+
+def test_cancelled_stream_still_unlistens(hub) :
+    async def run() :
+        subscription = await hub.subscribe(1)
+        stream = realtime_api._sse(subscription, {})
+        await stream.__anext__()
+
+        # 연결이 끊겨서 취소되는 중에 UNLISTEN 을 기다림
+        with anyio.CancelScope() as scope :
+            scope.cancel()
+            await stream.aclose()
+
+    asyncio.run(run())
+    assert hub.subscriber_count == 0
+    assert hub._conn.channels == set()
+
+
+def test_response_releases_subscription_when_stream_never_starts(hub) :
+    async def run() :
+        response = await realtime_api.todo_events(access_token=None, db=_Session(), current_user=_user())
+        assert hub.subscriber_count == 1
+        # 본문을 보내기 전에 끊긴 경우 : 제너레이터는 시작되지 않고 background 만 실행
+        await response.background()
+        await response.background()
+
+    asyncio.run(run())
+    assert hub.subscriber_count == 0
+    assert hub._conn.channels == set()
+
+
+def test_close_ends_open_streams(hub) :
+    async def run() :
+        subscription = await hub.subscribe(1)
+        events = realtime_api._events(subscription, {})
+        await hub.close()
+        return [event async for event in events]
+
+    assert asyncio.run(run()) == [("close", "shutdown")]
+
@@ -0,0 +1,14 @@
+from app.core import revocation
+from app.core.revocation import RevocationList
+
+
+def test_token_issued_in_same_second_after_revocation_is_accepted(monkeypatch) :
+    revocations = RevocationList(maxsize=10, ttl=900)
+    monkeypatch.setattr(revocation.time, "time", lambda : 1000.3)
+    revocations.revoke_user(1)
+
+    # 재로그인으로 같은 초(1000.7)에 발급된 토큰
+    assert not revocations.is_revoked(1, "new", 1000)
+    assert revocations.is_revoked(1, "old", 999)
+    assert revocations.is_revoked(1, "unknown", None)
+    assert not revocations.is_revoked(2, "other", 999)
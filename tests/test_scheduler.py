@@ -0,0 +1,26 @@
+import asyncio
+
+from app.core.scheduler import MaintenanceScheduler
+
+
+def test_worker_sync_jobs_run_without_maintenance() :
+    ran = []
+
+    def job(name) :
+        async def run() :
+            ran.append(name)
+            return 0
+        return run
+
+    async def main() :
+        scheduler = MaintenanceScheduler()
+        scheduler.add_job("purge", 0.01, job("purge"))
+        scheduler.add_job("reload_jwt_keys", 0.01, job("reload_jwt_keys"), maintenance=False)
+
+        scheduler.start(maintenance=False)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+    asyncio.run(main())
+    assert "reload_jwt_keys" in ran
+    assert "purge" not in ran
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.main import app
+from app.database import get_db
+from app.api.deps import get_token_claims
+from app.schemas import todo as todo_schema
+from app.schemas import user as user_schema
+
+
+class _RecordingSession :
+    def __init__(self) :
+        self.calls = []
+
+    def __getattr__(self, name) :
+        async def record(*args, **kwargs) :
+            self.calls.append(name)
+        return record
+
+
+@pytest.fixture
+def session() :
+    session = _RecordingSession()
+
+    async def get_session() :
+        yield session
+
+    async def get_claims() :
+        return user_schema.TokenClaims(id=1, email="a@example.com", username="a", is_active=True, jti="j", iat=0, exp=0)
+
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_token_claims] = get_claims
+    yield session
+    app.dependency_overrides.clear()
+
+
+def test_bulk_update_rejects_explicit_null() :
+    with pytest.raises(ValidationError) :
+        todo_schema.TodoBulkRequest.model_validate({
+            "operations" : [{"op" : "update", "id" : 1, "data" : {"priority" : None}}]
+        })
+
+
+def test_bulk_with_one_bad_update_writes_nothing(session) :
+    response = TestClient(app).post("/todos/bulk", json={
+        "operations" : [
+            {"op" : "create", "data" : {"title" : "a"}},
+            {"op" : "update", "id" : 1, "data" : {"title" : "b"}},
+            {"op" : "update", "id" : 2, "data" : {"is_completed" : None}},
+        ]
+    })
+
+    assert response.status_code == 422
+    assert session.calls == []
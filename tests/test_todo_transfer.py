@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import get_db
+from app.api.deps import get_token_claims
+from app.core.config import settings
+from app.schemas import user as user_schema
+from app.services import todo_transfer_service
+from app.services.todo_transfer_service import Todo_transfer_service
+from app import ImportTooLarge, ImportReadTimeout, InvalidImportRow
+
+
+async def _chunks(chunks : list[bytes]) :
+    for chunk in chunks :
+        yield chunk
+
+
+def _csv(chunks : list[bytes]) -> list[tuple[int, dict]] :
+    async def run() :
+        return [row async for row in todo_transfer_service._csv_rows(todo_transfer_service._lines(_chunks(chunks)))]
+    return asyncio.run(run())
+
+
+def test_csv_quoted_newline_spanning_chunks_is_one_record() :
+    rows = _csv([b'title,descr', b'iption\n"a",\"multi\n', b'line"\nb,c\n'])
+    assert rows == [(2, {"title" : "a", "description" : "multi\nline"}), (4, {"title" : "b", "description" : "c"})]
+
+
+def test_csv_literal_quote_inside_unquoted_field() :
+    rows = _csv(['title,description\n5"짜리 모니터,x\ny,z\n'.encode()])
+    assert rows == [(2, {"title" : '5"짜리 모니터', "description" : "x"}), (3, {"title" : "y", "description" : "z"})]
+
+
+def test_line_limit_counts_bytes(monkeypatch) :
+    monkeypatch.setattr(settings, "todo_import_max_line_bytes", 10)
+    # 4글자, 12 bytes
+    with pytest.raises(ImportTooLarge) :
+        _csv(["title\n가나다라\n".encode()])
+
+
+@pytest.fixture
+def client(monkeypatch) :
+    # COPY 대신 검증된 레코드를 모두 읽기만 함
+    async def import_todos(self, db, user_id, chunks, format = "ndjson") :
+        return len([record async for record in self._records(chunks, format)])
+
+    async def get_session() :
+        class _Session :
+            async def commit(self) :
+                pass
+
+            async def rollback(self) :
+                pass
+        yield _Session()
+
+    async def get_claims() :
+        return user_schema.TokenClaims(id=1, email="a@example.com", username="a", is_active=True, jti="j", iat=0, exp=0)
+
+    monkeypatch.setattr(Todo_transfer_service, "import_todos", import_todos)
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_token_claims] = get_claims
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_import_bad_row_reports_its_line(client) :
+    body = 'title,priority\n"첫\n번째",low\nok,urgent\n'.encode()
+    response = client.post("/todos/import?format=csv", content=body)
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("4번째 줄")
+
+
+def test_import_row_cap(client, monkeypatch) :
+    monkeypatch.setattr(settings, "todo_import_max_rows", 2)
+    body = b'{"title" : "a"}\n{"title" : "b"}\n{"title" : "c"}\n'
+    assert client.post("/todos/import", content=body).status_code == 413
+    assert client.post("/todos/import", content=body[:32]).json() == {"imported" : 2}
+
+
+# 커넥션을 꺼내면 실패하는 세션
+class _NoConnectionSession :
+    async def connection(self) :
+        raise AssertionError("첫 행을 검증하기 전에 커넥션을 꺼냄")
+
+
+def test_import_validates_first_row_before_checking_out_connection() :
+    async def run() :
+        await Todo_transfer_service().import_todos(_NoConnectionSession(), 1, _chunks([b'{"priority" : "urgent"}\n']))
+
+    with pytest.raises(InvalidImportRow) as e :
+        asyncio.run(run())
+    assert e.value.line == 1
+
+
+def test_import_stops_when_body_stalls(monkeypatch) :
+    monkeypatch.setattr(settings, "todo_import_read_timeout", 0.05)
+
+    async def stalled() :
+        await asyncio.sleep(1)
+        yield b'{"title" : "a"}\n'
+
+    async def run() :
+        await Todo_transfer_service().import_todos(_NoConnectionSession(), 1, stalled())
+
+    with pytest.raises(ImportReadTimeout) :
+        asyncio.run(run())
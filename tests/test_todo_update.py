@@ -0,0 +1,28 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import todo as todo_schema
+from app.services.todo_service import Todo_service
+
+
+@pytest.mark.parametrize("field", ["title", "priority", "is_completed"])
+def test_update_rejects_explicit_null(field) :
+    with pytest.raises(ValidationError) :
+        todo_schema.TodoUpdate.model_validate({field : None})
+
+
+def test_update_allows_null_for_nullable_fields() :
+    todo = todo_schema.TodoUpdate.model_validate({"description" : None, "due_date" : None})
+    assert Todo_service._changed_fields(todo) == {"description" : None, "due_date" : None}
+
+
+def test_update_keeps_only_sent_fields() :
+    todo = todo_schema.TodoUpdate.model_validate({"title" : "새 제목"})
+    assert Todo_service._changed_fields(todo) == {"title" : "새 제목"}
+
+
+def test_changed_fields_drops_null_for_not_null_columns() :
+    # 검증을 거치지 않고 만들어진 경우에도 NOT NULL 필드의 None 은 쓰지 않음
+    todo = todo_schema.TodoUpdate.model_construct(title=None, priority=None, is_completed=None, description=None)
+    todo.__pydantic_fields_set__ = {"title", "priority", "is_completed", "description"}
+    assert Todo_service._changed_fields(todo) == {"description" : None}
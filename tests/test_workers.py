@@ -0,0 +1,25 @@
+from app.__main__ import worker_count, process_local_warnings
+from app.core.config import settings
+
+
+def test_default_is_single_worker(monkeypatch) :
+    monkeypatch.setattr(settings, "server_workers", 1)
+    assert worker_count() == 1
+    assert worker_count(4) == 4
+
+
+def test_single_worker_has_no_warnings() :
+    assert process_local_warnings(1) == []
+
+
+def test_memory_backends_warn_with_multiple_workers(monkeypatch) :
+    monkeypatch.setattr(settings, "login_rate_limit_backend", "memory")
+    monkeypatch.setattr(settings, "todo_list_cache_backend", "memory")
+    warnings = process_local_warnings(4)
+    assert any("LOGIN_RATE_LIMIT_BACKEND" in warning for warning in warnings)
+    assert any("TODO_LIST_CACHE_BACKEND" in warning for warning in warnings)
+
+    monkeypatch.setattr(settings, "login_rate_limit_backend", "redis")
+    monkeypatch.setattr(settings, "todo_list_cache_backend", "redis")
+    warnings = process_local_warnings(4)
+    assert not any("BACKEND" in warning for warning in warnings)